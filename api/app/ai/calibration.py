@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from app.infra.db import get_camera_calibration, upsert_camera_calibration
+from app.infra.metrics import count_cache
+
+if TYPE_CHECKING:
+    from app.ai.homography import HomographyMapper
+
+# 다른 프로세스(API/worker)에서 갱신된 calibration을 다시 확인하는 주기 (초)
+DEFAULT_REFRESH_SEC = 30.0
+# 캐시하는 camera 수 상한 (camera_id는 클라이언트 입력이라 미등록 id도 들어옴, 오래 안 쓴 것부터 제거)
+DEFAULT_MAX_ENTRIES = 1024
+
+
+@dataclass
+class _CacheEntry:
+    checked_at: float  # 마지막으로 DB를 확인한 시각 (monotonic)
+    updated_at: Optional[str]  # DB row의 updated_at (변경 감지용)
+    mapper: Optional[HomographyMapper]
+
+
+class CameraCalibrationRegistry:
+    """
+    camera_id별 homography 레지스트리.
+      - 대응점(point set)은 DB(camera_calibrations)에 저장
+      - 계산된 H(HomographyMapper)는 camera_id 키로 프로세스 메모리에 캐시 (LRU, max_entries개)
+      - set_calibration 시 해당 camera 캐시 무효화,
+        다른 프로세스의 갱신은 refresh_sec 주기로 updated_at 비교 후 반영
+    """
+
+    def __init__(
+        self,
+        refresh_sec: float = DEFAULT_REFRESH_SEC,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.refresh_sec = refresh_sec
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, _CacheEntry] = OrderedDict()
+
+    def get_mapper(self, camera_id: Optional[str]) -> Optional[HomographyMapper]:
+        if camera_id is None:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(camera_id)
+            if entry is not None:
+                self._cache.move_to_end(camera_id)
+        if entry is not None and now - entry.checked_at < self.refresh_sec:
+            count_cache("calibration", True)
+            return entry.mapper
+        count_cache("calibration", False)
+
+        row = get_camera_calibration(camera_id)
+        updated_at = row["updated_at"] if row else None
+        if entry is not None and entry.updated_at == updated_at:
+            # 변경 없음: H 재계산 없이 확인 시각만 갱신
+            mapper = entry.mapper
+        elif row is not None:
+            # calibration이 등록된 카메라가 있을 때만 cv2 import
+            from app.ai.homography import HomographyMapper
+
+            mapper = HomographyMapper(
+                src_pts=[tuple(p) for p in row["src_pts"]],
+                dst_pts=[tuple(p) for p in row["dst_pts"]],
+            )
+        else:
+            mapper = None
+
+        with self._lock:
+            self._cache[camera_id] = _CacheEntry(now, updated_at, mapper)
+            self._cache.move_to_end(camera_id)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return mapper
+
+    def set_calibration(
+        self,
+        camera_id: str,
+        src_pts: list[list[float]],
+        dst_pts: list[list[float]],
+    ) -> HomographyMapper:
+        from app.ai.homography import HomographyMapper
+
+        # 먼저 H를 계산해서 잘못된 대응점은 저장 전에 ValueError로 거름
+        mapper = HomographyMapper(
+            src_pts=[tuple(p) for p in src_pts],
+            dst_pts=[tuple(p) for p in dst_pts],
+        )
+        upsert_camera_calibration(camera_id, src_pts, dst_pts)
+        self.invalidate(camera_id)
+        return mapper
+
+    def invalidate(self, camera_id: Optional[str] = None) -> None:
+        with self._lock:
+            if camera_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(camera_id, None)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import io
+from typing import Any, Literal, Optional
+
+from PIL import Image
+
+# 축소 해상도 decode
+#   YOLOv8n은 긴 변 640, BLIP은 384로 resize하므로 4K JPEG를 원본 해상도로 풀 필요가 없음.
+#   JPEG는 DCT 단계에서 1/2, 1/4, 1/8 scaling이 가능 (PIL Image.draft / cv2 IMREAD_REDUCED_*).
+#   bbox는 원본 좌표로 되돌리고, BLIP crop이 축소 이미지로 부족할 때만 해당 배율로 다시 decode.
+# (Pillow wheel은 libjpeg-turbo를 쓰므로 SIMD decode는 별도 설정 없이 적용됨)
+
+DecodeBackend = Literal["pil", "cv2"]
+
+JPEG_SCALES = (8, 4, 2, 1)  # 큰 축소 배율부터
+
+
+def _decode_cv2(image_bytes: bytes, scale: int) -> Optional[Image.Image]:
+    # backend="cv2"일 때만 import (cv2 없으면 None -> PIL로 fallback)
+    try:
+        import cv2  # type: ignore
+        import numpy as np
+    except ImportError:
+        return None
+    # IMREAD_REDUCED_*는 기본적으로 EXIF orientation을 적용해서 가로/세로가 바뀔 수 있음.
+    # bbox 좌표계(DecodedImage.size)는 PIL header 기준(회전 전)이므로 회전하지 않음
+    flag = {
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }[scale] | cv2.IMREAD_IGNORE_ORIENTATION
+    bgr = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), flag)
+    if bgr is None:
+        return None
+    return Image.fromarray(np.ascontiguousarray(bgr[:, :, ::-1]))
+
+
+def _pick_scale(full_side: float, min_side: int) -> int:
+    # full_side / scale >= min_side를 만족하는 가장 큰 JPEG 배율
+    for s in JPEG_SCALES:
+        if full_side / s >= min_side:
+            return s
+    return 1
+
+
+def _decode_jpeg(image_bytes: bytes, scale: int, backend: DecodeBackend) -> Image.Image:
+    if scale > 1 and backend == "cv2":
+        im = _decode_cv2(image_bytes, scale)
+        if im is not None:
+            return im
+    im = Image.open(io.BytesIO(image_bytes))
+    if scale > 1:
+        w, h = im.size
+        im.draft("RGB", (max(1, w // scale), max(1, h // scale)))
+    return im.convert("RGB")
+
+
+class DecodedImage:
+    """
+    model 입력 크기에 맞춰 축소 decode한 이미지 + 원본 bytes.
+      image         : 축소 이미지 (YOLO 입력)
+      size          : 원본 (width, height), bbox 좌표계
+      crop(bbox)    : 원본 좌표 bbox 영역, 필요한 해상도에서만 lazy decode
+    JPEG가 아니거나 축소가 필요 없으면 image가 원본 해상도 그대로.
+    """
+
+    def __init__(
+        self,
+        image_bytes: bytes,
+        target_side: int = 640,
+        backend: DecodeBackend = "pil",
+    ):
+        self.image_bytes = image_bytes
+        self.backend = backend
+        header = Image.open(io.BytesIO(image_bytes))  # header만 읽음 (pixel decode 없음)
+        self.size: tuple[int, int] = header.size
+        self.is_jpeg = header.format == "JPEG"
+
+        if self.is_jpeg and target_side > 0:
+            scale = _pick_scale(max(self.size), target_side)
+            self.image = _decode_jpeg(image_bytes, scale, backend)
+        else:
+            self.image = header.convert("RGB")
+        # 축소 배율은 ceil 처리로 축마다 조금 다를 수 있음
+        self.fx = self.size[0] / self.image.width
+        self.fy = self.size[1] / self.image.height
+        # 마지막으로 만든 고해상도 decode (scale, image)
+        self._hires: Optional[tuple[int, Image.Image]] = None
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+    @property
+    def reduced(self) -> bool:
+        return self.image.size != self.size
+
+    def rescale_objects(self, objects: list[dict[str, Any]]) -> None:
+        # 축소 이미지 기준 bbox_xyxy -> 원본 좌표 (in-place)
+        if not self.reduced:
+            return
+        for o in objects:
+            x1, y1, x2, y2 = o["bbox_xyxy"]
+            o["bbox_xyxy"] = [
+                int(round(x1 * self.fx)),
+                int(round(y1 * self.fy)),
+                int(round(x2 * self.fx)),
+                int(round(y2 * self.fy)),
+            ]
+
+    def _at_scale(self, scale: int) -> tuple[Image.Image, float, float]:
+        if scale >= max(self.fx, self.fy):
+            # 축소 이미지가 이미 충분한 해상도
+            return self.image, self.fx, self.fy
+        if self._hires is None or self._hires[0] > scale:
+            self._hires = (scale, _decode_jpeg(self.image_bytes, scale, self.backend))
+        im = self._hires[1]
+        return im, self.size[0] / im.width, self.size[1] / im.height
+
+    def full(self) -> Image.Image:
+        return self._at_scale(1)[0]
+
+    def crop(self, box: tuple[int, int, int, int], min_side: int = 384) -> Image.Image:
+        """
+        원본 좌표 box 영역. 짧은 변이 min_side 이상 남는 가장 작은 해상도에서 잘라냄
+        (큰 객체는 축소 이미지에서 바로, 작은 객체만 더 큰 배율로 다시 decode).
+        """
+        x1, y1, x2, y2 = box
+        scale = 1
+        if self.is_jpeg and min_side > 0:
+            scale = _pick_scale(min(x2 - x1, y2 - y1), min_side)
+        im, fx, fy = self._at_scale(scale)
+        return im.crop(
+            (
+                int(x1 / fx),
+                int(y1 / fy),
+                min(im.width, int(round(x2 / fx))),
+                min(im.height, int(round(y2 / fy))),
+            )
+        )
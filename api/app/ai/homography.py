@@ -1,27 +1,118 @@
 from __future__ import annotations
 
+from typing import Any, Optional, Sequence
+
 import cv2
 import numpy as np
 
+# 지평선(w = 0) 근처/너머 점을 거르는 기준 (w가 이보다 작으면 맵 좌표 없음)
+HORIZON_EPS = 1e-6
+
 
 class HomographyMapper:
     """
     Example-level homography:
-      src_pts (u,v) 4 points in image
-      dst_pts (x,y) 4 points in map coordinates
+      src_pts (u,v) points in image
+      dst_pts (x,y) points in map coordinates
+    Exactly 4 pairs -> cv2.getPerspectiveTransform,
+    more than 4 pairs -> cv2.findHomography with RANSAC (outliers rejected).
+    The inverse matrix is precomputed for map -> image queries.
     """
 
     def __init__(
-        self, src_pts: list[tuple[float, float]], dst_pts: list[tuple[float, float]]
+        self,
+        src_pts: list[tuple[float, float]],
+        dst_pts: list[tuple[float, float]],
+        ransac_reproj_threshold: float = 3.0,  # RANSAC 허용 오차 (맵 좌표 단위)
     ):
-        if len(src_pts) != 4 or len(dst_pts) != 4:
-            raise ValueError("Need exactly 4 point correspondences (src=4, dst=4).")
+        if len(src_pts) != len(dst_pts) or len(src_pts) < 4:
+            raise ValueError(
+                "Need at least 4 point correspondences (len(src) == len(dst) >= 4)."
+            )
         self.src = np.array(src_pts, dtype=np.float32)
         self.dst = np.array(dst_pts, dtype=np.float32)
-        self.H = cv2.getPerspectiveTransform(self.src, self.dst)
+        if self.src.shape != (len(src_pts), 2) or self.dst.shape != self.src.shape:
+            raise ValueError("Each point must be a pair of numbers (x, y).")
+        try:
+            if len(self.src) == 4:
+                self.H = cv2.getPerspectiveTransform(self.src, self.dst)
+                self.inliers = 4
+            else:
+                H, mask = cv2.findHomography(
+                    self.src, self.dst, cv2.RANSAC, ransac_reproj_threshold
+                )
+                if H is None:
+                    raise ValueError("Failed to estimate homography from given points.")
+                self.H = H
+                self.inliers = int(mask.sum())
+        except cv2.error as e:
+            # 입력 점 문제로 OpenCV가 거부한 경우도 잘못된 요청으로 취급
+            raise ValueError(f"Failed to estimate homography: {e.err}") from e
+        # 같은 점이 중복되는 등 대응점이 퇴화(degenerate)되면 역행렬이 없음
+        if not np.all(np.isfinite(self.H)) or abs(np.linalg.det(self.H)) < 1e-12:
+            raise ValueError("Degenerate point correspondences (singular homography).")
+        self.H_inv = np.linalg.inv(self.H)
+        # 대응점(지면)이 있는 쪽의 w 부호. H 정규화(h33 = 1)에 따라 음수일 수 있음
+        w = self.src.astype(np.float64) @ self.H[2, :2] + self.H[2, 2]
+        self.ground_sign = 1.0 if np.median(w) > 0 else -1.0
+
+    @staticmethod
+    def _homogeneous(H: np.ndarray, pts: Any) -> np.ndarray:
+        # (N,2) 점들을 한 번의 행렬곱으로 투영 (homogeneous 좌표, (N,3))
+        pts = np.asarray(pts, dtype=np.float64).reshape(-1, 2)
+        return pts @ H[:, :2].T + H[:, 2]
+
+    @classmethod
+    def _project(cls, H: np.ndarray, pts: Any) -> np.ndarray:
+        ph = cls._homogeneous(H, pts)
+        return ph[:, :2] / ph[:, 2:3]
+
+    def uv_to_xy_batch(self, uv: Any) -> np.ndarray:
+        """(N,2) image (u,v) -> (N,2) map (x,y)"""
+        return self._project(self.H, uv)
+
+    def xy_to_uv_batch(self, xy: Any) -> np.ndarray:
+        """(N,2) map (x,y) -> (N,2) image (u,v)"""
+        return self._project(self.H_inv, xy)
 
     def uv_to_xy(self, u: float, v: float) -> tuple[float, float]:
-        p = np.array([[[u, v]]], dtype=np.float32)  # (1,1,2)
-        out = cv2.perspectiveTransform(p, self.H)  # (1,1,2)
-        x, y = out[0, 0]
+        x, y = self.uv_to_xy_batch(((u, v),))[0]
         return float(x), float(y)
+
+    def xy_to_uv(self, x: float, y: float) -> tuple[float, float]:
+        u, v = self.xy_to_uv_batch(((x, y),))[0]
+        return float(u), float(v)
+
+    @staticmethod
+    def foot_point(bbox_xyxy: Sequence[float]) -> tuple[float, float]:
+        # 지면에 닿는 점 = bbox 하단 중앙
+        x1, _, x2, y2 = bbox_xyxy
+        return (x1 + x2) / 2.0, float(y2)
+
+    def map_detections(
+        self, objects: list[dict[str, Any]]
+    ) -> list[Optional[list[float]]]:
+        """
+        _run_yolo 결과(detection list)의 foot point를 한 번에 맵 좌표로 변환.
+        bbox가 없거나 foot point가 지평선 근처/너머(카메라 뒤쪽으로 뒤집힌 좌표)면 None.
+        반환 리스트는 objects와 같은 순서.
+        """
+        idx: list[int] = []
+        pts: list[tuple[float, float]] = []
+        for i, o in enumerate(objects):
+            bbox = o.get("bbox_xyxy")
+            if bbox and len(bbox) == 4:
+                idx.append(i)
+                pts.append(self.foot_point(bbox))
+
+        world: list[Optional[list[float]]] = [None] * len(objects)
+        if pts:
+            ph = self._homogeneous(self.H, pts)
+            w = ph[:, 2]
+            valid = w * self.ground_sign > HORIZON_EPS
+            xy = ph[:, :2] / np.where(valid, w, 1.0)[:, None]
+            valid &= np.isfinite(xy).all(axis=1)
+            for i, ok, (x, y) in zip(idx, valid.tolist(), xy.tolist()):
+                if ok:
+                    world[i] = [x, y]
+        return world
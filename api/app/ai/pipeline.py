@@ -2,12 +2,24 @@ from __future__ import annotations
 
 import base64
 import io
+import threading
 from dataclasses import dataclass
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, Optional
 
 from PIL import Image
 
+from app.ai.decode import DecodeBackend, DecodedImage
+from app.ai.stream import dhash_image, hamming
+from app.ai.tracking import RedisTrackerRegistry, Track, TrackerRegistry
+from app.infra.metrics import count_cache, stage_timer
+from app.infra.profiler import profile_hook
+
+if TYPE_CHECKING:
+    from app.ai.homography import HomographyMapper
+
 Label = Literal["person", "vehicle", "fire", "smoke", "accident", "unknown"]
+# 모델별 load 상태 (failed면 stub으로 동작)
+ModelState = Literal["disabled", "pending", "loading", "ready", "failed"]
 
 
 # ai pipeline의 설정을 관리하기 위한 클래스입니다.
@@ -18,47 +30,127 @@ class PipelineConfig:
     yolo_model: str = "yolov8n.pt"  # dafualt: YOLOv8 Nano
     use_blip: bool = True
     blip_model: str = "Salesforce/blip-image-captioning-base"  # dafualt: BLIP Base
+    # 기본 homography 대응점 (이미지 (u,v) 4점 -> 맵 (x,y) 4점). 없으면 world 좌표 생략
+    homography_src_pts: Optional[list[list[float]]] = None
+    homography_dst_pts: Optional[list[list[float]]] = None
+    # camera별 객체 tracking: 같은 track의 crop이 거의 안 바뀌었으면 BLIP caption 재사용
+    use_tracking: bool = False
+    track_iou_threshold: float = 0.3
+    track_max_age_sec: float = 5.0
+    caption_reuse_hash_threshold: int = 6  # crop dHash hamming 거리 (64bit 기준)
+    # tracker 상태 위치: "redis"(여러 프로세스가 공유, 운영) | "memory"(단일 프로세스)
+    track_store: Literal["redis", "memory"] = "redis"
+    track_state_ttl_sec: float = 3600.0  # 이 시간 동안 frame이 없던 카메라의 tracker 상태 제거
+    # 축소 해상도 decode (decode.py): JPEG를 긴 변이 이 값 이상인 가장 작은 1/2^k 배율로 decode
+    # 0이면 원본 해상도. BLIP crop은 짧은 변 crop_min_side 이상이 되도록 필요할 때만 다시 decode
+    decode_target_side: int = 640
+    decode_backend: DecodeBackend = "pil"  # "pil" (Image.draft) | "cv2" (IMREAD_REDUCED_*)
+    crop_min_side: int = 384
 
 
 class AIPipeline:
     """
     Synchronous pipeline:
-      input base64 -> bytes -> PIL
-      YOLOv8n -> objects
-      crop best -> BLIP base caption
+      input base64 -> bytes -> reduced-resolution decode
+      YOLOv8n -> objects (bbox rescaled to original pixels)
+      crop best (lazy higher-resolution decode if needed) -> BLIP base caption
       risk_level rule (fire/smoke/accident => high else normal)
+      (optional) homography -> world (x,y) per object
+      (optional) per-camera IoU tracking -> track_id, caption reuse per track
     Default: stub mode unless dependencies installed.
+    lazy=True면 모델(ultralytics/transformers/torch import 포함)은 load_models() 또는
+    첫 추론 호출 때 load.
     """
 
     # 모델 준비
-    def __init__(self, cfg: PipelineConfig):
+    def __init__(self, cfg: PipelineConfig, lazy: bool = False, redis_client=None):
         self.cfg = cfg
-        # YOLO
         self.yolo = None
-        if cfg.use_yolo:
-            try:
-                from ultralytics import YOLO  # type: ignore
-
-                self.yolo = YOLO(cfg.yolo_model)
-            except Exception:
-                self.yolo = None
-        # BLIP (base)
         self.blip_processor = None
         self.blip_model = None
-        if cfg.use_blip:
-            try:
-                from transformers import (  # type: ignore
-                    BlipForConditionalGeneration,
-                    BlipProcessor,
-                )
+        self.model_state: dict[str, ModelState] = {
+            "yolo": "pending" if cfg.use_yolo else "disabled",
+            "blip": "pending" if cfg.use_blip else "disabled",
+        }
+        self.model_errors: dict[str, str] = {}
+        self._load_lock = threading.Lock()
+        # Tracking (camera_id별 tracker). track_store="redis"는 redis_client가 있어야 함
+        self.trackers: Optional[TrackerRegistry | RedisTrackerRegistry] = None
+        if cfg.use_tracking:
+            track_kwargs = dict(
+                iou_threshold=cfg.track_iou_threshold,
+                max_age_sec=cfg.track_max_age_sec,
+                state_ttl_sec=cfg.track_state_ttl_sec,
+            )
+            if cfg.track_store == "redis":
+                if redis_client is None:
+                    raise ValueError("track_store='redis' requires a redis client")
+                self.trackers = RedisTrackerRegistry(redis_client, **track_kwargs)
+            else:
+                self.trackers = TrackerRegistry(**track_kwargs)
+        # Homography (설정된 경우에만 cv2 import)
+        self.mapper: Optional[HomographyMapper] = None
+        if cfg.homography_src_pts and cfg.homography_dst_pts:
+            from app.ai.homography import HomographyMapper
 
-                self.blip_processor = BlipProcessor.from_pretrained(cfg.blip_model)
-                self.blip_model = BlipForConditionalGeneration.from_pretrained(
-                    cfg.blip_model
-                )
-            except Exception:
-                self.blip_processor = None
-                self.blip_model = None
+            self.mapper = HomographyMapper(
+                src_pts=[tuple(p) for p in cfg.homography_src_pts],
+                dst_pts=[tuple(p) for p in cfg.homography_dst_pts],
+            )
+        if not lazy:
+            self.load_models()
+
+    def load_models(self) -> None:
+        """
+        아직 load되지 않은 모델을 load하고 dummy 추론 1회로 warm-up (여러 번 호출해도 1회만).
+        load/warm-up에 실패한 모델은 failed 상태로 두고 stub으로 동작.
+        """
+        if self.models_ready:
+            return
+        with self._load_lock:
+            if self.model_state["yolo"] == "pending":
+                self._load_model("yolo", self._load_yolo)
+            if self.model_state["blip"] == "pending":
+                self._load_model("blip", self._load_blip)
+
+    def _load_model(self, name: str, load) -> None:
+        self.model_state[name] = "loading"
+        try:
+            with stage_timer(f"load_{name}"):
+                load()
+            self.model_state[name] = "ready"
+        except Exception as e:
+            self.model_state[name] = "failed"
+            self.model_errors[name] = f"{type(e).__name__}: {e}"
+
+    def _load_yolo(self) -> None:
+        from ultralytics import YOLO  # type: ignore
+
+        yolo = YOLO(self.cfg.yolo_model)
+        yolo(_blank_image(), verbose=False)  # warm-up
+        self.yolo = yolo
+
+    def _load_blip(self) -> None:
+        from transformers import (  # type: ignore
+            BlipForConditionalGeneration,
+            BlipProcessor,
+        )
+
+        processor = BlipProcessor.from_pretrained(self.cfg.blip_model)
+        model = BlipForConditionalGeneration.from_pretrained(self.cfg.blip_model)
+        inputs = processor(images=_blank_image(), return_tensors="pt").to("cpu")
+        model.generate(**inputs, max_new_tokens=1)  # warm-up
+        self.blip_processor, self.blip_model = processor, model
+
+    @property
+    def models_ready(self) -> bool:
+        # load가 끝났는지 (failed도 stub으로 응답 가능하므로 끝난 것으로 봄)
+        return all(s not in ("pending", "loading") for s in self.model_state.values())
+
+    @property
+    def models_failed(self) -> bool:
+        # 사용하도록 설정된 모델 중 load/warm-up에 실패한 것이 있음 (stub 응답 중)
+        return any(s == "failed" for s in self.model_state.values())
 
     @staticmethod
     def decode_base64_image(image_base64: str) -> bytes:
@@ -68,22 +160,62 @@ class AIPipeline:
     def pil_from_bytes(image_bytes: bytes) -> Image.Image:
         return Image.open(io.BytesIO(image_bytes)).convert("RGB")
 
-    @staticmethod
-    def _crop_best(pil: Image.Image, objects: list[dict[str, Any]]) -> Image.Image:
+    def decode_image(self, image_bytes: bytes) -> DecodedImage:
+        return DecodedImage(
+            image_bytes,
+            target_side=self.cfg.decode_target_side,
+            backend=self.cfg.decode_backend,
+        )
+
+    def _crop_best(
+        self, decoded: DecodedImage, objects: list[dict[str, Any]]
+    ) -> Image.Image:
+        whole = (0, 0, decoded.width, decoded.height)
         if not objects:
-            return pil
+            return decoded.crop(whole, self.cfg.crop_min_side)
         best = max(objects, key=lambda o: o.get("confidence", 0.0))
         bbox = best.get("bbox_xyxy")
         if not bbox or len(bbox) != 4:
-            return pil
+            return decoded.crop(whole, self.cfg.crop_min_side)
         x1, y1, x2, y2 = map(int, bbox)
         x1 = max(0, x1)
         y1 = max(0, y1)
-        x2 = min(pil.width, x2)
-        y2 = min(pil.height, y2)
+        x2 = min(decoded.width, x2)
+        y2 = min(decoded.height, y2)
         if x2 <= x1 or y2 <= y1:
-            return pil
-        return pil.crop((x1, y1, x2, y2))
+            return decoded.crop(whole, self.cfg.crop_min_side)
+        return decoded.crop((x1, y1, x2, y2), self.cfg.crop_min_side)
+
+    @staticmethod
+    def _best_track(
+        objects: list[dict[str, Any]], tracks: Optional[list[Optional[Track]]]
+    ) -> Optional[Track]:
+        # _crop_best와 같은 기준(최고 confidence)으로 고른 객체의 track
+        if not objects or not tracks:
+            return None
+        best_i = max(
+            range(len(objects)), key=lambda i: objects[i].get("confidence", 0.0)
+        )
+        return tracks[best_i]
+
+    def _cached_caption(
+        self, track: Optional[Track], crop: Image.Image
+    ) -> tuple[Optional[str], Optional[int]]:
+        """
+        track에 캐시된 caption을 재사용할 수 있으면 (caption, crop_hash),
+        아니면 (None, crop_hash)
+        """
+        if track is None:
+            return None, None
+        crop_hash = dhash_image(crop)
+        hit = (
+            track.caption is not None
+            and track.crop_hash is not None
+            and hamming(track.crop_hash, crop_hash)
+            <= self.cfg.caption_reuse_hash_threshold
+        )
+        count_cache("caption", hit)
+        return (track.caption if hit else None), crop_hash
 
     @staticmethod
     def _map_yolo_cls_to_label(cls_id: int) -> Label:
@@ -103,21 +235,20 @@ class AIPipeline:
             return "high"
         return "normal"
 
-    def _run_yolo(self, pil: Image.Image) -> list[dict[str, Any]]:
-        if self.yolo is None:
-            # stub: 예제용
-            return [
-                {
-                    "label": "unknown",
-                    "confidence": 0.5,
-                    "bbox_xyxy": [0, 0, min(100, pil.width), min(100, pil.height)],
-                }
-            ]
+    @staticmethod
+    def _stub_objects(decoded: DecodedImage) -> list[dict[str, Any]]:
+        # stub: 예제용 (원본 좌표)
+        return [
+            {
+                "label": "unknown",
+                "confidence": 0.5,
+                "bbox_xyxy": [0, 0, min(100, decoded.width), min(100, decoded.height)],
+            }
+        ]
 
-        results = self.yolo(pil, verbose=False)
-        r0 = results[0]
+    def _objects_from_result(self, r) -> list[dict[str, Any]]:
         objects: list[dict[str, Any]] = []
-        for b in r0.boxes:
+        for b in r.boxes:
             xyxy = [int(x) for x in b.xyxy[0].tolist()]
             conf = float(b.conf[0])
             cls_id = int(b.cls[0])
@@ -125,6 +256,29 @@ class AIPipeline:
             objects.append({"label": label, "confidence": conf, "bbox_xyxy": xyxy})
         return objects
 
+    def _run_yolo(self, decoded: DecodedImage) -> list[dict[str, Any]]:
+        if self.yolo is None:
+            return self._stub_objects(decoded)
+
+        # 축소 이미지로 추론 후 bbox를 원본 좌표로
+        results = self.yolo(decoded.image, verbose=False)
+        objects = self._objects_from_result(results[0])
+        decoded.rescale_objects(objects)
+        return objects
+
+    def _run_yolo_batch(
+        self, decoded_list: list[DecodedImage]
+    ) -> list[list[dict[str, Any]]]:
+        # 여러 이미지를 YOLO 1회 호출로 처리
+        if self.yolo is None:
+            return [self._stub_objects(d) for d in decoded_list]
+
+        results = self.yolo([d.image for d in decoded_list], verbose=False)
+        objects_list = [self._objects_from_result(r) for r in results]
+        for d, objects in zip(decoded_list, objects_list):
+            d.rescale_objects(objects)
+        return objects_list
+
     def _run_blip(self, pil: Image.Image) -> str:
         if self.blip_model is None or self.blip_processor is None:
             return "stub caption: models not installed."
@@ -134,13 +288,64 @@ class AIPipeline:
         caption = self.blip_processor.decode(out[0], skip_special_tokens=True)
         return caption
 
-    def run_from_base64(self, image_base64: str) -> dict[str, Any]:
-        image_bytes = self.decode_base64_image(image_base64)
-        pil = self.pil_from_bytes(image_bytes)
+    def _run_blip_batch(self, pils: list[Image.Image]) -> list[str]:
+        # 여러 crop을 BLIP generate 1회로 처리
+        if self.blip_model is None or self.blip_processor is None:
+            return ["stub caption: models not installed." for _ in pils]
+
+        inputs = self.blip_processor(images=pils, return_tensors="pt").to("cpu")
+        out = self.blip_model.generate(**inputs, max_new_tokens=40)
+        return self.blip_processor.batch_decode(out, skip_special_tokens=True)
+
+    @staticmethod
+    def _attach_world_xy(
+        objects: list[dict[str, Any]], mapper: HomographyMapper
+    ) -> None:
+        # 모든 detection의 foot point를 한 번에 맵 좌표로 변환
+        for o, world_xy in zip(objects, mapper.map_detections(objects)):
+            o["world_xy"] = world_xy
+
+    def run_from_base64(
+        self,
+        image_base64: str,
+        mapper: Optional[HomographyMapper] = None,
+        camera_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        # profiler가 arm 상태일 때만 수집 (profiler.py)
+        with profile_hook():
+            with stage_timer("decode_base64"):
+                image_bytes = self.decode_base64_image(image_base64)
+            return self.run_from_bytes(image_bytes, mapper=mapper, camera_id=camera_id)
+
+    def run_from_bytes(
+        self,
+        image_bytes: bytes,
+        mapper: Optional[HomographyMapper] = None,
+        camera_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        self.load_models()
+        with stage_timer("pil_from_bytes"):
+            decoded = self.decode_image(image_bytes)
+
+        with stage_timer("yolo"):
+            objects = self._run_yolo(decoded)
+        mapper = mapper or self.mapper
+        if mapper is not None:
+            self._attach_world_xy(objects, mapper)
+        tracks = self.trackers.update(camera_id, objects) if self.trackers else None
 
-        objects = self._run_yolo(pil)
-        crop = self._crop_best(pil, objects)
-        caption = self._run_blip(crop)
+        with stage_timer("crop"):
+            crop = self._crop_best(decoded, objects)
+        best_track = self._best_track(objects, tracks)
+        caption, crop_hash = self._cached_caption(best_track, crop)
+        if caption is None:
+            # 새 track이거나 crop이 크게 바뀐 경우에만 BLIP 실행
+            with stage_timer("blip"):
+                caption = self._run_blip(crop)
+            if best_track is not None:
+                self.trackers.remember_caption(
+                    camera_id, best_track, caption, crop_hash
+                )
 
         risk_level = self._infer_risk(objects)
 
@@ -150,3 +355,76 @@ class AIPipeline:
             "risk_level": risk_level,
             "image_bytes": image_bytes,
         }
+
+    def run_batch_from_bytes(
+        self,
+        images: list[bytes],
+        mapper: Optional[HomographyMapper] = None,
+        camera_id: Optional[str] = None,
+        camera_ids: Optional[list[Optional[str]]] = None,
+        mappers: Optional[list[Optional[HomographyMapper]]] = None,
+        decoded: Optional[list[DecodedImage]] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        여러 이미지를 한 번에 처리 (YOLO/BLIP 각각 batch 1회 호출).
+        camera_id가 주어지면 images를 같은 카메라의 시간 순서 frame으로 보고 tracking.
+        여러 카메라 frame이 섞인 batch는 camera_ids / mappers로 이미지별 지정.
+        decoded: 호출 측에서 decode_image()로 미리 decode한 결과 (이미지별 decode 오류를 먼저 거를 때)
+        반환 리스트는 images와 같은 순서.
+        """
+        if not images:
+            return []
+        if camera_ids is None:
+            camera_ids = [camera_id] * len(images)
+        if mappers is None:
+            mappers = [mapper] * len(images)
+        self.load_models()
+        with profile_hook():
+            with stage_timer("pil_from_bytes_batch"):
+                decoded_list = decoded or [self.decode_image(b) for b in images]
+
+            with stage_timer("yolo_batch"):
+                objects_list = self._run_yolo_batch(decoded_list)
+            for objects, m in zip(objects_list, mappers):
+                m = m or self.mapper
+                if m is not None:
+                    self._attach_world_xy(objects, m)
+            crops = [self._crop_best(d, o) for d, o in zip(decoded_list, objects_list)]
+
+            # frame 순서대로 tracking 후, caption을 재사용할 수 없는 frame만 BLIP batch로
+            captions: list[Optional[str]] = [None] * len(images)
+            pending: list[tuple[int, Optional[Track], Optional[int]]] = []
+            for i, objects in enumerate(objects_list):
+                tracks = (
+                    self.trackers.update(camera_ids[i], objects)
+                    if self.trackers
+                    else None
+                )
+                best_track = self._best_track(objects, tracks)
+                captions[i], crop_hash = self._cached_caption(best_track, crops[i])
+                if captions[i] is None:
+                    pending.append((i, best_track, crop_hash))
+
+            with stage_timer("blip_batch"):
+                generated = self._run_blip_batch([crops[i] for i, _, _ in pending])
+            for (i, best_track, crop_hash), caption in zip(pending, generated):
+                captions[i] = caption
+                if best_track is not None:
+                    self.trackers.remember_caption(
+                        camera_ids[i], best_track, caption, crop_hash
+                    )
+
+            return [
+                {
+                    "objects": objects,
+                    "caption": caption,
+                    "risk_level": self._infer_risk(objects),
+                    "image_bytes": image_bytes,
+                }
+                for image_bytes, objects, caption in zip(images, objects_list, captions)
+            ]
+
+
+def _blank_image() -> Image.Image:
+    # warm-up용 입력 (YOLO 기본 입력 크기)
+    return Image.new("RGB", (640, 640))
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import io
+from typing import AsyncIterable, Iterable, Iterator, Optional, TypeVar
+
+from PIL import Image
+
+# 프레임 시퀀스(MJPEG stream / 로컬 영상 파일) ingestion 유틸
+#   stream -> JPEG frame 분리 -> difference hash로 거의 같은 frame 제거 -> batch
+
+# 직전에 분석한 frame과의 dHash hamming 거리가 이 값 이하면 skip (64bit 기준)
+DEFAULT_HASH_THRESHOLD = 5
+DEFAULT_BATCH_SIZE = 4
+# 한 frame의 최대 크기 (SOI 이후 EOI가 안 나오는 깨진 stream 방어)
+MAX_FRAME_BYTES = 32 * 1024 * 1024
+
+_SOI = b"\xff\xd8"
+
+# marker 종류 (ITU T.81 B.1.1.3)
+_M_EOI = 0xD9
+_M_SOS = 0xDA
+_M_TEM = 0x01
+_M_RST = range(0xD0, 0xD8)
+
+T = TypeVar("T")
+
+
+class JpegFrameSplitter:
+    """
+    byte chunk들을 받아 완성된 JPEG frame(SOI~EOI)을 잘라냄.
+    multipart/x-mixed-replace(MJPEG)의 part header/boundary나 단순히 이어붙인 JPEG stream 모두 처리.
+    SOI 이후 marker segment를 length로 건너뛰며 따라가므로 APP1(EXIF) 안의 thumbnail
+    SOI/EOI에 잘리지 않음. SOS 이후 entropy-coded data에서는 stuffing(FF 00)/RSTn을 제외한
+    다음 marker를 찾음 (progressive JPEG의 여러 scan 포함).
+    marker 구조가 깨진 frame은 버리고 corrupt 수를 셈.
+    """
+
+    def __init__(self, max_frame_bytes: int = MAX_FRAME_BYTES):
+        self.max_frame_bytes = max_frame_bytes
+        self.corrupt = 0  # 구조가 깨졌거나 max_frame_bytes를 넘어서 버린 frame 수
+        self._buf = bytearray()
+        self._in_frame = False  # _buf[0:2]가 현재 frame의 SOI
+        self._pos = 0  # 다음에 읽을 위치 (chunk 사이에 이어서 진행)
+        self._in_scan = False
+
+    def _walk(self) -> Optional[int]:
+        """
+        Returns: frame 끝 위치(EOI 다음), 데이터 부족이면 None, 구조가 깨졌으면 -1
+        """
+        buf = self._buf
+        n = len(buf)
+        pos = self._pos
+        while True:
+            if self._in_scan:
+                i = buf.find(b"\xff", pos)
+                if i < 0 or i + 1 >= n:
+                    self._pos = n - 1 if i >= 0 else n
+                    return None
+                m = buf[i + 1]
+                if m == 0x00 or m in _M_RST:
+                    pos = i + 2
+                    continue
+                if m == 0xFF:
+                    pos = i + 1  # fill byte
+                    continue
+                self._in_scan = False
+                pos = i
+            if pos + 1 >= n:
+                self._pos = pos
+                return None
+            if buf[pos] != 0xFF:
+                return -1
+            m = buf[pos + 1]
+            if m == 0xFF:
+                pos += 1  # fill byte
+                continue
+            if m == _M_EOI:
+                return pos + 2
+            if m == _M_TEM or m in _M_RST:
+                pos += 2
+                continue
+            if m == 0xD8 or m == 0x00:
+                return -1
+            if pos + 3 >= n:
+                self._pos = pos
+                return None
+            length = (buf[pos + 2] << 8) | buf[pos + 3]
+            if length < 2:
+                return -1
+            pos += 2 + length
+            if m == _M_SOS:
+                self._in_scan = True
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        self._buf += chunk
+        frames: list[bytes] = []
+        while True:
+            if not self._in_frame:
+                start = self._buf.find(_SOI)
+                if start < 0:
+                    # marker가 chunk 경계에 걸칠 수 있으므로 마지막 1 byte는 남김
+                    del self._buf[:-1]
+                    break
+                del self._buf[:start]
+                self._in_frame, self._pos, self._in_scan = True, 2, False
+            end = self._walk()
+            if end is None:
+                if len(self._buf) > self.max_frame_bytes:
+                    self.corrupt += 1
+                    self._buf.clear()
+                    self._in_frame = False
+                break
+            self._in_frame = False
+            if end < 0:
+                # 깨진 frame: 이 SOI만 버리고 다음 SOI부터 다시 찾음
+                self.corrupt += 1
+                del self._buf[:2]
+                continue
+            frames.append(bytes(self._buf[:end]))
+            del self._buf[:end]
+        return frames
+
+
+def iter_jpeg_frames(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    splitter = JpegFrameSplitter()
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+
+
+async def aiter_jpeg_frames(
+    chunks: AsyncIterable[bytes], splitter: Optional[JpegFrameSplitter] = None
+):
+    splitter = splitter or JpegFrameSplitter()
+    async for chunk in chunks:
+        for frame in splitter.feed(chunk):
+            yield frame
+
+
+def iter_video_file_frames(
+    path: str, every_n: int = 1
+) -> Iterator[tuple[int, bytes]]:
+    """
+    로컬 영상 파일을 frame 단위로 decode해서 (원본 frame index, JPEG bytes)로 yield.
+    every_n > 1 이면 n frame마다 1개만 사용.
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"cannot open video: {path}")
+    try:
+        idx = 0
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if idx % every_n == 0:
+                ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+                if ok:
+                    yield idx, buf.tobytes()
+            idx += 1
+    finally:
+        cap.release()
+
+
+def dhash(image_bytes: bytes, hash_size: int = 8) -> int:
+    """
+    difference hash (64bit). JPEG는 draft로 축소 decode해서 거의 비용이 없음.
+    """
+    im = Image.open(io.BytesIO(image_bytes))
+    im.draft("L", (hash_size * 8, hash_size * 8))
+    return dhash_image(im, hash_size)
+
+
+def dhash_image(im: Image.Image, hash_size: int = 8) -> int:
+    small = im.convert("L").resize(
+        (hash_size + 1, hash_size), Image.Resampling.BILINEAR
+    )
+    px = small.load()
+    h = 0
+    for y in range(hash_size):
+        for x in range(hash_size):
+            h = (h << 1) | (1 if px[x, y] > px[x + 1, y] else 0)
+    return h
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class FrameDeduplicator:
+    """
+    직전에 통과시킨 frame과 비교해서 변화가 작은 frame을 걸러냄.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_HASH_THRESHOLD):
+        self.threshold = threshold
+        self._last: Optional[int] = None
+
+    def is_changed(self, frame_hash: int) -> bool:
+        if self._last is not None:
+            if hamming(self._last, frame_hash) <= self.threshold:
+                return False
+        self._last = frame_hash
+        return True
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Optional, Sequence
+
+from app.infra import jsonutil
+from app.infra.metrics import count_error
+
+logger = logging.getLogger(__name__)
+
+# camera별 tracker 상태 보관
+#   TrackerRegistry      : 프로세스 메모리 (단일 프로세스용: bench, 개발 서버)
+#   RedisTrackerRegistry : Redis 공유 (prefork worker child / uvicorn worker 여러 개)
+# 같은 카메라 frame이 여러 프로세스로 나뉘어 들어와도 track_id가 카메라 단위로 유일하고 이어지도록
+# 운영에서는 Redis를 사용. 일정 시간(state_ttl_sec) frame이 없던 카메라 상태는 제거.
+
+
+@dataclass
+class Track:
+    track_id: int
+    label: str
+    bbox: list[float]
+    last_seen: float
+    # 이 track의 crop에 대해 마지막으로 생성한 caption과 crop dHash (caption 재사용 판단용)
+    caption: Optional[str] = None
+    crop_hash: Optional[int] = None
+
+
+def iou(a: Sequence[float], b: Sequence[float]) -> float:
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    iw, ih = max(0.0, ix2 - ix1), max(0.0, iy2 - iy1)
+    inter = iw * ih
+    if inter <= 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / (area_a + area_b - inter)
+
+
+class IoUTracker:
+    """
+    카메라 1대의 frame 간 detection 연결 (IoU 기반 greedy association).
+      - 같은 label끼리 IoU가 큰 순서로 기존 track과 매칭
+      - 매칭 안 된 detection은 새 track
+      - max_age_sec 동안 안 보인 track은 제거
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_age_sec: float = 5.0):
+        self.iou_threshold = iou_threshold
+        self.max_age_sec = max_age_sec
+        self._tracks: dict[int, Track] = {}
+        self._next_id = 1
+
+    def to_state(self) -> dict[str, Any]:
+        return {
+            "next_id": self._next_id,
+            "tracks": [asdict(t) for t in self._tracks.values()],
+        }
+
+    @classmethod
+    def from_state(
+        cls, state: dict[str, Any], iou_threshold: float, max_age_sec: float
+    ) -> "IoUTracker":
+        tracker = cls(iou_threshold, max_age_sec)
+        tracker._next_id = int(state.get("next_id", 1))
+        for t in state.get("tracks", []):
+            track = Track(**t)
+            tracker._tracks[track.track_id] = track
+        return tracker
+
+    def find(self, track_id: int) -> Optional[Track]:
+        return self._tracks.get(track_id)
+
+    def update(
+        self, objects: list[dict[str, Any]], now: Optional[float] = None
+    ) -> list[Optional[Track]]:
+        """
+        objects 각각에 "track_id"를 채우고, objects와 같은 순서의 Track 리스트 반환.
+        (bbox가 없는 객체는 None)
+        """
+        now = time.monotonic() if now is None else now
+        expired = [
+            tid
+            for tid, t in self._tracks.items()
+            if now - t.last_seen > self.max_age_sec
+        ]
+        for tid in expired:
+            del self._tracks[tid]
+
+        pairs: list[tuple[float, int, int]] = []
+        for i, o in enumerate(objects):
+            bbox = o.get("bbox_xyxy")
+            if not bbox or len(bbox) != 4:
+                continue
+            for t in self._tracks.values():
+                if t.label != o.get("label"):
+                    continue
+                score = iou(bbox, t.bbox)
+                if score >= self.iou_threshold:
+                    pairs.append((score, i, t.track_id))
+        pairs.sort(reverse=True)
+
+        assigned: list[Optional[Track]] = [None] * len(objects)
+        used_tracks: set[int] = set()
+        for _, i, tid in pairs:
+            if assigned[i] is not None or tid in used_tracks:
+                continue
+            assigned[i] = self._tracks[tid]
+            used_tracks.add(tid)
+
+        for i, o in enumerate(objects):
+            bbox = o.get("bbox_xyxy")
+            if not bbox or len(bbox) != 4:
+                o["track_id"] = None
+                continue
+            track = assigned[i]
+            if track is None:
+                track = Track(
+                    track_id=self._next_id,
+                    label=o.get("label", "unknown"),
+                    bbox=list(bbox),
+                    last_seen=now,
+                )
+                self._tracks[track.track_id] = track
+                self._next_id += 1
+                assigned[i] = track
+            else:
+                track.bbox = list(bbox)
+                track.last_seen = now
+            o["track_id"] = track.track_id
+        return assigned
+
+
+class TrackerRegistry:
+    """
+    camera_id -> IoUTracker (프로세스 메모리). 여러 프로세스가 같은 카메라를 처리하면
+    track_id가 프로세스마다 따로 매겨지므로 단일 프로세스에서만 사용.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = 0.3,
+        max_age_sec: float = 5.0,
+        state_ttl_sec: float = 3600.0,
+    ):
+        self.iou_threshold = iou_threshold
+        self.max_age_sec = max_age_sec
+        self.state_ttl_sec = state_ttl_sec
+        self._lock = threading.Lock()
+        self._trackers: dict[str, IoUTracker] = {}
+        self._last_used: dict[str, float] = {}
+        self._swept_at = time.monotonic()
+
+    def _evict_idle(self, now: float) -> None:
+        # _lock 안에서 호출. 전체 순회는 state_ttl_sec/10마다 한 번만
+        if now - self._swept_at < self.state_ttl_sec / 10:
+            return
+        self._swept_at = now
+        for cam in [
+            c for c, t in self._last_used.items() if now - t > self.state_ttl_sec
+        ]:
+            del self._trackers[cam], self._last_used[cam]
+
+    def get(self, camera_id: Optional[str]) -> Optional[IoUTracker]:
+        if camera_id is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            tracker = self._trackers.get(camera_id)
+            if tracker is None:
+                tracker = IoUTracker(self.iou_threshold, self.max_age_sec)
+                self._trackers[camera_id] = tracker
+            self._last_used[camera_id] = now
+            return tracker
+
+    def update(
+        self, camera_id: Optional[str], objects: list[dict[str, Any]]
+    ) -> Optional[list[Optional[Track]]]:
+        tracker = self.get(camera_id)
+        return tracker.update(objects) if tracker else None
+
+    def remember_caption(
+        self,
+        camera_id: Optional[str],
+        track: Track,
+        caption: str,
+        crop_hash: Optional[int],
+    ) -> None:
+        # update()가 돌려준 Track이 tracker 안의 객체 그대로이므로 바로 기록
+        track.caption = caption
+        track.crop_hash = crop_hash
+
+
+class RedisTrackerRegistry:
+    """
+    camera별 tracker 상태(track 목록 + 다음 track_id)를 Redis key 하나에 JSON으로 저장.
+    update는 camera별 Redis lock 안에서 read-modify-write. key TTL(state_ttl_sec)로 idle 카메라 제거.
+    Redis 오류 시 해당 frame은 tracking 없이 진행 (track_id 없음, caption 재사용 없음).
+    """
+
+    KEY_PREFIX = "coop:tracks:"
+
+    def __init__(
+        self,
+        client,
+        iou_threshold: float = 0.3,
+        max_age_sec: float = 5.0,
+        state_ttl_sec: float = 3600.0,
+        lock_timeout_sec: float = 2.0,
+    ):
+        self.client = client
+        self.iou_threshold = iou_threshold
+        self.max_age_sec = max_age_sec
+        self.state_ttl_sec = state_ttl_sec
+        self.lock_timeout_sec = lock_timeout_sec
+
+    def _key(self, camera_id: str) -> str:
+        return f"{self.KEY_PREFIX}{camera_id}"
+
+    def _modify(self, camera_id: str, fn):
+        key = self._key(camera_id)
+        with self.client.lock(
+            f"{key}:lock",
+            timeout=self.lock_timeout_sec,
+            blocking_timeout=self.lock_timeout_sec,
+        ):
+            raw = self.client.get(key)
+            if raw:
+                tracker = IoUTracker.from_state(
+                    jsonutil.loads(raw), self.iou_threshold, self.max_age_sec
+                )
+            else:
+                tracker = IoUTracker(self.iou_threshold, self.max_age_sec)
+            result = fn(tracker)
+            self.client.set(
+                key,
+                jsonutil.dumps_bytes(tracker.to_state()),
+                ex=max(1, int(self.state_ttl_sec)),
+            )
+        return result
+
+    def update(
+        self, camera_id: Optional[str], objects: list[dict[str, Any]]
+    ) -> Optional[list[Optional[Track]]]:
+        if camera_id is None:
+            return None
+        try:
+            # 프로세스 간 공유 상태이므로 monotonic 대신 wall clock
+            return self._modify(
+                camera_id, lambda tracker: tracker.update(objects, now=time.time())
+            )
+        except Exception as e:
+            count_error("tracking")
+            logger.warning(f"track state update failed (camera={camera_id}): {e}")
+            for o in objects:
+                o["track_id"] = None
+            return None
+
+    def remember_caption(
+        self,
+        camera_id: Optional[str],
+        track: Track,
+        caption: str,
+        crop_hash: Optional[int],
+    ) -> None:
+        track.caption = caption
+        track.crop_hash = crop_hash
+        if camera_id is None:
+            return
+
+        def _set(tracker: IoUTracker) -> None:
+            stored = tracker.find(track.track_id)
+            if stored is not None:
+                stored.caption = caption
+                stored.crop_hash = crop_hash
+
+        try:
+            self._modify(camera_id, _set)
+        except Exception as e:
+            count_error("tracking")
+            logger.warning(f"track caption update failed (camera={camera_id}): {e}")
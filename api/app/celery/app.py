@@ -3,9 +3,14 @@ from pathlib import Path
 
 from celery import Celery
 
+from app.celery.result_codec import RESULT_SERIALIZER_NAME, register_result_serializer
+
 cfg_path = Path(__file__).resolve().parents[2] / "config/celery_config.json"
 celery_config = json.loads(cfg_path.read_text())
 
+# result backend 전용 serializer 등록 (msgpack/json + 선택적 압축)
+register_result_serializer(celery_config)
+
 celery_app = Celery(
     "app",
     broker=f"redis://{celery_config['broker_ip']}:{celery_config['broker_port']}/{celery_config['broker_db']}",
@@ -14,10 +19,15 @@ celery_app = Celery(
 # register celery signals (side-effect import)
 # celery_app 생성 후에 signal 모듈을 import하기 위해 뒤에 둠
 import app.celery.signal
+import app.celery.control  # worker remote control (profile_arm)
 
 celery_app.conf.update(
     include=["app.celery.task"],
     task_default_queue="analyze.default",
     # prefetch 방지하여 우선 처리 순서 보장
     worker_prefetch_multiplier=1,
+    # result backend(Redis) 메모리 절약: 만료 시간 + compact serializer
+    result_expires=celery_config.get("result_expires_sec", 3600),
+    result_serializer=RESULT_SERIALIZER_NAME,
+    result_accept_content=["json", RESULT_SERIALIZER_NAME],
 )
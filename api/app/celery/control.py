@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from celery.worker.control import control_command
+
+from app.infra.profiler import DEFAULT_DURATION_SEC, DEFAULT_INTERVAL_MS, arm_profiler
+
+# worker remote control command (side-effect import, app.py에서 등록)
+#   celery -A app.celery.app:celery_app control profile_arm cprofile 30 20
+#   또는 API: POST /v1/admin/profile {"target": "worker", ...}
+# worker main 프로세스에서 arm 파일만 기록하고, 실제 수집은 각 child가 다음 task부터 수행
+
+
+@control_command(
+    args=[
+        ("mode", str),
+        ("duration_sec", float),
+        ("max_tasks", int),
+        ("interval_ms", float),
+    ],
+    signature="<mode> [duration_sec] [max_tasks] [interval_ms]",
+)
+def profile_arm(
+    state,
+    mode: str = "sampling",
+    duration_sec: float = DEFAULT_DURATION_SEC,
+    max_tasks: Optional[int] = None,
+    interval_ms: float = DEFAULT_INTERVAL_MS,
+):
+    """Arm the pipeline profiler in this worker's child processes."""
+    try:
+        req = arm_profiler(
+            mode, duration_sec, max_tasks, interval_ms, target="worker"
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    return {"ok": req.session_id}
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import redis.asyncio as aioredis
+
+from app.infra import jsonutil
+
+logger = logging.getLogger(__name__)
+
+# 구독자 1명당 쌓아둘 수 있는 최대 event 수 (느린 구독자가 메모리를 잡아먹지 않도록)
+SUBSCRIBER_QUEUE_SIZE = 256
+# Redis 연결이 끊겼을 때 재연결 대기 시간
+RECONNECT_DELAY_SEC = 1.0
+
+
+@dataclass
+class EventFilter:
+    """
+    구독자가 받고 싶은 event 조건. None인 필드는 필터링하지 않음.
+    """
+
+    task_id: Optional[str] = None
+    risk_level: Optional[str] = None
+    camera_id: Optional[str] = None
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        if self.task_id is not None and event.get("task_id") != self.task_id:
+            return False
+        if self.risk_level is not None and event.get("risk_level") != self.risk_level:
+            return False
+        if self.camera_id is not None and event.get("camera_id") != self.camera_id:
+            return False
+        return True
+
+
+class Subscription:
+    """
+    구독자 1명의 event queue. 가득 차면 가장 오래된 event를 버림.
+    """
+
+    def __init__(self, event_filter: EventFilter, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.filter = event_filter
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event: dict[str, Any]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class TaskEventHub:
+    """
+    worker signal이 publish하는 task 완료 event(Redis Pub/Sub)를
+    API 프로세스 안에서 한 번만 구독하고, 연결된 클라이언트들에게 fan-out.
+    """
+
+    def __init__(self, config: dict[str, Any], channel: str):
+        self.config = config
+        self.channel = channel
+        self._subscriptions: set[Subscription] = set()
+        # task_id -> 완료를 기다리는 future들 (result_async long-poll 용)
+        self._waiters: dict[str, set[asyncio.Future]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        # Redis가 아직 떠있지 않아도 API 기동은 막지 않도록 background task에서 연결
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self, event_filter: EventFilter) -> Subscription:
+        sub = Subscription(event_filter)
+        self._subscriptions.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscriptions.discard(sub)
+
+    def register_waiter(self, task_id: str) -> asyncio.Future:
+        """
+        task_id의 완료 event가 도착하면 그 event로 resolve되는 future를 반환.
+        상태 조회 전에 등록해야 조회~대기 사이에 끝난 task를 놓치지 않음.
+        """
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(task_id, set()).add(fut)
+        return fut
+
+    def discard_waiter(self, task_id: str, fut: asyncio.Future) -> None:
+        waiters = self._waiters.get(task_id)
+        if waiters is None:
+            return
+        waiters.discard(fut)
+        if not waiters:
+            del self._waiters[task_id]
+
+    def _dispatch(self, event: dict[str, Any]) -> None:
+        for fut in self._waiters.pop(event.get("task_id"), ()):
+            if not fut.done():
+                fut.set_result(event)
+        for sub in list(self._subscriptions):
+            if sub.filter.matches(event):
+                sub.offer(event)
+
+    async def _run(self) -> None:
+        while True:
+            client = aioredis.Redis(
+                host=self.config["backend_ip"],
+                port=self.config["backend_port"],
+                db=self.config["backend_db"],
+                decode_responses=True,
+            )
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                logger.info(f"Event hub subscribed to '{self.channel}'")
+                # listen()은 메시지가 올 때까지 block (busy polling 없음)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        event = jsonutil.loads(message["data"])
+                    except ValueError:
+                        logger.warning("Failed to parse task event payload. Skipping.")
+                        continue
+                    self._dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event hub connection lost: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SEC)
+            finally:
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
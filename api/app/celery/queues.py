@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+import redis
+
+from app.celery.app import celery_app, celery_config
+
+logger = logging.getLogger(__name__)
+
+QUEUE_DEFAULT = "analyze.default"
+QUEUE_EMERGENCY = "analyze.emergency"
+ANALYZE_QUEUES = (QUEUE_EMERGENCY, QUEUE_DEFAULT)
+
+# 큐별 freshness: requested_at 이후 이 시간(초)이 지난 요청은 분석하지 않음 (없는 큐는 제한 없음)
+QUEUE_DEADLINES_SEC: dict[str, float] = celery_config.get("queue_deadlines_sec", {})
+# Celery expires = deadline + grace (worker의 deadline 검사가 먼저 처리하도록 여유)
+EXPIRES_GRACE_SEC: float = celery_config.get("expires_grace_sec", 30)
+
+_broker_client: redis.Redis | None = None
+
+
+def queue_for_image(image_id: str) -> str:
+    # 우선순위 규칙: image_id에 emergency 포함이면 긴급 큐
+    return QUEUE_EMERGENCY if "emergency" in image_id else QUEUE_DEFAULT
+
+
+def deadline_for(queue: str, requested_at: datetime) -> Optional[float]:
+    """
+    requested_at + 큐별 freshness (epoch 초). timezone 없는 requested_at은 UTC로 봄.
+    """
+    freshness = QUEUE_DEADLINES_SEC.get(queue)
+    if freshness is None:
+        return None
+    if requested_at.tzinfo is None:
+        requested_at = requested_at.replace(tzinfo=timezone.utc)
+    return requested_at.timestamp() + float(freshness)
+
+
+def _broker() -> redis.Redis:
+    global _broker_client
+    if _broker_client is None:
+        _broker_client = redis.Redis.from_url(
+            celery_app.conf.broker_url, socket_timeout=1.0
+        )
+    return _broker_client
+
+
+def queue_depths() -> dict[str, int]:
+    """
+    broker(Redis)에 쌓여 있는 analyze 큐 길이 (Celery redis transport는 큐 이름 key의 list)
+    """
+    pipe = _broker().pipeline(transaction=False)
+    for queue in ANALYZE_QUEUES:
+        pipe.llen(queue)
+    return dict(zip(ANALYZE_QUEUES, (int(n) for n in pipe.execute())))
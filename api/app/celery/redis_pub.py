@@ -1,15 +1,17 @@
-import json
 import logging
+from typing import Any
 
 import redis
 
 from app.celery.app import celery_config
+from app.infra import jsonutil
 
 logger = logging.getLogger(__name__)
 
 
 # celery_config.json 기반으로 redis client 생성
-def redis_client_from_config(config: dict) -> redis.Redis | None:
+# ping=False면 연결 확인 없이 반환 (첫 명령 때 연결, 오류는 호출하는 쪽에서 처리)
+def redis_client_from_config(config: dict, ping: bool = True) -> redis.Redis | None:
     try:
         client = redis.Redis(
             host=config["backend_ip"],
@@ -17,7 +19,8 @@ def redis_client_from_config(config: dict) -> redis.Redis | None:
             db=config["backend_db"],
             decode_responses=True,
         )
-        client.ping()  # Check connection
+        if ping:
+            client.ping()  # Check connection
         return client
     except Exception as e:
         logger.warning(f"Failed to connect to Redis: {e}")
@@ -25,21 +28,36 @@ def redis_client_from_config(config: dict) -> redis.Redis | None:
 
 
 # task 완료 event publish
+# result가 있으면 구독자(API /v1/events)가 결과 조회 없이 바로 쓸 수 있도록 같이 실어 보냄
 def publish_task_event(
-    channel: str, task_id: str, status: str, ok: bool, error: str | None, ts: float
+    channel: str,
+    task_id: str,
+    status: str,
+    ok: bool,
+    error: str | None,
+    ts: float,
+    result: dict[str, Any] | None = None,
 ):
     try:
         redis_client = redis_client_from_config(celery_config)
         if redis_client:
+            analyze_result = (result or {}).get("result") or {}
             payload = {
                 "task_id": task_id,
                 "status": status,
                 "ok": ok,
                 "error": error,
                 "ts": ts,
+                # 필터링(risk level / camera)용 필드
+                "risk_level": analyze_result.get("risk_level"),
+                "camera_id": analyze_result.get("camera_id"),
+                "result": result,
             }
-            redis_client.publish(channel, json.dumps(payload))
-            logger.info(f"Published task event to channel '{channel}': {payload}")
+            redis_client.publish(channel, jsonutil.dumps_bytes(payload))
+            logger.info(
+                f"Published task event to channel '{channel}': "
+                f"task_id={task_id} status={status} ok={ok}"
+            )
         else:
             logger.warning("Redis client not initialized. Skipping publish.")
     except Exception as e:
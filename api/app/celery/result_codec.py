@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import zlib
+from typing import Any
+
+from kombu.serialization import register
+
+from app.infra import jsonutil
+
+# Celery result backend 전용 serializer 이름 (celery_config의 result_serializer와 별개)
+RESULT_SERIALIZER_NAME = "analyze_result"
+RESULT_CONTENT_TYPE = "application/x-analyze-result"
+
+# payload 앞 2 byte에 포맷/압축 방식을 기록해서, 설정이 바뀌어도 기존 결과를 읽을 수 있게 함
+#   byte0: j(json) | m(msgpack)
+#   byte1: -(무압축) | z(zlib) | l(lz4)
+_FORMAT_JSON = b"j"
+_FORMAT_MSGPACK = b"m"
+_COMP_NONE = b"-"
+_COMP_ZLIB = b"z"
+_COMP_LZ4 = b"l"
+
+
+def _pack(obj: Any, fmt: str) -> bytes:
+    if fmt == "msgpack":
+        import msgpack
+
+        return _FORMAT_MSGPACK + msgpack.packb(obj, use_bin_type=True)
+    return _FORMAT_JSON + jsonutil.dumps_bytes(obj)
+
+
+def _unpack(data: bytes) -> Any:
+    fmt, body = data[:1], data[1:]
+    if fmt == _FORMAT_MSGPACK:
+        import msgpack
+
+        return msgpack.unpackb(body, raw=False)
+    return jsonutil.loads(body)
+
+
+def _compress(data: bytes, method: str) -> bytes:
+    if method == "lz4":
+        import lz4.frame
+
+        return _COMP_LZ4 + lz4.frame.compress(data)
+    if method == "zlib":
+        return _COMP_ZLIB + zlib.compress(data, 6)
+    return _COMP_NONE + data
+
+
+def _is_framed(data: bytes) -> bool:
+    # 이 serializer로 기록한 payload인지 (header 조합으로 판단)
+    comp, rest = data[:1], data[1:]
+    if comp == _COMP_NONE:
+        return rest[:1] in (_FORMAT_JSON, _FORMAT_MSGPACK)
+    if comp == _COMP_ZLIB:
+        return rest[:1] == b"\x78"  # zlib header (CMF)
+    if comp == _COMP_LZ4:
+        return rest[:4] == b"\x04\x22\x4d\x18"  # lz4 frame magic
+    return False
+
+
+def _decompress(data: bytes) -> bytes:
+    comp, body = data[:1], data[1:]
+    if comp == _COMP_LZ4:
+        import lz4.frame
+
+        return lz4.frame.decompress(body)
+    if comp == _COMP_ZLIB:
+        return zlib.decompress(body)
+    return body
+
+
+def register_result_serializer(config: dict[str, Any]) -> None:
+    """
+    celery_config 기반으로 result 전용 serializer를 kombu에 등록.
+      result_serializer: "json" | "msgpack"
+      result_compression: "none" | "zlib" | "lz4"
+      result_compress_min_bytes: 이 크기 이상인 payload만 압축
+    decode는 payload header를 보고 판단하므로 설정과 무관하게 동작.
+    header가 없는 payload(이 serializer 도입 전 Celery 기본 json으로 기록된 결과)는 plain JSON으로 읽음.
+    """
+    fmt = config.get("result_serializer", "json")
+    method = config.get("result_compression", "none")
+    min_bytes = int(config.get("result_compress_min_bytes", 1024))
+
+    def _encode(obj: Any) -> bytes:
+        packed = _pack(obj, fmt)
+        if method != "none" and len(packed) >= min_bytes:
+            return _compress(packed, method)
+        return _COMP_NONE + packed
+
+    def _decode(data: bytes | str) -> Any:
+        if isinstance(data, str):
+            try:
+                data = data.encode("latin-1")
+            except UnicodeEncodeError:
+                # latin-1 밖 문자가 있으면 header 있는 payload일 수 없음 (이전 json 결과)
+                return jsonutil.loads(data)
+        if not _is_framed(data):
+            return jsonutil.loads(data)
+        return _unpack(_decompress(data))
+
+    register(
+        RESULT_SERIALIZER_NAME,
+        _encode,
+        _decode,
+        content_type=RESULT_CONTENT_TYPE,
+        content_encoding="binary",
+    )
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any
+
+from celery import states
+
+from app.celery.app import celery_app
+from app.infra.db import get_analysis
+from app.schemas import ErrorCode
+
+
+def get_task_metas(task_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    여러 task의 result backend meta를 Redis MGET 1회로 조회.
+    backend에 아직 key가 없는 task는 PENDING으로 취급 (AsyncResult와 동일).
+
+    Returns:
+      {task_id: {"status": ..., "result": ...}}
+    """
+    backend = celery_app.backend
+    keys = [backend.get_key_for_task(task_id) for task_id in task_ids]
+    values = backend.mget(keys) if keys else []
+
+    metas: dict[str, dict[str, Any]] = {}
+    for task_id, value in zip(task_ids, values):
+        if value is None:
+            metas[task_id] = {"status": states.PENDING, "result": None}
+        else:
+            metas[task_id] = backend.decode_result(value)
+    return metas
+
+
+def make_result_pointer(response_id: str, analysis_id: int) -> dict[str, Any]:
+    """
+    result_pointer 모드에서 result backend에 저장할 최소 payload.
+    실제 결과는 DB(analyses)에 있으므로 analysis_id만 남김.
+    """
+    return {"response_id": response_id, "ok": True, "result_pointer": analysis_id}
+
+
+def hydrate_payload(payload: Any) -> Any:
+    """
+    result pointer payload면 DB에서 결과를 읽어 AnalyzeResponse 형태로 복원.
+    일반 payload는 그대로 반환.
+    """
+    if not isinstance(payload, dict) or "result_pointer" not in payload:
+        return payload
+
+    data = get_analysis(int(payload["result_pointer"]))
+    if data is None:
+        return {
+            "response_id": payload.get("response_id"),
+            "ok": False,
+            "result": None,
+            "error_code": ErrorCode.NOT_FOUND.value,
+            "error_message": f"analysis not found: {payload['result_pointer']}",
+        }
+    return {
+        "response_id": payload.get("response_id"),
+        "ok": True,
+        "result": {
+            "result_id": str(data["analysis_id"]),
+            "image_id": data["image_id"],
+            "risk_level": data["risk_level"],
+            "objects": data["objects"],
+            "caption": data["caption"],
+            "camera_id": data["camera_id"],
+        },
+        "error_code": None,
+    }
@@ -1,22 +1,48 @@
 import logging
+import os
 import time
 from pathlib import Path
 
 from celery import signals
-from celery.signals import worker_process_init
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 
 from app.celery.redis_pub import publish_task_event
 from app.celery.worker_state import init_pipeline_once
 from app.infra.config import load_cfg_from_file
+from app.infra.metrics import (
+    count_error,
+    count_expired,
+    mark_process_dead,
+    start_metrics_server,
+)
+from app.infra.profiler import set_profile_target
+from app.infra.tracing import init_tracing
 
 
 @worker_process_init.connect
 def _init_pipeline_on_worker_start(**kwargs):
+    # TracerProvider(exporter thread)는 fork 이후 child마다 생성
+    init_tracing("coop-worker")
+    # worker arm 파일(target=worker)만 따름
+    set_profile_target("worker")
     cfg_path = Path(__file__).resolve().parents[2] / "config/pipeline_config.json"
     cfg = load_cfg_from_file(str(cfg_path))
     init_pipeline_once(cfg)
 
 
+@worker_init.connect
+def _start_metrics_on_worker_start(**kwargs):
+    # worker main 프로세스에서 child들의 metrics를 모아 노출 (PROMETHEUS_MULTIPROC_DIR 공유)
+    port = os.environ.get("WORKER_METRICS_PORT")
+    if port:
+        start_metrics_server(int(port))
+
+
+@worker_process_shutdown.connect
+def _cleanup_metrics_on_worker_exit(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
+
+
 logger = logging.getLogger(__name__)
 
 TASK_EVENT_CHANNEL = "analysis:done"
@@ -26,7 +52,12 @@ TASK_EVENT_CHANNEL = "analysis:done"
 def task_success_handler(sender, result, **kwargs):
     """
     Celery task 성공 시 Redis Pub/Sub으로 publish.
+    result pointer 모드면 구독자가 바로 쓸 수 있도록 DB에서 결과를 복원해서 실어 보냄.
     """
+    # app.celery.app -> signal -> result_store -> app.celery.app 순환 import 방지
+    from app.celery.result_store import hydrate_payload
+
+    result = hydrate_payload(result)
     publish_task_event(
         channel=TASK_EVENT_CHANNEL,
         task_id=sender.request.id,
@@ -34,6 +65,7 @@ def task_success_handler(sender, result, **kwargs):
         ok=True,
         error=None,
         ts=time.time(),
+        result=result if isinstance(result, dict) else None,
     )
 
 
@@ -42,6 +74,7 @@ def task_failure_handler(sender, exception, traceback, **kwargs):
     """
     Celery task 실패 시 Redis Pub/Sub으로 publish.
     """
+    count_error(f"task:{sender.name}")
     publish_task_event(
         channel=TASK_EVENT_CHANNEL,
         task_id=sender.request.id,
@@ -52,5 +85,24 @@ def task_failure_handler(sender, exception, traceback, **kwargs):
     )
 
 
+@signals.task_revoked.connect
+def task_revoked_handler(sender=None, request=None, expired=False, **kwargs):
+    """
+    revoke 또는 Celery expires 초과(expired=True)로 실행되지 않은 task도 event로 알림.
+    """
+    if request is None:
+        return
+    if expired:
+        count_expired((request.delivery_info or {}).get("routing_key"), "broker")
+    publish_task_event(
+        channel=TASK_EVENT_CHANNEL,
+        task_id=request.id,
+        status="REVOKED",
+        ok=False,
+        error="expired" if expired else "revoked",
+        ts=time.time(),
+    )
+
+
 # sinal 모듈이 import 된 것을 확인하는 log
 logger.info("Celery signals registered.")
@@ -1,13 +1,43 @@
+import time
 import uuid
+from typing import Optional
 
 import app.celery.worker_state as ws
-from app.celery.app import celery_app
-from app.infra.db import insert_analysis, insert_image
-from app.infra.storage import save_image_bytes
+from app.celery.app import celery_app, celery_config
+from app.ai.stream import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_HASH_THRESHOLD,
+    FrameDeduplicator,
+    batched,
+    dhash,
+    iter_video_file_frames,
+)
+from app.celery.result_store import make_result_pointer
+from app.infra.metrics import count_expired, timed_lock
+from app.infra.persist import persist_analysis
+from app.infra.storage import resolve_ingest_path
+from app.infra.tracing import remote_context, span
+from app.schemas import ErrorCode
 
 
-@celery_app.task(name="app.task.analyze_task")
-def analyze_task(request_id: str, image_id: str, image_base64: str):
+def _message_headers(request) -> dict:
+    # apply_async(headers=...)로 넣은 값은 request 속성으로 풀리고, 버전에 따라 request.headers에도 남음
+    headers = dict(getattr(request, "headers", None) or {})
+    for key in ("traceparent", "tracestate", "enqueued_at", "deadline"):
+        value = getattr(request, key, None)
+        if value is not None:
+            headers.setdefault(key, value)
+    return headers
+
+
+@celery_app.task(name="app.task.analyze_task", bind=True)
+def analyze_task(
+    self,
+    request_id: str,
+    image_id: str,
+    image_base64: str,
+    camera_id: Optional[str] = None,
+):
     """
     기존 동기 analyze와 동일한 동작을 Celery worker에서 수행.
     (YOLO->crop->BLIP -> storage 저장 -> DB 저장)
@@ -17,53 +47,131 @@ def analyze_task(request_id: str, image_id: str, image_base64: str):
             "Worker pipeline is not initialized. Check celery_signals/worker init."
         )
 
-    # 1) AI pipeline 실행 (프로세스 내 1개 pipeline에 대해 lock 보호)
-    with ws.pipeline_lock:
-        out = ws.pipeline.run_from_base64(image_base64)
-
-    image_bytes = out["image_bytes"]
-    objects = out["objects"]
-    caption = out["caption"]
-    risk_level = out["risk_level"]
-
-    safe_objects = []
-    for o in objects:
-        safe_objects.append(
-            {
-                "label": o.get("label", "unknown"),
-                "confidence": float(o.get("confidence", 0.0)),
-                "bbox_xyxy": o.get("bbox_xyxy"),
-            }
-        )
+    headers = _message_headers(self.request)
 
-    # 2) 파일 저장
-    rel_path, sha256 = save_image_bytes(image_bytes, ext=".jpg")
+    # freshness deadline이 지난 요청은 추론 없이 expired 결과만 반환 (backlog를 빠르게 비움)
+    deadline = headers.get("deadline")
+    if deadline is not None and time.time() > float(deadline):
+        queue = (self.request.delivery_info or {}).get("routing_key")
+        count_expired(queue, "worker")
+        return {
+            "response_id": str(uuid.uuid4()),
+            "ok": False,
+            "result": None,
+            "error_code": ErrorCode.EXPIRED.value,
+            "error_message": (
+                f"deadline exceeded by {time.time() - float(deadline):.1f}s "
+                f"(image_id={image_id})"
+            ),
+        }
 
-    # 3) DB 저장
-    image_ref_id = insert_image(
-        image_id=image_id,
-        path=rel_path,
-        sha256=sha256,
+    enqueued_at = headers.get("enqueued_at")
+    queue_wait_ms = (
+        max(0.0, (time.time() - float(enqueued_at)) * 1000.0) if enqueued_at else None
     )
 
-    analysis_id = insert_analysis(
-        request_id=request_id,
-        image_ref_id=image_ref_id,
-        risk_level=risk_level,
-        objects=safe_objects,
-        caption=caption,
-    )
+    # API의 analyze_async span을 parent로 이어서 기록
+    with remote_context(headers):
+        if enqueued_at:
+            # broker에서 대기한 구간 (enqueue ~ 실행 시작)
+            with span("queue.wait", start_time_ns=int(float(enqueued_at) * 1e9)):
+                pass
+
+        with span(
+            "analyze_task",
+            image_id=image_id,
+            camera_id=camera_id,
+            **{"queue.wait_ms": queue_wait_ms},
+        ):
+            # camera별 homography (캐시 hit이면 DB/H 계산 없음)
+            mapper = ws.calibrations.get_mapper(camera_id)
+
+            # 1) AI pipeline 실행 (프로세스 내 1개 pipeline에 대해 lock 보호)
+            with timed_lock(ws.pipeline_lock, "worker"):
+                out = ws.pipeline.run_from_base64(
+                    image_base64, mapper=mapper, camera_id=camera_id
+                )
+
+            # 2) 파일 저장 + DB 저장
+            result = persist_analysis(
+                request_id=request_id,
+                image_id=image_id,
+                out=out,
+                camera_id=camera_id,
+            )
+
+    response_id = str(uuid.uuid4())
+
+    # 3-a) result pointer 모드: backend에는 analysis_id만 저장하고, 조회 시 DB에서 복원
+    if celery_config.get("result_pointer", False):
+        return make_result_pointer(response_id, int(result["result_id"]))
+
+    # 3-b) 결과(AnalyzeResponse 형태로 쓰기 좋게) 반환
+    return {
+        "response_id": response_id,
+        "ok": True,
+        "result": result,
+        "error_code": None,
+    }
+
+
+@celery_app.task(name="app.task.ingest_video_task")
+def ingest_video_task(
+    request_id: str,
+    video_path: str,
+    camera_id: Optional[str] = None,
+    every_n: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    hash_threshold: int = DEFAULT_HASH_THRESHOLD,
+):
+    """
+    worker 로컬 영상 파일을 streaming decode -> 변화가 있는 frame만 batch로 분석.
+    """
+    if ws.pipeline is None:
+        raise RuntimeError(
+            "Worker pipeline is not initialized. Check celery_signals/worker init."
+        )
+
+    # API 검증과 별개로 worker에서도 ingest 디렉토리 밖(symlink 포함)은 거부
+    video_file = resolve_ingest_path(video_path)
+    mapper = ws.calibrations.get_mapper(camera_id)
+    dedup = FrameDeduplicator(hash_threshold)
+    stem = video_file.stem
+    counts = {"received": 0, "skipped": 0}
+
+    def _changed_frames():
+        for idx, frame in iter_video_file_frames(str(video_file), every_n):
+            counts["received"] += 1
+            if dedup.is_changed(dhash(frame)):
+                yield idx, frame
+            else:
+                counts["skipped"] += 1
+
+    analysis_ids = []
+    for batch in batched(_changed_frames(), batch_size):
+        with timed_lock(ws.pipeline_lock, "worker"):
+            outs = ws.pipeline.run_batch_from_bytes(
+                [frame for _, frame in batch], mapper=mapper, camera_id=camera_id
+            )
+        for (idx, _), out in zip(batch, outs):
+            result = persist_analysis(
+                request_id=request_id,
+                image_id=f"{stem}_{idx:06d}.jpg",
+                out=out,
+                camera_id=camera_id,
+            )
+            analysis_ids.append(int(result["result_id"]))
 
-    # 4) 결과(AnalyzeResponse 형태로 쓰기 좋게) 반환
+    # frame별 결과는 DB에 있으므로 result backend/event에는 개수와 id만 (AnalyzeResponse.ingest)
     return {
         "response_id": str(uuid.uuid4()),
         "ok": True,
-        "result": {
-            "result_id": str(analysis_id),
-            "image_id": image_id,
-            "risk_level": risk_level,
-            "objects": safe_objects,
-            "caption": caption,
+        "result": None,
+        "ingest": {
+            "frames_received": counts["received"],
+            "frames_analyzed": len(analysis_ids),
+            "frames_skipped": counts["skipped"],
+            "analysis_ids": analysis_ids,
         },
         "error_code": None,
     }
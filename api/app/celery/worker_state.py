@@ -1,13 +1,27 @@
 import threading
 from typing import Optional
 
+from app.ai.calibration import CameraCalibrationRegistry
 from app.ai.pipeline import AIPipeline, PipelineConfig
 
 pipeline_lock = threading.Lock()
 pipeline: Optional[AIPipeline] = None
+# camera_id별 homography 캐시 (프로세스당 1개)
+calibrations = CameraCalibrationRegistry()
 
 
 def init_pipeline_once(cfg: PipelineConfig):
     global pipeline
     if pipeline is None:
-        pipeline = AIPipeline(cfg)
+        # tracker 상태는 같은 카메라 frame을 받는 모든 프로세스(API 포함)가 Redis로 공유
+        pipeline = AIPipeline(cfg, redis_client=tracking_redis_client(cfg))
+
+
+def tracking_redis_client(cfg: PipelineConfig):
+    if not (cfg.use_tracking and cfg.track_store == "redis"):
+        return None
+    # app.celery.app -> signal -> worker_state 순환 import 방지
+    from app.celery.app import celery_config
+    from app.celery.redis_pub import redis_client_from_config
+
+    return redis_client_from_config(celery_config, ping=False)
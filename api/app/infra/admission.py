@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from app.infra.metrics import count_error, set_in_flight, set_queue_depths
+
+logger = logging.getLogger(__name__)
+
+# 과부하 시 요청 차단 (load shedding)
+#   sync : pipeline을 기다리는 /v1/analyze 요청 수가 상한 이상이면 429
+#          ingress(worker 위임)는 요청이 event 대기만 하므로 별도의 큰 상한(proxy_max_in_flight)
+#   async: broker 큐 backlog가 큐별 임계값 이상이면 enqueue하지 않고 503
+#   emergency 요청은 항상 통과 (sync in-flight 수에는 포함)
+# 응답에는 Retry-After 헤더를 붙임.
+
+
+@dataclass
+class AdmissionConfig:
+    enabled: bool = True
+    sync_max_in_flight: int = 8
+    sync_retry_after_sec: int = 1
+    # ingress 역할의 /v1/analyze 동시 대기 상한 (CPU/모델을 쓰지 않음, 보호 대상은 큐 backlog)
+    proxy_max_in_flight: int = 1000
+    # queue 이름 -> 허용 backlog (목록에 없는 큐는 제한 없음)
+    async_queue_limits: dict[str, int] = field(
+        default_factory=lambda: {"analyze.default": 2000}
+    )
+    async_retry_after_sec: int = 10
+    # broker LLEN 결과 재사용 시간 (요청마다 Redis 조회하지 않도록)
+    queue_depth_cache_sec: float = 0.5
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "AdmissionConfig":
+        p = Path(path)
+        if not p.exists():
+            return cls()
+        return cls(**json.loads(p.read_text()))
+
+
+@dataclass
+class Rejection:
+    status_code: int
+    retry_after_sec: int
+    reason: str
+
+
+class AdmissionController:
+    """
+    프로세스 단위 admission 판단 (thread-safe).
+    depth_fn: {queue: backlog} 조회 함수 (queues.queue_depths)
+    proxy: ingress 프로세스면 True (sync 상한으로 proxy_max_in_flight 사용)
+    """
+
+    def __init__(
+        self,
+        cfg: AdmissionConfig,
+        depth_fn: Callable[[], dict[str, int]],
+        proxy: bool = False,
+    ):
+        self.cfg = cfg
+        self._depth_fn = depth_fn
+        self.sync_limit = cfg.proxy_max_in_flight if proxy else cfg.sync_max_in_flight
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._depths: dict[str, int] = {}
+        self._depths_at = float("-inf")
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire_sync(self, emergency: bool = False) -> Optional[Rejection]:
+        """
+        통과하면 None (release_sync 필요), 거절이면 Rejection
+        """
+        with self._lock:
+            if (
+                self.cfg.enabled
+                and not emergency
+                and self._in_flight >= self.sync_limit
+            ):
+                return Rejection(
+                    status_code=429,
+                    retry_after_sec=self.cfg.sync_retry_after_sec,
+                    reason=(
+                        f"sync analyze at capacity "
+                        f"({self._in_flight}/{self.sync_limit} in flight)"
+                    ),
+                )
+            self._in_flight += 1
+            set_in_flight(self._in_flight)
+        return None
+
+    def release_sync(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            set_in_flight(self._in_flight)
+
+    def _queue_depths(self) -> dict[str, int]:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._depths_at < self.cfg.queue_depth_cache_sec:
+                return self._depths
+        try:
+            depths = self._depth_fn()
+        except Exception as e:
+            # broker 조회 실패 시 차단하지 않음 (enqueue 단계에서 에러로 드러남)
+            count_error("admission_queue_depth")
+            logger.warning(f"queue depth lookup failed: {e}")
+            depths = {}
+        set_queue_depths(depths)
+        with self._lock:
+            self._depths, self._depths_at = depths, now
+        return depths
+
+    def check_queue(self, queue: str, emergency: bool = False) -> Optional[Rejection]:
+        limit = self.cfg.async_queue_limits.get(queue)
+        if not self.cfg.enabled or emergency or limit is None:
+            return None
+        depth = self._queue_depths().get(queue, 0)
+        if depth < limit:
+            return None
+        return Rejection(
+            status_code=503,
+            retry_after_sec=self.cfg.async_retry_after_sec,
+            reason=f"queue {queue} backlog {depth} >= {limit}",
+        )
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-import json
+import os
 import sqlite3
+import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Callable, Optional, TypeVar
 
+from app.infra import jsonutil
+
 API_DIR = Path(__file__).resolve().parents[2]  # api/
-DB_PATH = API_DIR / "storage" / "app.db"
+# COOP_STORAGE_DIR: storage.py와 같은 디렉토리 사용
+DB_PATH = Path(os.environ.get("COOP_STORAGE_DIR") or API_DIR / "storage") / "app.db"
 
 T = TypeVar("T")
 
@@ -45,6 +49,13 @@ def with_db(op: Callable[[sqlite3.Connection], T]) -> T:
         return op(conn)
 
 
+def _ensure_column(conn: sqlite3.Connection, table: str, column: str, ddl: str) -> None:
+    # CREATE TABLE IF NOT EXISTS는 기존 DB에 컬럼을 추가하지 않으므로 직접 migration
+    cols = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in cols:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
 def init_db() -> None:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
@@ -71,6 +82,57 @@ def init_db() -> None:
             FOREIGN KEY(image_ref_id) REFERENCES images(id)
         );
         """)
+        _ensure_column(conn, "analyses", "camera_id", "TEXT")
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS camera_calibrations (
+            camera_id TEXT PRIMARY KEY,
+            src_pts_json TEXT NOT NULL,       -- 이미지 (u,v) 대응점 list
+            dst_pts_json TEXT NOT NULL,       -- 맵 (x,y) 대응점 list
+            updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        );
+        """)
+        # world 좌표가 있는 detection (digital twin 영역 질의용)
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS detections (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            analysis_id INTEGER NOT NULL,     -- analyses.id FK
+            camera_id TEXT,
+            label TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            x REAL NOT NULL,                  -- 맵 좌표 (정밀값)
+            y REAL NOT NULL,
+            created_ts REAL NOT NULL,         -- epoch seconds
+            FOREIGN KEY(analysis_id) REFERENCES analyses(id)
+        );
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detections_created_ts ON detections(created_ts)"
+        )
+        # R*Tree 공간+시간 인덱스 (id = detections.id, t = created_ts).
+        # 값은 float32로 저장(범위가 바깥쪽으로 반올림)되므로 후보 검색용, 정밀 비교는 detections에서.
+        # 시간 차원이 없던 이전 인덱스는 다시 만들고 detections에서 채움
+        rtree_cols = {
+            row["name"] for row in conn.execute("PRAGMA table_info(detections_rtree)")
+        }
+        if rtree_cols and "min_t" not in rtree_cols:
+            conn.execute("DROP TABLE detections_rtree")
+        conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS detections_rtree USING rtree(
+            id, min_x, max_x, min_y, max_y, min_t, max_t
+        );
+        """)
+        if rtree_cols and "min_t" not in rtree_cols:
+            conn.execute("""
+            INSERT INTO detections_rtree(id, min_x, max_x, min_y, max_y, min_t, max_t)
+            SELECT id, x, x, y, y, created_ts, created_ts FROM detections
+            """)
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS zones (
+            name TEXT PRIMARY KEY,
+            polygon_json TEXT NOT NULL,       -- 맵 좌표 (x,y) polygon 꼭짓점 list
+            updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+        );
+        """)
 
     with_db(_op)
 
@@ -92,22 +154,62 @@ def insert_analysis(
     risk_level: str,
     objects: list[dict[str, Any]],
     caption: str,
+    camera_id: Optional[str] = None,
 ) -> int:
-    objects_json = json.dumps(objects, ensure_ascii=False)
+    objects_json = jsonutil.dumps(objects)
 
     def _op(conn: sqlite3.Connection) -> int:
         cur = conn.execute(
             """
-            INSERT INTO analyses(request_id, image_ref_id, risk_level, objects_json, caption)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO analyses(request_id, image_ref_id, risk_level, objects_json, caption, camera_id)
+            VALUES (?, ?, ?, ?, ?, ?)
             """,
-            (request_id, image_ref_id, risk_level, objects_json, caption),
+            (request_id, image_ref_id, risk_level, objects_json, caption, camera_id),
         )
-        return int(cur.lastrowid)
+        analysis_id = int(cur.lastrowid)
+        _insert_detections(conn, analysis_id, camera_id, objects)
+        return analysis_id
 
     return with_db(_op)
 
 
+def _insert_detections(
+    conn: sqlite3.Connection,
+    analysis_id: int,
+    camera_id: Optional[str],
+    objects: list[dict[str, Any]],
+) -> None:
+    # world_xy가 있는 객체만 공간 인덱스에 등록 (analyses insert와 같은 transaction)
+    created_ts = time.time()
+    for o in objects:
+        world_xy = o.get("world_xy")
+        if not world_xy:
+            continue
+        x, y = float(world_xy[0]), float(world_xy[1])
+        cur = conn.execute(
+            """
+            INSERT INTO detections(analysis_id, camera_id, label, confidence, x, y, created_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                analysis_id,
+                camera_id,
+                o.get("label", "unknown"),
+                float(o.get("confidence", 0.0)),
+                x,
+                y,
+                created_ts,
+            ),
+        )
+        conn.execute(
+            """
+            INSERT INTO detections_rtree(id, min_x, max_x, min_y, max_y, min_t, max_t)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (cur.lastrowid, x, x, y, y, created_ts, created_ts),
+        )
+
+
 def get_analysis(analysis_id: int) -> dict[str, Any] | None:
     def _op(conn: sqlite3.Connection) -> Optional[dict[str, Any]]:
         row = conn.execute(
@@ -118,6 +220,7 @@ def get_analysis(analysis_id: int) -> dict[str, Any] | None:
               a.risk_level AS risk_level,
               a.objects_json AS objects_json,
               a.caption AS caption,
+              a.camera_id AS camera_id,
               a.created_at AS created_at,
               i.image_id AS image_id,
               i.path AS image_path,
@@ -136,8 +239,9 @@ def get_analysis(analysis_id: int) -> dict[str, Any] | None:
             "analysis_id": row["analysis_id"],
             "request_id": row["request_id"],
             "risk_level": row["risk_level"],
-            "objects": json.loads(row["objects_json"]),
+            "objects": jsonutil.loads(row["objects_json"]),
             "caption": row["caption"],
+            "camera_id": row["camera_id"],
             "created_at": row["created_at"],
             "image_id": row["image_id"],
             "image_path": row["image_path"],
@@ -145,3 +249,140 @@ def get_analysis(analysis_id: int) -> dict[str, Any] | None:
         }
 
     return with_db(_op)
+
+
+def upsert_camera_calibration(
+    camera_id: str,
+    src_pts: list[list[float]],
+    dst_pts: list[list[float]],
+) -> None:
+    def _op(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            INSERT INTO camera_calibrations(camera_id, src_pts_json, dst_pts_json)
+            VALUES (?, ?, ?)
+            ON CONFLICT(camera_id) DO UPDATE SET
+              src_pts_json = excluded.src_pts_json,
+              dst_pts_json = excluded.dst_pts_json,
+              updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+            """,
+            (camera_id, jsonutil.dumps(src_pts), jsonutil.dumps(dst_pts)),
+        )
+
+    with_db(_op)
+
+
+def get_camera_calibration(camera_id: str) -> dict[str, Any] | None:
+    def _op(conn: sqlite3.Connection) -> Optional[dict[str, Any]]:
+        row = conn.execute(
+            """
+            SELECT camera_id, src_pts_json, dst_pts_json, updated_at
+            FROM camera_calibrations
+            WHERE camera_id = ?
+            """,
+            (camera_id,),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "camera_id": row["camera_id"],
+            "src_pts": jsonutil.loads(row["src_pts_json"]),
+            "dst_pts": jsonutil.loads(row["dst_pts_json"]),
+            "updated_at": row["updated_at"],
+        }
+
+    return with_db(_op)
+
+
+def upsert_zone(name: str, polygon: list[list[float]]) -> None:
+    def _op(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            INSERT INTO zones(name, polygon_json) VALUES (?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+              polygon_json = excluded.polygon_json,
+              updated_at = datetime('now')
+            """,
+            (name, jsonutil.dumps(polygon)),
+        )
+
+    with_db(_op)
+
+
+def get_zone(name: str) -> list[list[float]] | None:
+    def _op(conn: sqlite3.Connection) -> Optional[list[list[float]]]:
+        row = conn.execute(
+            "SELECT polygon_json FROM zones WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        return jsonutil.loads(row["polygon_json"])
+
+    return with_db(_op)
+
+
+def query_detections_in_bbox(
+    min_x: float,
+    max_x: float,
+    min_y: float,
+    max_y: float,
+    since_ts: float,
+    label: Optional[str] = None,
+    camera_id: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    R*Tree로 bbox + 시간 범위가 겹치는 detection 후보를 찾고 정밀 시간/label/camera로 필터링.
+    (polygon 포함 여부는 호출 측에서 정밀 좌표로 판정)
+    """
+
+    def _op(conn: sqlite3.Connection) -> list[dict[str, Any]]:
+        sql = """
+            SELECT d.id, d.analysis_id, d.camera_id, d.label, d.confidence,
+                   d.x, d.y, d.created_ts
+            FROM detections_rtree r
+            JOIN detections d ON d.id = r.id
+            WHERE r.max_x >= ? AND r.min_x <= ?
+              AND r.max_y >= ? AND r.min_y <= ?
+              AND r.max_t >= ?
+              AND d.created_ts >= ?
+        """
+        params: list[Any] = [min_x, max_x, min_y, max_y, since_ts, since_ts]
+        if label is not None:
+            sql += " AND d.label = ?"
+            params.append(label)
+        if camera_id is not None:
+            sql += " AND d.camera_id = ?"
+            params.append(camera_id)
+        sql += " ORDER BY d.created_ts DESC"
+        return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    return with_db(_op)
+
+
+def delete_detections_before(cutoff_ts: float, limit: int = 5000) -> int:
+    """
+    created_ts < cutoff_ts인 detection을 오래된 것부터 최대 limit개 삭제 (공간 인덱스 포함).
+    한 번에 지우는 양을 제한해서 write lock을 오래 잡지 않음.
+    Returns: 삭제한 수
+    """
+
+    def _op(conn: sqlite3.Connection) -> int:
+        ids = [
+            (row["id"],)
+            for row in conn.execute(
+                """
+                SELECT id FROM detections
+                WHERE created_ts < ?
+                ORDER BY created_ts
+                LIMIT ?
+                """,
+                (cutoff_ts, limit),
+            )
+        ]
+        conn.executemany("DELETE FROM detections_rtree WHERE id = ?", ids)
+        conn.executemany("DELETE FROM detections WHERE id = ?", ids)
+        return len(ids)
+
+    return with_db(_op)
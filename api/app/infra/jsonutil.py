@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+# hot path JSON encode/decode (DB JSON column, result backend, task event)
+#   orjson이 설치돼 있으면 사용 (stdlib json보다 dumps/loads가 수 배 빠름), 없으면 stdlib json.
+#   출력은 둘 다 공백 없는 UTF-8 JSON이라 어느 쪽으로 쓴 값이든 서로 읽을 수 있음.
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    # orjson은 bytes를 그대로 읽음 (str 변환 불필요)
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.infra.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Prometheus metrics (prometheus_client가 없으면 모든 함수가 no-op)
+#   - API: GET /metrics
+#   - Celery worker: WORKER_METRICS_PORT 가 있으면 worker main 프로세스에서 HTTP 노출
+# prefork child / uvicorn --workers 처럼 여러 프로세스가 있으면
+# PROMETHEUS_MULTIPROC_DIR 환경변수를 (prometheus_client import 전에) 설정해야 함.
+try:
+    from prometheus_client import (  # type: ignore
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+        start_http_server,
+    )
+except ImportError:
+    CollectorRegistry = None  # type: ignore
+
+ENABLED = CollectorRegistry is not None
+
+# 추론 단계는 수 ms ~ 수 초 범위
+_STAGE_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+if ENABLED:
+    STAGE_SECONDS = Histogram(
+        "coop_stage_seconds",
+        "Latency of each analyze stage (decode, yolo, blip, storage, db ...)",
+        ["stage"],
+        buckets=_STAGE_BUCKETS,
+    )
+    LOCK_WAIT_SECONDS = Histogram(
+        "coop_pipeline_lock_wait_seconds",
+        "Time spent waiting for pipeline_lock",
+        ["role"],
+        buckets=_STAGE_BUCKETS,
+    )
+    QUEUE_DEPTH = Gauge(
+        "coop_queue_depth",
+        "Pending messages in the analyze broker queues",
+        ["queue"],
+        multiprocess_mode="livemax",
+    )
+    CACHE_EVENTS = Counter(
+        "coop_cache_events_total",
+        "Cache lookups by cache and outcome (hit | miss)",
+        ["cache", "outcome"],
+    )
+    ERRORS = Counter(
+        "coop_errors_total",
+        "Errors by location",
+        ["where"],
+    )
+    ADMISSION_REJECTED = Counter(
+        "coop_admission_rejected_total",
+        "Requests rejected by admission control",
+        ["route", "status"],
+    )
+    TASKS_EXPIRED = Counter(
+        "coop_tasks_expired_total",
+        "Analyze requests dropped after their freshness deadline",
+        ["queue", "where"],  # where: api | worker | broker
+    )
+    SYNC_IN_FLIGHT = Gauge(
+        "coop_sync_in_flight",
+        "Sync analyze requests admitted and not finished",
+        multiprocess_mode="livesum",
+    )
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    # histogram 기록 + (tracing 활성화 시) stage.<name> span
+    t0 = time.perf_counter()
+    try:
+        with span(f"stage.{stage}"):
+            yield
+    finally:
+        if ENABLED:
+            STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - t0)
+
+
+@contextmanager
+def timed_lock(lock: threading.Lock, role: str) -> Iterator[None]:
+    # lock 획득까지 기다린 시간을 기록하고 with 블록 동안 lock 유지
+    t0 = time.perf_counter()
+    with lock:
+        if ENABLED:
+            LOCK_WAIT_SECONDS.labels(role=role).observe(time.perf_counter() - t0)
+        yield
+
+
+def count_cache(cache: str, hit: bool) -> None:
+    if ENABLED:
+        CACHE_EVENTS.labels(cache=cache, outcome="hit" if hit else "miss").inc()
+
+
+def count_error(where: str) -> None:
+    if ENABLED:
+        ERRORS.labels(where=where).inc()
+
+
+def count_rejected(route: str, status: int) -> None:
+    if ENABLED:
+        ADMISSION_REJECTED.labels(route=route, status=str(status)).inc()
+
+
+def count_expired(queue: str, where: str) -> None:
+    if ENABLED:
+        TASKS_EXPIRED.labels(queue=queue or "unknown", where=where).inc()
+
+
+def set_in_flight(n: int) -> None:
+    if ENABLED:
+        SYNC_IN_FLIGHT.set(n)
+
+
+def set_queue_depths(depths: dict[str, int]) -> None:
+    if ENABLED:
+        for queue, depth in depths.items():
+            QUEUE_DEPTH.labels(queue=queue).set(depth)
+
+
+def _collect_registry():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_latest() -> tuple[bytes, str]:
+    """
+    Returns:
+      (exposition body, content type)
+    """
+    if not ENABLED:
+        return b"# prometheus_client not installed\n", "text/plain; charset=utf-8"
+    return generate_latest(_collect_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> None:
+    if not ENABLED:
+        logger.warning("prometheus_client not installed. Metrics server disabled.")
+        return
+    start_http_server(port, registry=_collect_registry())
+    logger.info(f"Metrics server listening on :{port}")
+
+
+def mark_process_dead(pid: int) -> None:
+    # multiprocess 모드에서 종료된 child의 live gauge 파일 정리
+    if ENABLED and os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from app.infra.db import insert_analysis, insert_image
+from app.infra.metrics import stage_timer
+from app.infra.spatial import maybe_prune_detections
+from app.infra.storage import save_image_bytes
+
+# pipeline 실행 결과를 storage/DB에 저장하는 공통 로직 (sync API, worker, stream ingest 공용)
+
+
+def to_safe_objects(objects: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # 응답/DB에 들어가는 DetectedObject 필드만 남김
+    safe_objects = []
+    for o in objects:
+        safe_objects.append(
+            {
+                "label": o.get("label", "unknown"),
+                "confidence": float(o.get("confidence", 0.0)),
+                "bbox_xyxy": o.get("bbox_xyxy"),
+                "world_xy": o.get("world_xy"),
+                "track_id": o.get("track_id"),
+            }
+        )
+    return safe_objects
+
+
+def persist_analysis(
+    request_id: str,
+    image_id: str,
+    out: dict[str, Any],
+    camera_id: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    pipeline 출력(out) -> 파일 저장 -> DB 저장.
+    Returns:
+      AnalyzeResult 형태의 dict
+    """
+    safe_objects = to_safe_objects(out["objects"])
+
+    # 1) 파일 저장 (storage.py)
+    with stage_timer("save_image_bytes"):
+        rel_path, sha256 = save_image_bytes(out["image_bytes"], ext=".jpg")
+
+    # 2) DB 저장 (db.py)
+    with stage_timer("insert_image"):
+        image_ref_id = insert_image(
+            image_id=image_id,
+            path=rel_path,
+            sha256=sha256,
+        )
+
+    with stage_timer("insert_analysis"):
+        analysis_id = insert_analysis(
+            request_id=request_id,  # trace용
+            image_ref_id=image_ref_id,
+            risk_level=out["risk_level"],
+            objects=safe_objects,
+            caption=out["caption"],
+            camera_id=camera_id,
+        )
+    # 보관 기간이 지난 detection 정리 (프로세스별 주기마다 1회, 나머지 호출은 바로 반환)
+    maybe_prune_detections()
+
+    return {
+        "result_id": str(analysis_id),
+        "image_id": image_id,
+        "risk_level": out["risk_level"],  # "high" | "normal"
+        "objects": safe_objects,
+        "caption": out["caption"],
+        "camera_id": camera_id,
+    }
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import ContextManager, Iterator, Optional
+
+from app.infra.storage import STORAGE_DIR
+
+logger = logging.getLogger(__name__)
+
+# 운영 중인 프로세스(API / worker child)의 추론 구간 on-demand profiling.
+#   - admin endpoint 또는 Celery control command(profile_arm)가 target(api | worker)별 arm 파일을 기록
+#   - 각 프로세스는 AIPipeline 실행 진입 시 자기 target의 arm 파일만 (최대 ARM_CHECK_SEC 간격으로) 확인
+#     (storage를 공유해도 target=api가 worker를 arm하지 않음, worker child는 set_profile_target("worker"))
+#   - arm 상태면 duration_sec 또는 max_tasks(프로세스별) 동안 수집 후 storage/profiles/에 결과 기록
+# mode:
+#   cprofile : pipeline 호출 구간만 deterministic profiling -> .pstats + 상위 함수 .txt
+#   sampling : 별도 thread가 interval_ms마다 pipeline 실행 thread stack 수집 -> .collapsed (flamegraph.pl / speedscope)
+#   torch    : torch.profiler (CPU/CUDA op 단위) -> chrome trace .json + op 요약 .txt
+PROFILES_DIR = STORAGE_DIR / "profiles"
+PROFILE_TARGETS = ("api", "worker")
+ARM_FILES = {t: PROFILES_DIR / f"armed_{t}.json" for t in PROFILE_TARGETS}
+
+PROFILE_MODES = ("cprofile", "sampling", "torch")
+
+# 이 프로세스가 따르는 arm 파일 (기본 api)
+_process_target = "api"
+
+# overhead 상한
+MAX_DURATION_SEC = 300.0
+MAX_TASKS = 1000
+MIN_INTERVAL_MS = 1.0
+MAX_SAMPLES = 200_000
+ARM_CHECK_SEC = 1.0
+
+DEFAULT_DURATION_SEC = 30.0
+DEFAULT_INTERVAL_MS = 10.0
+
+
+@dataclass
+class ProfileRequest:
+    session_id: str
+    mode: str
+    armed_at: float  # epoch sec
+    duration_sec: float
+    max_tasks: Optional[int]  # 프로세스당 pipeline 호출 수 상한 (None이면 시간만)
+    interval_ms: float  # sampling 모드 전용
+
+    @property
+    def deadline(self) -> float:
+        return self.armed_at + self.duration_sec
+
+
+def set_profile_target(target: str) -> None:
+    global _process_target
+    if target not in PROFILE_TARGETS:
+        raise ValueError(f"target must be one of {PROFILE_TARGETS}")
+    _process_target = target
+
+
+def arm_profiler(
+    mode: str,
+    duration_sec: float = DEFAULT_DURATION_SEC,
+    max_tasks: Optional[int] = None,
+    interval_ms: float = DEFAULT_INTERVAL_MS,
+    target: str = "api",
+) -> ProfileRequest:
+    """
+    target의 arm 파일 기록 (같은 storage를 쓰는 해당 target 프로세스가 다음 pipeline 호출부터 수집 시작).
+    잘못된 mode/target은 ValueError, duration/tasks/interval은 상한 내로 보정.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"mode must be one of {PROFILE_MODES}")
+    if target not in PROFILE_TARGETS:
+        raise ValueError(f"target must be one of {PROFILE_TARGETS}")
+
+    req = ProfileRequest(
+        session_id=time.strftime("%Y%m%d_%H%M%S") + "_" + uuid.uuid4().hex[:6],
+        mode=mode,
+        armed_at=time.time(),
+        duration_sec=min(max(float(duration_sec), 0.1), MAX_DURATION_SEC),
+        max_tasks=min(max(int(max_tasks), 1), MAX_TASKS) if max_tasks else None,
+        interval_ms=max(float(interval_ms), MIN_INTERVAL_MS),
+    )
+
+    arm_file = ARM_FILES[target]
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = arm_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(asdict(req)))
+    os.replace(tmp, arm_file)  # reader가 반쯤 쓴 파일을 보지 않도록 atomic 교체
+    logger.info(f"Profiler armed ({target}): {req}")
+    return req
+
+
+def disarm_profiler(target: Optional[str] = None) -> None:
+    # target이 없으면 전부 해제
+    for t in [target] if target else PROFILE_TARGETS:
+        ARM_FILES[t].unlink(missing_ok=True)
+
+
+def armed_profiles() -> dict[str, dict]:
+    # target -> arm 파일 내용 (arm 상태인 target만)
+    armed = {}
+    for t, path in ARM_FILES.items():
+        req = _read_arm_file(path)
+        if req is not None:
+            armed[t] = asdict(req)
+    return armed
+
+
+def list_profiles() -> list[str]:
+    if not PROFILES_DIR.exists():
+        return []
+    return sorted(
+        p.name
+        for p in PROFILES_DIR.iterdir()
+        if p.is_file()
+        and p not in ARM_FILES.values()
+        and not p.name.endswith(".tmp")
+    )
+
+
+def _read_arm_file(path: Optional[Path] = None) -> Optional[ProfileRequest]:
+    try:
+        path = path or ARM_FILES[_process_target]
+        return ProfileRequest(**json.loads(path.read_text()))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+class _StackSampler:
+    """
+    interval_ms 간격으로 등록된 thread들의 Python stack을 수집 (collapsed stack 형식으로 집계).
+    pipeline 실행 중인 thread만 보므로 idle 구간 overhead 없음.
+    """
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000.0
+        self.counts: Counter[str] = Counter()
+        self.total = 0
+        self._threads: set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._loop, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def add_thread(self, ident: int) -> None:
+        with self._lock:
+            self._threads.add(ident)
+
+    def remove_thread(self, ident: int) -> None:
+        with self._lock:
+            self._threads.discard(ident)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                targets = list(self._threads)
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            for ident in targets:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.counts[";".join(reversed(stack))] += 1
+                self.total += 1
+            if self.total >= MAX_SAMPLES:
+                break
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+
+class _Session:
+    """
+    프로세스 1개에서의 profiling 수집 상태
+    """
+
+    def __init__(self, req: ProfileRequest):
+        self.req = req
+        self.tasks = 0
+        self.active = 0
+        self.finished = False
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._torch_prof = None
+
+        if req.mode == "cprofile":
+            self._cprofile = cProfile.Profile()
+        elif req.mode == "sampling":
+            self._sampler = _StackSampler(req.interval_ms)
+        elif req.mode == "torch":
+            self._torch_prof = _start_torch_profiler()
+
+    def enter(self) -> None:
+        self.active += 1
+        # cProfile은 동시에 1개만 enable 가능 (pipeline_lock으로 호출은 보통 직렬)
+        if self._cprofile is not None and self.active == 1:
+            self._cprofile.enable()
+        if self._sampler is not None:
+            self._sampler.add_thread(threading.get_ident())
+
+    def exit(self) -> None:
+        self.active -= 1
+        self.tasks += 1
+        if self._cprofile is not None and self.active == 0:
+            self._cprofile.disable()
+        if self._sampler is not None:
+            self._sampler.remove_thread(threading.get_ident())
+
+    def should_finish(self, now: float) -> bool:
+        if now >= self.req.deadline:
+            return True
+        return self.req.max_tasks is not None and self.tasks >= self.req.max_tasks
+
+    def finish(self) -> list[str]:
+        """
+        수집 종료 후 artifact 기록. Returns: 기록한 파일 이름들
+        """
+        self.finished = True
+        PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.req.session_id}_{self.req.mode}_{os.getpid()}"
+        written = []
+
+        if self._cprofile is not None:
+            path = PROFILES_DIR / f"{stem}.pstats"
+            self._cprofile.dump_stats(str(path))
+            buf = io.StringIO()
+            stats = pstats.Stats(self._cprofile, stream=buf)
+            stats.sort_stats("cumulative").print_stats(50)
+            (PROFILES_DIR / f"{stem}.txt").write_text(buf.getvalue())
+            written += [path.name, f"{stem}.txt"]
+
+        if self._sampler is not None:
+            self._sampler.stop()
+            path = PROFILES_DIR / f"{stem}.collapsed"
+            counts = self._sampler.counts.most_common()
+            path.write_text("".join(f"{stack} {n}\n" for stack, n in counts))
+            written.append(path.name)
+
+        if self._torch_prof is not None:
+            self._torch_prof.stop()
+            path = PROFILES_DIR / f"{stem}.trace.json"
+            self._torch_prof.export_chrome_trace(str(path))
+            table = self._torch_prof.key_averages().table(
+                sort_by="self_cpu_time_total", row_limit=50
+            )
+            (PROFILES_DIR / f"{stem}.txt").write_text(table)
+            written += [path.name, f"{stem}.txt"]
+
+        logger.info(
+            f"Profiler session {self.req.session_id} finished: "
+            f"tasks={self.tasks} files={written}"
+        )
+        return written
+
+
+def _start_torch_profiler():
+    try:
+        import torch
+        from torch.profiler import ProfilerActivity, profile
+    except ImportError:
+        logger.warning("torch not installed. torch profiler mode disabled.")
+        return None
+
+    activities = [ProfilerActivity.CPU]
+    if torch.cuda.is_available():
+        activities.append(ProfilerActivity.CUDA)
+    prof = profile(activities=activities, record_shapes=False, with_stack=False)
+    prof.start()
+    return prof
+
+
+class _ProcessProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._session: Optional[_Session] = None
+        self._done: set[str] = set()  # 이 프로세스에서 이미 끝낸 session_id
+
+    def _current(self) -> Optional[_Session]:
+        now = time.time()
+        with self._lock:
+            session = self._session
+            if session is not None:
+                if session.active == 0 and session.should_finish(now):
+                    self._end_locked()
+                    return None
+                return session
+
+            # arm 파일 확인은 ARM_CHECK_SEC 간격으로만 (평상시 overhead는 시각 비교 1회)
+            if now - self._checked_at < ARM_CHECK_SEC:
+                return None
+            self._checked_at = now
+            req = _read_arm_file()
+            if req is None or req.session_id in self._done or now >= req.deadline:
+                return None
+            if req.mode not in PROFILE_MODES:
+                return None
+            self._session = _Session(req)
+            # 이후 호출이 없어도 deadline에 artifact를 기록하도록 timer 등록
+            timer = threading.Timer(
+                max(0.0, req.deadline - now), self._expire, args=(self._session,)
+            )
+            timer.daemon = True
+            timer.start()
+            return self._session
+
+    def _expire(self, session: _Session) -> None:
+        with self._lock:
+            # 실행 중이면 hook 종료 시점에 정리됨
+            if session is self._session and session.active == 0:
+                self._end_locked()
+
+    def _end_locked(self) -> None:
+        session = self._session
+        self._session = None
+        if session is None:
+            return
+        self._done.add(session.req.session_id)
+        try:
+            session.finish()
+        except Exception:
+            logger.exception("Failed to write profiler artifacts")
+
+    @contextmanager
+    def hook(self) -> Iterator[None]:
+        session = self._current()
+        if session is None:
+            yield
+            return
+
+        with self._lock:
+            session.enter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                session.exit()
+                if (
+                    session is self._session
+                    and session.active == 0
+                    and session.should_finish(time.time())
+                ):
+                    self._end_locked()
+
+
+_profiler = _ProcessProfiler()
+
+
+def profile_hook() -> ContextManager[None]:
+    """
+    AIPipeline 실행 진입점에서 사용: with profile_hook(): ...
+    arm 상태가 아니면 거의 비용 없음.
+    """
+    return _profiler.hook()
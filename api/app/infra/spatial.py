@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from app.infra.db import delete_detections_before, query_detections_in_bbox
+from app.infra.metrics import count_error
+
+logger = logging.getLogger(__name__)
+
+# digital twin 영역(zone) 질의: R*Tree bbox+시간 후보 검색 -> polygon 포함 판정
+
+# detection 보관 기간 (zone 질의 window 최대값 이상이어야 함, 기본 7일)
+DETECTION_RETENTION_SEC = float(
+    os.environ.get("DETECTION_RETENTION_SEC", 7 * 24 * 3600)
+)
+# 프로세스별 오래된 detection 정리 주기
+DETECTION_PRUNE_INTERVAL_SEC = 60.0
+
+_prune_lock = threading.Lock()
+_pruned_at = float("-inf")
+
+
+def polygon_bbox(polygon: list[list[float]]) -> tuple[float, float, float, float]:
+    xs = [p[0] for p in polygon]
+    ys = [p[1] for p in polygon]
+    return min(xs), max(xs), min(ys), max(ys)
+
+
+def point_in_polygon(x: float, y: float, polygon: list[list[float]]) -> bool:
+    # ray casting (경계 위의 점은 구현상 어느 쪽으로든 판정될 수 있음)
+    inside = False
+    n = len(polygon)
+    j = n - 1
+    for i in range(n):
+        xi, yi = polygon[i][0], polygon[i][1]
+        xj, yj = polygon[j][0], polygon[j][1]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def find_detections_in_zone(
+    polygon: list[list[float]],
+    window_sec: float,
+    label: Optional[str] = None,
+    camera_id: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    최근 window_sec 동안 polygon 안에 들어온 detection 목록 (최신순).
+    """
+    min_x, max_x, min_y, max_y = polygon_bbox(polygon)
+    candidates = query_detections_in_bbox(
+        min_x,
+        max_x,
+        min_y,
+        max_y,
+        since_ts=time.time() - window_sec,
+        label=label,
+        camera_id=camera_id,
+    )
+    return [d for d in candidates if point_in_polygon(d["x"], d["y"], polygon)]
+
+
+def maybe_prune_detections(now: Optional[float] = None) -> int:
+    """
+    DETECTION_PRUNE_INTERVAL_SEC마다 한 번, 보관 기간이 지난 detection 삭제 (저장 경로에서 호출).
+    """
+    global _pruned_at
+    now = time.time() if now is None else now
+    with _prune_lock:
+        if now - _pruned_at < DETECTION_PRUNE_INTERVAL_SEC:
+            return 0
+        _pruned_at = now
+    try:
+        return delete_detections_before(now - DETECTION_RETENTION_SEC)
+    except Exception as e:
+        count_error("detection_prune")
+        logger.warning(f"detection prune failed: {e}")
+        return 0
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import time
 from pathlib import Path
 
@@ -8,14 +9,48 @@ from pathlib import Path
 
 # api/ 기준 경로
 API_DIR = Path(__file__).resolve().parents[2]
-STORAGE_DIR = API_DIR / "storage"
+# COOP_STORAGE_DIR: storage 위치 변경 (benchmark/test용 임시 디렉토리 등)
+STORAGE_DIR = Path(os.environ.get("COOP_STORAGE_DIR") or API_DIR / "storage")
 IMAGES_DIR = STORAGE_DIR / "images"
+# /v1/ingest/video가 읽을 수 있는 영상 위치 (worker 기준, 요청은 이 아래 상대 경로만 허용)
+INGEST_DIR = Path(os.environ.get("COOP_INGEST_DIR") or STORAGE_DIR / "ingest")
 
 
 def ensure_storage_dirs() -> None:
     IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def check_ingest_name(name: str) -> str:
+    """
+    ingest 영상 이름 형식 검사: URL scheme, 절대 경로, '..' 금지 (위반 시 ValueError)
+    """
+    if not name or "\x00" in name:
+        raise ValueError("video_path must be a non-empty relative name")
+    if ":" in name:
+        # rtsp://, http://, file:, C:\ 등
+        raise ValueError("video_path must not contain a URL scheme or drive")
+    normalized = name.replace("\\", "/")
+    if normalized.startswith("/"):
+        raise ValueError("video_path must be relative to the ingest directory")
+    if ".." in normalized.split("/"):
+        raise ValueError("video_path must not contain '..'")
+    return name
+
+
+def resolve_ingest_path(name: str) -> Path:
+    """
+    INGEST_DIR 아래 실제 파일 경로 (symlink로 밖을 가리키면 ValueError, 없으면 FileNotFoundError)
+    """
+    check_ingest_name(name)
+    root = INGEST_DIR.resolve()
+    path = (root / name).resolve()
+    if not path.is_relative_to(root):
+        raise ValueError("video_path resolves outside the ingest directory")
+    if not path.is_file():
+        raise FileNotFoundError(f"ingest video not found: {name}")
+    return path
+
+
 def sha256_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
@@ -34,5 +69,9 @@ def save_image_bytes(image_bytes: bytes, ext: str = ".jpg") -> tuple[str, str]:
     abs_path = IMAGES_DIR / filename
     abs_path.write_bytes(image_bytes)
 
-    rel_path = str(abs_path.relative_to(API_DIR))
+    try:
+        rel_path = str(abs_path.relative_to(API_DIR))
+    except ValueError:
+        # storage가 api/ 밖에 있으면 절대 경로 저장
+        rel_path = str(abs_path)
     return rel_path, digest
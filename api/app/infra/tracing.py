@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# OpenTelemetry tracing (opentelemetry-sdk가 없거나 exporter 설정이 없으면 no-op)
+#   OTEL_EXPORTER_OTLP_ENDPOINT : OTLP(http/protobuf) collector로 export
+#   OTEL_TRACES_FILE            : span을 JSON lines로 파일에 기록 (로컬/테스트용)
+# trace context는 Celery message header(traceparent 등)로 API -> worker 전달
+try:
+    from opentelemetry import context as otel_context  # type: ignore
+    from opentelemetry import propagate, trace  # type: ignore
+    from opentelemetry.sdk.resources import Resource  # type: ignore
+    from opentelemetry.sdk.trace import TracerProvider  # type: ignore
+    from opentelemetry.sdk.trace.export import (  # type: ignore
+        BatchSpanProcessor,
+        SimpleSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+except ImportError:
+    trace = None  # type: ignore
+
+_tracer = None
+
+if trace is not None:
+
+    class JsonFileSpanExporter(SpanExporter):
+        """
+        span 1개당 JSON 1줄로 파일에 append (collector 없이 확인/테스트용)
+        """
+
+        def __init__(self, path: str):
+            self.path = path
+            self._lock = threading.Lock()
+
+        def export(self, spans) -> SpanExportResult:
+            lines = [json.dumps(json.loads(s.to_json())) for s in spans]
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            pass
+
+
+def init_tracing(service_name: str) -> bool:
+    """
+    프로세스당 1회 호출 (API startup / worker child init).
+    Returns:
+      tracing 활성화 여부
+    """
+    global _tracer
+    if trace is None:
+        return False
+
+    otlp_endpoint = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT")
+    traces_file = os.environ.get("OTEL_TRACES_FILE")
+    if not otlp_endpoint and not traces_file:
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name})
+    )
+    if traces_file:
+        provider.add_span_processor(
+            SimpleSpanProcessor(JsonFileSpanExporter(traces_file))
+        )
+    if otlp_endpoint:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (  # type: ignore
+                OTLPSpanExporter,
+            )
+
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        except ImportError:
+            logger.warning("opentelemetry-exporter-otlp not installed. OTLP disabled.")
+
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("coop.api")
+    logger.info(f"Tracing enabled: service={service_name}")
+    return True
+
+
+def span(name: str, start_time_ns: Optional[int] = None, **attributes: Any):
+    """
+    with span("stage.yolo", image_id=...): ...
+    tracing이 꺼져 있으면 아무것도 하지 않음.
+    """
+    if _tracer is None:
+        return nullcontext()
+    attrs = {k: v for k, v in attributes.items() if v is not None}
+    return _tracer.start_as_current_span(
+        name, start_time=start_time_ns, attributes=attrs
+    )
+
+
+def inject_headers() -> dict[str, str]:
+    # 현재 span context를 W3C traceparent header로 직렬화 (Celery message header용)
+    carrier: dict[str, str] = {}
+    if _tracer is not None:
+        propagate.inject(carrier)
+    return carrier
+
+
+@contextmanager
+def remote_context(carrier: dict[str, Any]) -> Iterator[None]:
+    """
+    Celery header로 전달된 trace context를 현재 context로 attach
+    """
+    if _tracer is None:
+        yield
+        return
+    token = otel_context.attach(propagate.extract(carrier))
+    try:
+        yield
+    finally:
+        otel_context.detach(token)
@@ -1,40 +1,191 @@
+import asyncio
+import base64
+import os
 import threading
+import time
 import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Literal, Optional
 
+from celery import group
+from celery.canvas import Signature
 from celery.result import AsyncResult
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Query, Request, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    Response,
+    StreamingResponse,
+)
+from PIL import Image
+from pydantic import ValidationError
 
+from app.ai.calibration import CameraCalibrationRegistry
+from app.ai.decode import DecodedImage
 from app.ai.pipeline import AIPipeline
-from app.celery.app import celery_app
-from app.celery.task import analyze_task
+from app.ai.stream import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_HASH_THRESHOLD,
+    FrameDeduplicator,
+    JpegFrameSplitter,
+    aiter_jpeg_frames,
+    dhash,
+)
+from app.celery.app import celery_app, celery_config
+from app.celery.event_hub import EventFilter, TaskEventHub
+from app.celery.queues import (
+    EXPIRES_GRACE_SEC,
+    QUEUE_DEFAULT,
+    QUEUE_EMERGENCY,
+    deadline_for,
+    queue_depths,
+    queue_for_image,
+)
+from app.celery.result_store import get_task_metas, hydrate_payload
+from app.celery.signal import TASK_EVENT_CHANNEL
+from app.celery.task import analyze_task, ingest_video_task
+from app.celery.worker_state import tracking_redis_client
+from app.infra import jsonutil
+from app.infra.admission import AdmissionConfig, AdmissionController, Rejection
 from app.infra.config import load_cfg_from_file
-from app.infra.db import get_analysis, init_db, insert_analysis, insert_image
-from app.infra.storage import ensure_storage_dirs, save_image_bytes
+from app.infra.db import (
+    get_analysis,
+    get_camera_calibration,
+    get_zone,
+    init_db,
+    upsert_zone,
+)
+from app.infra.metrics import (
+    count_error,
+    count_expired,
+    count_rejected,
+    render_latest,
+    set_queue_depths,
+    timed_lock,
+)
+from app.infra.persist import persist_analysis
+from app.infra.profiler import (
+    armed_profiles,
+    arm_profiler,
+    disarm_profiler,
+    list_profiles,
+)
+from app.infra.spatial import DETECTION_RETENTION_SEC, find_detections_in_zone
+from app.infra.storage import ensure_storage_dirs
+from app.infra.tracing import init_tracing, inject_headers, span
 from app.schemas import (
+    MAX_BATCH_ITEMS,
+    AnalyzeAsyncBatchResponse,
     AnalyzeAsyncResponse,
+    AnalyzeBatchRequest,
+    AnalyzeBatchResponse,
     AnalyzeRequest,
     AnalyzeResponse,
     AnalyzeResult,
+    CameraCalibrationRequest,
+    CameraCalibrationResponse,
     ErrorCode,
+    IngestStreamResponse,
+    IngestVideoRequest,
+    ProfileArmRequest,
+    ProfileArmResponse,
+    ProfileListResponse,
+    ResultBatchRequest,
+    ResultBatchResponse,
+    RiskLevel,
+    TaskResultEntry,
+    ZoneDetection,
+    ZoneDetectionsResponse,
+    ZoneRequest,
+    ZoneResponse,
 )
 
 API_DIR = Path(__file__).resolve().parents[1]  # api/app -> api
 PIPELINE_CONFIG_PATH = str(API_DIR / "config" / "pipeline_config.json")
+ADMISSION_CONFIG_PATH = API_DIR / "config" / "admission_config.json"
 
-app = FastAPI(title="3D Digital Twin AI API", version="1.1.0")
+# SSE 연결 유지용 keep-alive 주기 (초)
+SSE_KEEPALIVE_SEC = 15.0
+# result_async long-poll 최대 대기 시간 (초)
+RESULT_WAIT_MAX_SEC = 30.0
+# zone 질의 기본/최대 시간 범위 (초, 최대는 detection 보관 기간을 넘지 않음)
+ZONE_WINDOW_DEFAULT_SEC = 600.0
+ZONE_WINDOW_MAX_SEC = min(7 * 24 * 3600.0, DETECTION_RETENTION_SEC)
+# 모델 load 시점: background(기동 후 별도 thread) | eager(기동 중 load) | lazy(첫 추론 요청 시)
+MODEL_WARMUP = os.environ.get("MODEL_WARMUP", "background")
+# 서버 역할 (api_config.json role / API_ROLE)
+#   all       : 프로세스 내 pipeline + 비동기 enqueue/event (기본)
+#   ingress   : pipeline 없음. /v1/analyze는 worker로 enqueue 후 완료를 기다려 응답
+#   inference : 프로세스 내 pipeline만 (event hub 구독 없음)
+API_ROLES = ("all", "ingress", "inference")
+API_ROLE = os.environ.get("API_ROLE", "all")
+# ingress 역할에서 /v1/analyze가 worker 완료를 기다리는 최대 시간 (초)
+SYNC_PROXY_TIMEOUT_SEC = 30.0
+
+# 응답 body 직렬화: orjson이 있으면 ORJSONResponse (detection이 많은 결과일수록 차이가 큼)
+DefaultJSONResponse = ORJSONResponse if jsonutil.HAS_ORJSON else JSONResponse
+
+app = FastAPI(
+    title="3D Digital Twin AI API",
+    version="1.1.0",
+    default_response_class=DefaultJSONResponse,
+)
 
 
 @app.on_event("startup")
 def on_startup():
+    if API_ROLE not in API_ROLES:
+        raise ValueError(f"Unknown API_ROLE: {API_ROLE} (expected one of {API_ROLES})")
+    init_tracing("coop-api")
     ensure_storage_dirs()
     init_db()
-    cfg = load_cfg_from_file(PIPELINE_CONFIG_PATH)
-    # 동기 처리를 위한 pipeline을 app state에 저장 (프로세스당 1개)
-    app.state.pipeline = AIPipeline(cfg)
+    # 과부하 시 sync in-flight / async 큐 backlog 기준으로 요청 거절
+    # ingress는 worker 대기만 하므로 sync 상한 대신 proxy_max_in_flight (backlog는 check_queue로 보호)
+    app.state.admission = AdmissionController(
+        AdmissionConfig.from_file(ADMISSION_CONFIG_PATH),
+        queue_depths,
+        proxy=API_ROLE == "ingress",
+    )
+    # 동기 처리를 위한 pipeline을 app state에 저장 (프로세스당 1개, ingress는 생성 안 함)
+    app.state.pipeline = None
+    if API_ROLE != "ingress":
+        cfg = load_cfg_from_file(PIPELINE_CONFIG_PATH)
+        # 모델 load는 MODEL_WARMUP에 따라 미룸 (기동이 모델 load를 기다리지 않음, /ready로 확인)
+        pipeline = AIPipeline(
+            cfg, lazy=True, redis_client=tracking_redis_client(cfg)
+        )
+        app.state.pipeline = pipeline
+        if MODEL_WARMUP == "eager":
+            pipeline.load_models()
+        elif MODEL_WARMUP == "background":
+            threading.Thread(
+                target=pipeline.load_models, name="model-warmup", daemon=True
+            ).start()
     # thread-safe를 위해 lock도 같이 저장
     app.state.pipeline_lock = threading.Lock()
+    # camera_id별 homography 캐시
+    app.state.calibrations = CameraCalibrationRegistry()
+
+
+@app.on_event("startup")
+async def start_event_hub():
+    # task 완료 event를 구독해서 /v1/events 클라이언트들에게 fan-out
+    app.state.event_hub = None
+    if API_ROLE == "inference":
+        return
+    app.state.event_hub = TaskEventHub(celery_config, TASK_EVENT_CHANNEL)
+    await app.state.event_hub.start()
+
+
+@app.on_event("shutdown")
+async def stop_event_hub():
+    if app.state.event_hub is not None:
+        await app.state.event_hub.stop()
 
 
 @app.get("/health")
@@ -42,6 +193,48 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready(request: Request):
+    """
+    readiness: 모델 load/warm-up이 끝났으면 200, 아직이면 503 (모델별 상태 포함)
+    """
+    pipeline: Optional[AIPipeline] = request.app.state.pipeline
+    if pipeline is None:
+        # ingress: load할 모델 없음
+        return {"status": "ready", "role": API_ROLE, "models": {}, "errors": {}}
+    # lazy 모드는 첫 요청에서 load하므로 pending도 ready로 봄
+    # 모델 load에 실패했으면 stub 결과만 내므로 degraded (503, load balancer에서 제외)
+    if pipeline.models_failed:
+        status = "degraded"
+    elif pipeline.models_ready or MODEL_WARMUP == "lazy":
+        status = "ready"
+    else:
+        status = "loading"
+    return DefaultJSONResponse(
+        status_code=200 if status == "ready" else 503,
+        content={
+            "status": status,
+            "role": API_ROLE,
+            "models": pipeline.model_state,
+            "errors": pipeline.model_errors,
+        },
+    )
+
+
+@app.get("/metrics")
+def metrics():
+    """
+    Prometheus scrape endpoint
+    """
+    # queue depth는 scrape 시점에 broker에서 조회
+    try:
+        set_queue_depths(queue_depths())
+    except Exception:
+        count_error("queue_depth")
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/", response_class=HTMLResponse)
 def index():
     # Default path 처리 로직
@@ -53,57 +246,194 @@ def index():
     """
 
 
+def _overloaded(route: str, rejection: Rejection, body) -> Response:
+    # admission 거절 응답 (429/503 + Retry-After)
+    count_rejected(route, rejection.status_code)
+    return DefaultJSONResponse(
+        status_code=rejection.status_code,
+        content=body.model_dump(mode="json"),
+        headers={"Retry-After": str(rejection.retry_after_sec)},
+    )
+
+
+def _rejected_analyze(route: str, rejection: Rejection) -> Response:
+    return _overloaded(
+        route,
+        rejection,
+        AnalyzeResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            result=None,
+            error_code=ErrorCode.OVERLOADED,
+            error_message=rejection.reason,
+        ),
+    )
+
+
+def _role_unavailable(feature: str) -> str:
+    return f"{feature} is not available on API_ROLE={API_ROLE}"
+
+
+def _expired_message(req: AnalyzeRequest, deadline: float) -> str:
+    return (
+        f"deadline exceeded by {time.time() - deadline:.1f}s "
+        f"(requested_at={req.requested_at.isoformat()})"
+    )
+
+
+def _analyze_signature(
+    req: AnalyzeRequest,
+    queue_name: str,
+    deadline: Optional[float],
+    task_id: Optional[str] = None,
+) -> Signature:
+    # Celery task를 특정 큐로 라우팅 (Redis에 해당 큐로 저장됨)
+    # trace context + enqueue 시각 + freshness deadline은 message header로 worker에 전달
+    headers = {**inject_headers(), "enqueued_at": time.time()}
+    expires = None
+    if deadline is not None:
+        headers["deadline"] = deadline
+        # worker가 받기 전에 deadline + grace가 지나면 broker 단계에서 폐기 (REVOKED)
+        expires = datetime.fromtimestamp(deadline + EXPIRES_GRACE_SEC, tz=timezone.utc)
+    sig = analyze_task.signature(
+        args=[req.request_id, req.image_id, req.image_base64],
+        kwargs={"camera_id": req.camera_id},
+        queue=queue_name,
+        expires=expires,
+        headers=headers,
+    )
+    if task_id is not None:
+        sig.set(task_id=task_id)
+    return sig
+
+
+def _enqueue_analyze(
+    req: AnalyzeRequest,
+    queue_name: str,
+    deadline: Optional[float],
+    task_id: Optional[str] = None,
+) -> AsyncResult:
+    with span("celery.publish", queue=queue_name):
+        return _analyze_signature(req, queue_name, deadline, task_id).apply_async()
+
+
 # 동기 처리
 @app.post("/v1/analyze", response_model=AnalyzeResponse)
-def analyze(req: AnalyzeRequest, request: Request):
+async def analyze(req: AnalyzeRequest, request: Request):
+    admission: AdmissionController = request.app.state.admission
+    queue_name = queue_for_image(req.image_id)
+    emergency = queue_name == QUEUE_EMERGENCY
+    # pipeline_lock 앞에 무한정 쌓이지 않도록 in-flight 수 제한 (emergency는 항상 통과)
+    rejection = admission.acquire_sync(emergency)
+    if rejection is not None:
+        return _rejected_analyze("analyze", rejection)
     try:
-        # 0) AI pipeline에 접근하기 전 lock 획득
-        lock: threading.Lock = request.app.state.pipeline_lock
-
-        # 1) AI pipeline 실행
-        with lock:
-            pipeline: AIPipeline = request.app.state.pipeline
-            out = pipeline.run_from_base64(req.image_base64)
-        image_bytes = out["image_bytes"]
-        objects = out["objects"]
-        caption = out["caption"]
-        risk_level = out["risk_level"]
-
-        safe_objects = []
-        for o in objects:
-            safe_objects.append(
-                {
-                    "label": o.get("label", "unknown"),
-                    "confidence": float(o.get("confidence", 0.0)),
-                    "bbox_xyxy": o.get("bbox_xyxy"),
-                }
+        # ingress 역할: 모델 없이 worker로 위임 (enqueue 후 완료 event 대기)
+        if request.app.state.pipeline is None:
+            rejection = await run_in_threadpool(
+                admission.check_queue, queue_name, emergency
             )
+            if rejection is not None:
+                return _rejected_analyze("analyze", rejection)
+            return await _analyze_via_worker(req, request.app.state.event_hub)
+        return await run_in_threadpool(_analyze_local, req, request)
+    finally:
+        admission.release_sync()
 
-        # 2) 파일 저장 (storage.py)
-        rel_path, sha256 = save_image_bytes(image_bytes, ext=".jpg")
 
-        # 4) DB 저장 (db.py)
-        image_ref_id = insert_image(
-            image_id=req.image_id,
-            path=rel_path,
-            sha256=sha256,
+async def _analyze_via_worker(req: AnalyzeRequest, hub: TaskEventHub):
+    queue_name = queue_for_image(req.image_id)
+    deadline = deadline_for(queue_name, req.requested_at)
+    if deadline is not None and time.time() > deadline:
+        count_expired(queue_name, "api")
+        return AnalyzeResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            result=None,
+            error_code=ErrorCode.EXPIRED,
+            error_message=_expired_message(req, deadline),
         )
+    task_id = str(uuid.uuid4())
+    # enqueue 전에 등록해야 빨리 끝난 task의 event를 놓치지 않음
+    waiter = hub.register_waiter(task_id)
+    try:
+        with span(
+            "analyze_proxy",
+            image_id=req.image_id,
+            camera_id=req.camera_id,
+            queue=queue_name,
+        ):
+            await run_in_threadpool(
+                _enqueue_analyze, req, queue_name, deadline, task_id
+            )
+            try:
+                event = await asyncio.wait_for(
+                    asyncio.shield(waiter), timeout=SYNC_PROXY_TIMEOUT_SEC
+                )
+            except asyncio.TimeoutError:
+                event = None
 
-        analysis_id = insert_analysis(
-            request_id=req.request_id,  # trace용
-            image_ref_id=image_ref_id,
-            risk_level=risk_level,
-            objects=safe_objects,
-            caption=caption,  # DB schema가 NOT NULL이면 안전하게 빈 문자열
-        )
+        event_response = _event_result_response(event) if event else None
+        if event_response is not None:
+            return event_response
+        # event를 놓쳤거나 결과가 안 실린 경우 backend에서 1회 조회
+        response = await run_in_threadpool(_task_result_response, task_id)
+        if (
+            isinstance(response, AnalyzeResponse)
+            and response.error_code == ErrorCode.PENDING
+        ):
+            return AnalyzeResponse(
+                response_id=str(uuid.uuid4()),
+                ok=False,
+                result=None,
+                error_code=ErrorCode.PENDING,
+                error_message=(
+                    f"worker did not finish within {SYNC_PROXY_TIMEOUT_SEC}s "
+                    f"(task_id={task_id})"
+                ),
+            )
+        return response
 
-        result = AnalyzeResult(
-            result_id=str(analysis_id),
-            image_id=req.image_id,
-            risk_level=risk_level,  # "high" | "normal"
-            objects=safe_objects,
-            caption=caption,
+    except Exception as e:
+        count_error("analyze")
+        return AnalyzeResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            result=None,
+            error_code=ErrorCode.INTERNAL_ERROR,
+            error_message=str(e),
         )
+    finally:
+        hub.discard_waiter(task_id, waiter)
+
+
+def _analyze_local(req: AnalyzeRequest, request: Request):
+    try:
+        # 0) AI pipeline에 접근하기 전 lock 획득
+        lock: threading.Lock = request.app.state.pipeline_lock
+
+        # camera별 homography (캐시 hit이면 DB/H 계산 없음)
+        calibrations: CameraCalibrationRegistry = request.app.state.calibrations
+        mapper = calibrations.get_mapper(req.camera_id)
+
+        # 요청 단위 span (pipeline stage / storage / DB span이 하위로 붙음)
+        with span("analyze", image_id=req.image_id, camera_id=req.camera_id):
+            # 1) AI pipeline 실행 (lock 대기 시간은 metrics로 기록)
+            with timed_lock(lock, "api"):
+                pipeline: AIPipeline = request.app.state.pipeline
+                out = pipeline.run_from_base64(
+                    req.image_base64, mapper=mapper, camera_id=req.camera_id
+                )
+
+            # 2) 파일 저장 + DB 저장 (persist.py)
+            result = AnalyzeResult(
+                **persist_analysis(
+                    request_id=req.request_id,
+                    image_id=req.image_id,
+                    out=out,
+                    camera_id=req.camera_id,
+                )
+            )
 
         return AnalyzeResponse(
             response_id=str(uuid.uuid4()),
@@ -113,6 +443,7 @@ def analyze(req: AnalyzeRequest, request: Request):
         )
 
     except Exception as e:
+        count_error("analyze")
         return AnalyzeResponse(
             response_id=str(uuid.uuid4()),
             ok=False,
@@ -124,27 +455,660 @@ def analyze(req: AnalyzeRequest, request: Request):
 
 # 비동기 처리
 @app.post("/v1/analyze_async", response_model=AnalyzeAsyncResponse)
-def analyze_async(req: AnalyzeRequest):
+def analyze_async(req: AnalyzeRequest, request: Request):
     # 우선순위 규칙: image_id에 emergency 포함이면 긴급 큐
-    queue_name = (
-        "analyze.emergency" if "emergency" in req.image_id else "analyze.default"
-    )
+    queue_name = queue_for_image(req.image_id)
 
-    # Celery task를 특정 큐로 라우팅 (Redis에 해당 큐로 저장됨)
-    async_result = analyze_task.apply_async(
-        args=[req.request_id, req.image_id, req.image_base64],
+    # backlog가 임계값 이상이면 enqueue하지 않음 (emergency 큐는 항상 통과)
+    admission: AdmissionController = request.app.state.admission
+    rejection = admission.check_queue(queue_name, queue_name == QUEUE_EMERGENCY)
+    if rejection is not None:
+        return _overloaded(
+            "analyze_async",
+            rejection,
+            AnalyzeAsyncResponse(
+                response_id=str(uuid.uuid4()),
+                ok=False,
+                queue=queue_name,
+                error_code=ErrorCode.OVERLOADED,
+                error_message=rejection.reason,
+            ),
+        )
+
+    # 이미 freshness deadline이 지난 요청은 enqueue하지 않음
+    deadline = deadline_for(queue_name, req.requested_at)
+    if deadline is not None and time.time() > deadline:
+        count_expired(queue_name, "api")
+        return AnalyzeAsyncResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            queue=queue_name,
+            error_code=ErrorCode.EXPIRED,
+            error_message=_expired_message(req, deadline),
+        )
+
+    with span(
+        "analyze_async", image_id=req.image_id, camera_id=req.camera_id, queue=queue_name
+    ):
+        async_result = _enqueue_analyze(req, queue_name, deadline)
+
+    return AnalyzeAsyncResponse(
+        response_id=str(uuid.uuid4()),
+        ok=True,
+        task_id=async_result.id,
         queue=queue_name,
+        error_code=None,
+    )
+
+
+@dataclass
+class _BatchItem:
+    req: AnalyzeRequest
+    # multipart 업로드면 원본 bytes (req.image_base64는 필요할 때만 인코딩)
+    image_bytes: Optional[bytes] = None
+    error: Optional[str] = None
+
+    def to_bytes(self) -> bytes:
+        if self.image_bytes is None:
+            self.image_bytes = base64.b64decode(self.req.image_base64, validate=True)
+        return self.image_bytes
+
+    def to_base64(self) -> str:
+        if not self.req.image_base64:
+            self.req.image_base64 = base64.b64encode(self.image_bytes).decode("ascii")
+        return self.req.image_base64
+
+
+async def _parse_batch(request: Request) -> list[_BatchItem]:
+    """
+    application/json: AnalyzeBatchRequest
+    multipart/form-data: images(파일 여러 개, filename = image_id) + request_id / camera_id /
+      requested_at (모든 이미지 공통, base64 없이 binary 그대로)
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        try:
+            batch = AnalyzeBatchRequest.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+        return [_BatchItem(req=r) for r in batch.items]
+
+    form = await request.form()
+    files = [f for f in form.getlist("images") if not isinstance(f, str)]
+    if not 1 <= len(files) <= MAX_BATCH_ITEMS:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "value_error",
+                    "loc": ("body", "images"),
+                    "msg": f"expected 1..{MAX_BATCH_ITEMS} image files, got {len(files)}",
+                    "input": None,
+                }
+            ]
+        )
+    common = {
+        "request_id": form.get("request_id") or f"batch-{uuid.uuid4().hex}",
+        "camera_id": form.get("camera_id") or None,
+    }
+    if form.get("requested_at"):
+        common["requested_at"] = form.get("requested_at")
+    items = []
+    for i, f in enumerate(files):
+        try:
+            req = AnalyzeRequest(
+                image_id=f.filename or f"image_{i:03d}.jpg", image_base64="", **common
+            )
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+        items.append(_BatchItem(req=req, image_bytes=await f.read()))
+    return items
+
+
+def _analyze_batch_local(items: list[_BatchItem], request: Request) -> list:
+    """
+    유효한 이미지만 lock 1회 + run_batch_from_bytes 1회로 처리, 결과는 items 순서대로
+    """
+    results: list[Optional[AnalyzeResponse]] = [None] * len(items)
+    pipeline: AIPipeline = request.app.state.pipeline
+    valid: list[int] = []
+    decoded: list[DecodedImage] = []
+    for i, item in enumerate(items):
+        try:
+            # pipeline과 같은 축소 decode까지 미리 수행 (잘린 JPEG 등은 해당 항목만 실패)
+            decoded.append(pipeline.decode_image(item.to_bytes()))
+            valid.append(i)
+        except (ValueError, OSError, Image.DecompressionBombError) as e:
+            # base64 오류 / UnidentifiedImageError / truncated
+            item.error = f"invalid image: {e}"
+
+    if valid:
+        lock: threading.Lock = request.app.state.pipeline_lock
+        calibrations: CameraCalibrationRegistry = request.app.state.calibrations
+        reqs = [items[i].req for i in valid]
+        with span("analyze_batch", items=len(valid)):
+            mappers = [calibrations.get_mapper(r.camera_id) for r in reqs]
+            with timed_lock(lock, "api"):
+                outs = pipeline.run_batch_from_bytes(
+                    [items[i].to_bytes() for i in valid],
+                    camera_ids=[r.camera_id for r in reqs],
+                    mappers=mappers,
+                    decoded=decoded,
+                )
+            for i, r, out in zip(valid, reqs, outs):
+                results[i] = AnalyzeResponse(
+                    response_id=str(uuid.uuid4()),
+                    ok=True,
+                    result=AnalyzeResult(
+                        **persist_analysis(
+                            request_id=r.request_id,
+                            image_id=r.image_id,
+                            out=out,
+                            camera_id=r.camera_id,
+                        )
+                    ),
+                )
+
+    for i, item in enumerate(items):
+        if results[i] is None:
+            results[i] = AnalyzeResponse(
+                response_id=str(uuid.uuid4()),
+                ok=False,
+                error_code=ErrorCode.INVALID_INPUT,
+                error_message=item.error,
+            )
+    return results
+
+
+async def _proxy_batch_item(
+    item: _BatchItem, hub: TaskEventHub, admission: AdmissionController
+) -> tuple[Optional[Rejection], AnalyzeResponse | dict]:
+    # 단건 /v1/analyze ingress 경로와 같은 큐 backlog 기준 적용
+    queue_name = queue_for_image(item.req.image_id)
+    rejection = await run_in_threadpool(
+        admission.check_queue, queue_name, queue_name == QUEUE_EMERGENCY
+    )
+    if rejection is not None:
+        return rejection, AnalyzeResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            result=None,
+            error_code=ErrorCode.OVERLOADED,
+            error_message=rejection.reason,
+        )
+    item.to_base64()
+    return None, await _analyze_via_worker(item.req, hub)
+
+
+@app.post("/v1/analyze:batch", response_model=AnalyzeBatchResponse)
+async def analyze_batch(request: Request):
+    """
+    여러 이미지 동기 분석 (JSON AnalyzeBatchRequest 또는 multipart images).
+    pipeline은 batch 1회로 실행, 결과는 요청 순서대로. 이미지별 실패는 해당 항목만 ok=False.
+    """
+    items = await _parse_batch(request)
+    admission: AdmissionController = request.app.state.admission
+    # 전부 emergency일 때만 in-flight 상한 우회 (emergency 1장으로 batch 전체가 통과하지 않도록)
+    emergency = all(
+        queue_for_image(item.req.image_id) == QUEUE_EMERGENCY for item in items
+    )
+    # batch 전체가 in-flight 1개 (lock 1회)
+    rejection = admission.acquire_sync(emergency)
+    if rejection is not None:
+        return _overloaded(
+            "analyze_batch",
+            rejection,
+            AnalyzeBatchResponse(
+                response_id=str(uuid.uuid4()),
+                ok=False,
+                error_code=ErrorCode.OVERLOADED,
+                error_message=rejection.reason,
+            ),
+        )
+    try:
+        if request.app.state.pipeline is None:
+            # ingress 역할: 이미지별로 큐 backlog 확인 후 worker에 위임하고 동시에 대기
+            hub: TaskEventHub = request.app.state.event_hub
+            proxied = await asyncio.gather(
+                *(_proxy_batch_item(item, hub, admission) for item in items)
+            )
+            rejections = [rej for rej, _ in proxied if rej is not None]
+            if len(rejections) == len(items):
+                return _overloaded(
+                    "analyze_batch",
+                    rejections[-1],
+                    AnalyzeBatchResponse(
+                        response_id=str(uuid.uuid4()),
+                        ok=False,
+                        results=[r for _, r in proxied],
+                        error_code=ErrorCode.OVERLOADED,
+                        error_message=rejections[-1].reason,
+                    ),
+                )
+            results = [r for _, r in proxied]
+        else:
+            results = await run_in_threadpool(_analyze_batch_local, items, request)
+    except Exception as e:
+        count_error("analyze_batch")
+        return AnalyzeBatchResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            error_code=ErrorCode.INTERNAL_ERROR,
+            error_message=str(e),
+        )
+    finally:
+        admission.release_sync()
+
+    return AnalyzeBatchResponse(
+        response_id=str(uuid.uuid4()),
+        ok=all(
+            (r.ok if isinstance(r, AnalyzeResponse) else bool(r.get("ok")))
+            for r in results
+        ),
+        results=results,
+    )
+
+
+def _enqueue_batch(
+    items: list[_BatchItem], admission: AdmissionController
+) -> tuple[AnalyzeAsyncBatchResponse, Optional[Rejection]]:
+    """
+    항목별 deadline / admission 확인 후 통과한 것만 group 1개로 enqueue.
+    Returns: (응답, 전부 거절됐을 때의 Rejection)
+    """
+    responses: list[Optional[AnalyzeAsyncResponse]] = [None] * len(items)
+    admitted: list[int] = []
+    signatures: list[Signature] = []
+    last_rejection: Optional[Rejection] = None
+    for i, item in enumerate(items):
+        req = item.req
+        queue_name = queue_for_image(req.image_id)
+        deadline = deadline_for(queue_name, req.requested_at)
+        error_code, error_message = None, None
+        if deadline is not None and time.time() > deadline:
+            count_expired(queue_name, "api")
+            error_code, error_message = ErrorCode.EXPIRED, _expired_message(req, deadline)
+        else:
+            rejection = admission.check_queue(queue_name, queue_name == QUEUE_EMERGENCY)
+            if rejection is not None:
+                last_rejection = rejection
+                error_code, error_message = ErrorCode.OVERLOADED, rejection.reason
+        if error_code is not None:
+            responses[i] = AnalyzeAsyncResponse(
+                response_id=str(uuid.uuid4()),
+                ok=False,
+                queue=queue_name,
+                error_code=error_code,
+                error_message=error_message,
+            )
+            continue
+        item.to_base64()
+        admitted.append(i)
+        signatures.append(_analyze_signature(req, queue_name, deadline))
+
+    group_id = None
+    if signatures:
+        with span("celery.publish_group", items=len(signatures)):
+            group_result = group(signatures).apply_async()
+        group_id = group_result.id
+        for i, sig, ar in zip(admitted, signatures, group_result.results):
+            responses[i] = AnalyzeAsyncResponse(
+                response_id=str(uuid.uuid4()),
+                ok=True,
+                task_id=ar.id,
+                queue=sig.options["queue"],
+            )
+
+    response = AnalyzeAsyncBatchResponse(
+        response_id=str(uuid.uuid4()),
+        ok=bool(admitted),
+        group_id=group_id,
+        items=responses,
+        error_code=None if admitted else (responses[0].error_code),
+        error_message=None if admitted else "no item was enqueued",
+    )
+    return response, (None if admitted else last_rejection)
+
+
+@app.post("/v1/analyze_async:batch", response_model=AnalyzeAsyncBatchResponse)
+async def analyze_async_batch(request: Request):
+    """
+    여러 이미지 비동기 분석 요청 (JSON AnalyzeBatchRequest 또는 multipart images).
+    이미지별 task를 Celery group으로 한 번에 enqueue, task_id는 요청 순서대로.
+    """
+    items = await _parse_batch(request)
+    admission: AdmissionController = request.app.state.admission
+    try:
+        response, rejection = await run_in_threadpool(_enqueue_batch, items, admission)
+        # 전부 과부하로 거절되면 503 + Retry-After (일부만 거절이면 항목별 OVERLOADED)
+        if rejection is not None:
+            return _overloaded("analyze_async_batch", rejection, response)
+        return response
+    except Exception as e:
+        count_error("analyze_async_batch")
+        return AnalyzeAsyncBatchResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            error_code=ErrorCode.INTERNAL_ERROR,
+            error_message=str(e),
+        )
+
+
+@app.post("/v1/ingest/stream", response_model=IngestStreamResponse)
+async def ingest_stream(
+    request: Request,
+    request_id: str = Query(default_factory=lambda: f"stream-{uuid.uuid4().hex}"),
+    camera_id: Optional[str] = None,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=32),
+    hash_threshold: int = Query(DEFAULT_HASH_THRESHOLD, ge=0, le=64),
+):
+    """
+    MJPEG(multipart/x-mixed-replace) 또는 이어붙인 JPEG frame stream을 body로 받아
+    변화가 있는 frame만 batch로 분석 (frame별 HTTP/base64 overhead 제거)
+    """
+    pipeline: Optional[AIPipeline] = request.app.state.pipeline
+    if pipeline is None:
+        return IngestStreamResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            error_code=ErrorCode.INTERNAL_ERROR,
+            error_message=_role_unavailable("in-process stream analysis"),
+        )
+    lock: threading.Lock = request.app.state.pipeline_lock
+    calibrations: CameraCalibrationRegistry = request.app.state.calibrations
+    # SQLite 조회가 있을 수 있으므로 event loop 밖에서
+    mapper = await run_in_threadpool(calibrations.get_mapper, camera_id)
+    prefix = camera_id or "stream"
+
+    def _analyze(batch: list[tuple[int, bytes]]) -> list[dict]:
+        with timed_lock(lock, "api"):
+            outs = pipeline.run_batch_from_bytes(
+                [frame for _, frame in batch], mapper=mapper, camera_id=camera_id
+            )
+        return [
+            persist_analysis(
+                request_id=request_id,
+                image_id=f"{prefix}_{idx:06d}.jpg",
+                out=out,
+                camera_id=camera_id,
+            )
+            for (idx, _), out in zip(batch, outs)
+        ]
+
+    dedup = FrameDeduplicator(hash_threshold)
+    splitter = JpegFrameSplitter()
+    received = skipped = 0
+    failed: list[int] = []  # decode 불가 frame index
+    results: list[dict] = []
+    batch: list[tuple[int, bytes]] = []
+    try:
+        async for frame in aiter_jpeg_frames(request.stream(), splitter):
+            idx = received
+            received += 1
+            try:
+                frame_hash = await run_in_threadpool(dhash, frame)
+            except Exception:
+                failed.append(idx)
+                continue
+            if not dedup.is_changed(frame_hash):
+                skipped += 1
+                continue
+            batch.append((idx, frame))
+            if len(batch) >= batch_size:
+                results.extend(await run_in_threadpool(_analyze, batch))
+                batch = []
+        if batch:
+            results.extend(await run_in_threadpool(_analyze, batch))
+    except Exception as e:
+        count_error("ingest_stream")
+        return IngestStreamResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            frames_received=received,
+            frames_analyzed=len(results),
+            frames_skipped=skipped,
+            frames_failed=len(failed) + splitter.corrupt,
+            results=results,
+            error_code=ErrorCode.INTERNAL_ERROR,
+            error_message=str(e),
+        )
+
+    frames_failed = len(failed) + splitter.corrupt
+    if frames_failed:
+        # 나머지 frame 결과는 그대로 반환하되 실패를 숨기지 않음
+        count_error("ingest_stream_decode")
+        return IngestStreamResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            frames_received=received,
+            frames_analyzed=len(results),
+            frames_skipped=skipped,
+            frames_failed=frames_failed,
+            results=results,
+            error_code=ErrorCode.INVALID_INPUT,
+            error_message=(
+                f"{frames_failed} frame(s) could not be decoded"
+                + (f" (frame index {failed[:10]})" if failed else "")
+            ),
+        )
+
+    return IngestStreamResponse(
+        response_id=str(uuid.uuid4()),
+        ok=True,
+        frames_received=received,
+        frames_analyzed=len(results),
+        frames_skipped=skipped,
+        results=results,
     )
 
+
+@app.post("/v1/ingest/video", response_model=AnalyzeAsyncResponse)
+def ingest_video(req: IngestVideoRequest):
+    """
+    worker 로컬 영상 파일 분석을 비동기로 요청
+    task 결과(/v1/result_async/{task_id}, 완료 event)의 ingest에 frame 개수와 analysis id가 실림
+    (frame별 결과는 /v1/result/{analysis_id}로 조회)
+    """
+    async_result = ingest_video_task.apply_async(
+        args=[req.request_id, req.video_path],
+        kwargs={
+            "camera_id": req.camera_id,
+            "every_n": req.every_n,
+            "batch_size": req.batch_size,
+            "hash_threshold": req.hash_threshold,
+        },
+        queue=QUEUE_DEFAULT,
+    )
     return AnalyzeAsyncResponse(
         response_id=str(uuid.uuid4()),
         ok=True,
         task_id=async_result.id,
-        queue=queue_name,
+        queue=QUEUE_DEFAULT,
         error_code=None,
     )
 
 
+@app.put(
+    "/v1/cameras/{camera_id}/calibration", response_model=CameraCalibrationResponse
+)
+def put_camera_calibration(
+    camera_id: str, req: CameraCalibrationRequest, request: Request
+):
+    """
+    카메라 calibration(대응점) 등록/갱신. H를 계산해서 검증한 뒤 저장하고 캐시 무효화.
+    """
+    calibrations: CameraCalibrationRegistry = request.app.state.calibrations
+    try:
+        mapper = calibrations.set_calibration(camera_id, req.src_pts, req.dst_pts)
+    except ValueError as e:
+        # 대응점으로 H를 구할 수 없음 (퇴화/잘못된 점): 클라이언트 오류
+        return DefaultJSONResponse(
+            status_code=400,
+            content=CameraCalibrationResponse(
+                response_id=str(uuid.uuid4()),
+                ok=False,
+                camera_id=camera_id,
+                error_code=ErrorCode.INVALID_INPUT,
+                error_message=str(e),
+            ).model_dump(mode="json"),
+        )
+    return CameraCalibrationResponse(
+        response_id=str(uuid.uuid4()),
+        ok=True,
+        camera_id=camera_id,
+        src_pts=req.src_pts,
+        dst_pts=req.dst_pts,
+        inliers=mapper.inliers,
+    )
+
+
+@app.get(
+    "/v1/cameras/{camera_id}/calibration", response_model=CameraCalibrationResponse
+)
+def get_camera_calibration_route(camera_id: str):
+    data = get_camera_calibration(camera_id)
+    if data is None:
+        return CameraCalibrationResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            camera_id=camera_id,
+            error_code=ErrorCode.NOT_FOUND,
+        )
+    return CameraCalibrationResponse(
+        response_id=str(uuid.uuid4()),
+        ok=True,
+        camera_id=camera_id,
+        src_pts=data["src_pts"],
+        dst_pts=data["dst_pts"],
+    )
+
+
+@app.post("/v1/admin/profile", response_model=ProfileArmResponse)
+def arm_profile(req: ProfileArmRequest):
+    """
+    운영 중 profiling 시작. 다음 pipeline 호출부터 duration_sec / max_tasks 동안 수집하고
+    결과는 storage/profiles/ 에 기록 (target=worker는 Celery control command로 전달).
+    """
+    if req.target == "api":
+        session = arm_profiler(
+            req.mode, req.duration_sec, req.max_tasks, req.interval_ms, target="api"
+        )
+        return ProfileArmResponse(
+            response_id=str(uuid.uuid4()),
+            ok=True,
+            target=req.target,
+            session_id=session.session_id,
+            replies=1,
+        )
+
+    try:
+        replies = celery_app.control.broadcast(
+            "profile_arm",
+            arguments={
+                "mode": req.mode,
+                "duration_sec": req.duration_sec,
+                "max_tasks": req.max_tasks,
+                "interval_ms": req.interval_ms,
+            },
+            reply=True,
+            timeout=1.0,
+        )
+    except Exception as e:
+        return ProfileArmResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            target=req.target,
+            error_code=ErrorCode.INTERNAL_ERROR,
+            error_message=str(e),
+        )
+    # reply 형식: [{worker_hostname: {"ok": session_id} | {"error": ...}}, ...]
+    results = [r for reply in replies or [] for r in reply.values()]
+    session_ids = [r["ok"] for r in results if "ok" in r]
+    return ProfileArmResponse(
+        response_id=str(uuid.uuid4()),
+        ok=bool(session_ids),
+        target=req.target,
+        session_id=session_ids[0] if session_ids else None,
+        replies=len(session_ids),
+        error_code=None if session_ids else ErrorCode.NOT_FOUND,
+        error_message=None if session_ids else "no worker replied",
+    )
+
+
+@app.get("/v1/admin/profile", response_model=ProfileListResponse)
+def list_profile_artifacts():
+    # target(api | worker) -> arm 파일 내용
+    armed = armed_profiles()
+    return ProfileListResponse(
+        response_id=str(uuid.uuid4()),
+        ok=True,
+        armed=armed or None,
+        files=list_profiles(),
+    )
+
+
+@app.delete("/v1/admin/profile", response_model=ProfileListResponse)
+def disarm_profile(target: Optional[Literal["api", "worker"]] = None):
+    # target이 없으면 api/worker 모두 해제
+    # 이미 시작된 수집은 각 프로세스의 deadline / max_tasks 기준으로 마무리됨
+    disarm_profiler(target)
+    return ProfileListResponse(
+        response_id=str(uuid.uuid4()), ok=True, files=list_profiles()
+    )
+
+
+@app.put("/v1/zones/{zone}", response_model=ZoneResponse)
+def put_zone(zone: str, req: ZoneRequest):
+    """
+    digital twin 영역(zone) polygon 등록/갱신 (맵 좌표)
+    """
+    upsert_zone(zone, req.polygon)
+    return ZoneResponse(
+        response_id=str(uuid.uuid4()), ok=True, zone=zone, polygon=req.polygon
+    )
+
+
+@app.get("/v1/zones/{zone}/detections", response_model=ZoneDetectionsResponse)
+def zone_detections(
+    zone: str,
+    window_sec: float = Query(ZONE_WINDOW_DEFAULT_SEC, gt=0, le=ZONE_WINDOW_MAX_SEC),
+    label: Optional[str] = None,
+    camera_id: Optional[str] = None,
+):
+    """
+    최근 window_sec 동안 zone polygon 안에 들어온 detection 조회 (R*Tree 공간 인덱스)
+    """
+    polygon = get_zone(zone)
+    if polygon is None:
+        return ZoneDetectionsResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            zone=zone,
+            error_code=ErrorCode.NOT_FOUND,
+        )
+
+    rows = find_detections_in_zone(
+        polygon, window_sec=window_sec, label=label, camera_id=camera_id
+    )
+    detections = [
+        ZoneDetection(
+            analysis_id=r["analysis_id"],
+            camera_id=r["camera_id"],
+            label=r["label"],
+            confidence=r["confidence"],
+            world_xy=[r["x"], r["y"]],
+            detected_at=datetime.fromtimestamp(r["created_ts"], tz=timezone.utc),
+        )
+        for r in rows
+    ]
+    return ZoneDetectionsResponse(
+        response_id=str(uuid.uuid4()),
+        ok=True,
+        zone=zone,
+        count=len(detections),
+        detections=detections,
+    )
+
+
 @app.get("/v1/result/{analysis_id}")
 def get_result(analysis_id: int):
     """
@@ -156,10 +1120,9 @@ def get_result(analysis_id: int):
     return {"ok": True, "data": data}
 
 
-@app.get("/v1/result_async/{task_id}", response_model=AnalyzeResponse)
-def result_async(task_id: str):
+def _task_result_response(task_id: str):
     """
-    Celery task_id로 비동기 분석 결과 조회
+    Celery result backend에서 task 상태/결과를 1회 조회
     """
     ar = AsyncResult(task_id, app=celery_app)
 
@@ -172,6 +1135,16 @@ def result_async(task_id: str):
             error_code=ErrorCode.PENDING,
         )
 
+    # Celery expires 초과로 실행되지 않음 (또는 revoke)
+    if ar.state == "REVOKED":
+        return AnalyzeResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            result=None,
+            error_code=ErrorCode.EXPIRED,
+            error_message="task revoked: deadline exceeded before execution",
+        )
+
     # 실패
     if ar.state == "FAILURE":
         return AnalyzeResponse(
@@ -182,9 +1155,9 @@ def result_async(task_id: str):
             error_message="task failed: celery worker",
         )
 
-    # 성공
+    # 성공 (result pointer 모드면 DB에서 결과 복원)
     try:
-        payload = ar.get()
+        payload = hydrate_payload(ar.get())
     except Exception as e:
         return AnalyzeResponse(
             response_id=str(uuid.uuid4()),
@@ -194,3 +1167,187 @@ def result_async(task_id: str):
             error_message=str(e),
         )
     return payload
+
+
+def _event_result_response(event: dict):
+    """
+    task 완료 event(payload에 결과 포함)를 응답으로 변환. 결과가 없으면 None.
+    """
+    if event.get("status") == "FAILURE":
+        return AnalyzeResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            result=None,
+            error_code=ErrorCode.INTERNAL_ERROR,
+            error_message="task failed: celery worker",
+        )
+    if event.get("status") == "REVOKED":
+        return AnalyzeResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            result=None,
+            error_code=ErrorCode.EXPIRED,
+            error_message=f"task revoked: {event.get('error')}",
+        )
+    return event.get("result")
+
+
+@app.get("/v1/result_async/{task_id}", response_model=AnalyzeResponse)
+async def result_async(
+    task_id: str,
+    request: Request,
+    wait: float = Query(0.0, ge=0.0, le=RESULT_WAIT_MAX_SEC),
+):
+    """
+    Celery task_id로 비동기 분석 결과 조회
+    wait > 0 이면 완료 event가 올 때까지 최대 wait초 동안 응답을 보류 (long-poll)
+    """
+    hub: Optional[TaskEventHub] = request.app.state.event_hub
+    # 상태 조회 전에 먼저 등록해야 그 사이에 완료된 event를 놓치지 않음
+    # (event hub가 없는 inference 역할은 1회 조회만)
+    waiter = hub.register_waiter(task_id) if wait > 0 and hub is not None else None
+    try:
+        response = await run_in_threadpool(_task_result_response, task_id)
+        if waiter is None or not (
+            isinstance(response, AnalyzeResponse)
+            and response.error_code == ErrorCode.PENDING
+        ):
+            return response
+
+        try:
+            # shield: timeout 시 future를 cancel하지 않고 discard_waiter에서 정리
+            event = await asyncio.wait_for(asyncio.shield(waiter), timeout=wait)
+        except asyncio.TimeoutError:
+            return response
+
+        event_response = _event_result_response(event)
+        if event_response is not None:
+            return event_response
+        return await run_in_threadpool(_task_result_response, task_id)
+    finally:
+        if waiter is not None:
+            hub.discard_waiter(task_id, waiter)
+
+
+@app.post("/v1/results_async:batch", response_model=ResultBatchResponse)
+def results_async_batch(req: ResultBatchRequest):
+    """
+    여러 task_id의 비동기 분석 결과를 한 번에 조회 (result backend MGET 1회)
+    """
+    # 중복 제거 (순서 유지)
+    task_ids = list(dict.fromkeys(req.task_ids))
+    try:
+        metas = get_task_metas(task_ids)
+    except Exception as e:
+        return ResultBatchResponse(
+            response_id=str(uuid.uuid4()),
+            ok=False,
+            results={},
+            error_code=ErrorCode.INTERNAL_ERROR,
+            error_message=str(e),
+        )
+
+    results: dict[str, TaskResultEntry] = {}
+    for task_id, meta in metas.items():
+        state = meta.get("status")
+        if state == "SUCCESS":
+            payload = hydrate_payload(meta.get("result")) or {}
+            results[task_id] = TaskResultEntry(
+                state=state,
+                result=payload.get("result"),
+                ingest=payload.get("ingest"),
+                error_message=payload.get("error_message"),
+            )
+        elif state == "FAILURE":
+            results[task_id] = TaskResultEntry(
+                state=state, error_message=str(meta.get("result"))
+            )
+        else:
+            results[task_id] = TaskResultEntry(state=state)
+
+    return ResultBatchResponse(
+        response_id=str(uuid.uuid4()),
+        ok=True,
+        results=results,
+        error_code=None,
+    )
+
+
+@app.websocket("/v1/events")
+async def events_ws(
+    websocket: WebSocket,
+    task_id: Optional[str] = None,
+    risk_level: Optional[RiskLevel] = None,
+    camera_id: Optional[str] = None,
+):
+    """
+    task 완료 event(결과 포함) push 구독 (WebSocket)
+    """
+    hub: Optional[TaskEventHub] = websocket.app.state.event_hub
+    if hub is None:
+        await websocket.close(code=1013, reason=_role_unavailable("/v1/events"))
+        return
+    await websocket.accept()
+    sub = hub.subscribe(
+        EventFilter(task_id=task_id, risk_level=risk_level, camera_id=camera_id)
+    )
+
+    async def _forward():
+        while True:
+            event = await sub.queue.get()
+            await websocket.send_text(jsonutil.dumps(event))
+
+    async def _wait_disconnect():
+        # 클라이언트가 보내는 메시지는 무시하고 연결 종료만 감지
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    tasks = {asyncio.create_task(_forward()), asyncio.create_task(_wait_disconnect())}
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for t in tasks:
+            t.cancel()
+        hub.unsubscribe(sub)
+
+
+@app.get("/v1/events")
+async def events_sse(
+    request: Request,
+    task_id: Optional[str] = None,
+    risk_level: Optional[RiskLevel] = None,
+    camera_id: Optional[str] = None,
+):
+    """
+    task 완료 event(결과 포함) push 구독 (Server-Sent Events)
+    """
+    hub: Optional[TaskEventHub] = request.app.state.event_hub
+    if hub is None:
+        return DefaultJSONResponse(
+            status_code=503, content={"detail": _role_unavailable("/v1/events")}
+        )
+    sub = hub.subscribe(
+        EventFilter(task_id=task_id, risk_level=risk_level, camera_id=camera_id)
+    )
+
+    async def _stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        sub.queue.get(), timeout=SSE_KEEPALIVE_SEC
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: task_done\ndata: {jsonutil.dumps(event)}\n\n"
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,23 +2,31 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, conlist, field_validator
+
+from app.infra.storage import check_ingest_name
 
 RiskLevel = Literal["high", "normal"]
+# 2D 좌표 (x, y) / (u, v)
+Point2D = conlist(float, min_length=2, max_length=2)
 
 
 class ErrorCode(Enum):
     INTERNAL_ERROR = 1
     NOT_FOUND = 2
     PENDING = 3
+    OVERLOADED = 4  # admission control로 거절 (Retry-After 후 재시도)
+    EXPIRED = 5  # requested_at 기준 freshness deadline이 지나서 분석하지 않음
+    INVALID_INPUT = 6  # 요청 데이터 오류 (decode 불가 이미지/frame, 잘못된 좌표 등)
 
 
 class AnalyzeRequest(BaseModel):
     request_id: str
     image_id: str = Field(..., examples=["fire_002.jpg", "base_001.jpg"])
     image_base64: str
+    camera_id: Optional[str] = None  # 카메라별 homography(calibration) 선택용
     requested_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
@@ -26,6 +34,8 @@ class AnalyzeResponse(BaseModel):
     response_id: str
     ok: bool
     result: Optional["AnalyzeResult"] = None
+    # 영상 ingest task(/v1/ingest/video) 결과면 result 대신 이 값이 채워짐
+    ingest: Optional["IngestVideoResult"] = None
     error_code: Optional[ErrorCode] = None
     error_message: Optional[str] = None
 
@@ -36,18 +46,175 @@ class AnalyzeResult(BaseModel):
     risk_level: RiskLevel
     objects: List["DetectedObject"]
     caption: str
+    camera_id: Optional[str] = None
 
 
 class DetectedObject(BaseModel):
     label: Literal["person", "vehicle", "fire", "smoke", "accident", "unknown"]
     confidence: float = Field(..., ge=0.0, le=1.0)
     bbox_xyxy: Optional[List[int]] = None
+    world_xy: Optional[List[float]] = None  # homography 적용 시 맵 좌표 (x, y)
+    track_id: Optional[int] = None  # tracking 사용 시 camera별 track id
 
 
 class AnalyzeAsyncResponse(BaseModel):
     response_id: str
     ok: bool
-    task_id: str
+    task_id: Optional[str] = None  # 거절(OVERLOADED)이면 None
     queue: str
     error_code: Optional[ErrorCode] = None
     error_message: Optional[str] = None
+
+
+# 여러 이미지를 한 요청으로 (/v1/analyze:batch, /v1/analyze_async:batch)
+MAX_BATCH_ITEMS = 64
+
+
+class AnalyzeBatchRequest(BaseModel):
+    items: List[AnalyzeRequest] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class AnalyzeBatchResponse(BaseModel):
+    response_id: str
+    ok: bool
+    results: List[AnalyzeResponse] = Field(default_factory=list)  # items와 같은 순서
+    error_code: Optional[ErrorCode] = None
+    error_message: Optional[str] = None
+
+
+class AnalyzeAsyncBatchResponse(BaseModel):
+    response_id: str
+    ok: bool
+    group_id: Optional[str] = None  # Celery group id
+    items: List[AnalyzeAsyncResponse] = Field(default_factory=list)  # items와 같은 순서
+    error_code: Optional[ErrorCode] = None
+    error_message: Optional[str] = None
+
+
+class ResultBatchRequest(BaseModel):
+    task_ids: List[str] = Field(..., min_length=1, max_length=1000)
+
+
+class TaskResultEntry(BaseModel):
+    state: str  # Celery task state (PENDING | STARTED | SUCCESS | FAILURE ...)
+    result: Optional[AnalyzeResult] = None
+    ingest: Optional["IngestVideoResult"] = None  # 영상 ingest task인 경우
+    error_message: Optional[str] = None
+
+
+class ResultBatchResponse(BaseModel):
+    response_id: str
+    ok: bool
+    results: Dict[str, TaskResultEntry]
+    error_code: Optional[ErrorCode] = None
+    error_message: Optional[str] = None
+
+
+class CameraCalibrationRequest(BaseModel):
+    # 이미지 (u,v) <-> 맵 (x,y) 대응점. 4쌍이면 정확히 계산, 더 많으면 RANSAC fitting
+    src_pts: List[Point2D] = Field(..., min_length=4)
+    dst_pts: List[Point2D] = Field(..., min_length=4)
+
+
+class CameraCalibrationResponse(BaseModel):
+    response_id: str
+    ok: bool
+    camera_id: str
+    src_pts: Optional[List[List[float]]] = None
+    dst_pts: Optional[List[List[float]]] = None
+    inliers: Optional[int] = None  # RANSAC inlier 수 (4쌍이면 4)
+    error_code: Optional[ErrorCode] = None
+    error_message: Optional[str] = None
+
+
+class ZoneRequest(BaseModel):
+    # 맵 좌표 (x,y) polygon 꼭짓점 (순서대로)
+    polygon: List[Point2D] = Field(..., min_length=3)
+
+
+class ZoneResponse(BaseModel):
+    response_id: str
+    ok: bool
+    zone: str
+    polygon: Optional[List[List[float]]] = None
+    error_code: Optional[ErrorCode] = None
+    error_message: Optional[str] = None
+
+
+class ZoneDetection(BaseModel):
+    analysis_id: int
+    camera_id: Optional[str] = None
+    label: str
+    confidence: float
+    world_xy: List[float]
+    detected_at: datetime
+
+
+class ZoneDetectionsResponse(BaseModel):
+    response_id: str
+    ok: bool
+    zone: str
+    count: int = 0
+    detections: List[ZoneDetection] = Field(default_factory=list)
+    error_code: Optional[ErrorCode] = None
+    error_message: Optional[str] = None
+
+
+class IngestStreamResponse(BaseModel):
+    response_id: str
+    ok: bool
+    frames_received: int = 0
+    frames_analyzed: int = 0
+    frames_skipped: int = 0  # 직전 frame과 거의 같아서 건너뛴 frame
+    frames_failed: int = 0  # decode 불가/구조가 깨진 frame (있으면 ok=False, INVALID_INPUT)
+    results: List[AnalyzeResult] = Field(default_factory=list)
+    error_code: Optional[ErrorCode] = None
+    error_message: Optional[str] = None
+
+
+class IngestVideoResult(BaseModel):
+    # frame별 결과는 DB에만 저장 (result backend/event에는 개수와 analysis id만)
+    frames_received: int = 0
+    frames_analyzed: int = 0
+    frames_skipped: int = 0
+    analysis_ids: List[int] = Field(default_factory=list)  # /v1/result/{analysis_id}로 조회
+
+
+class IngestVideoRequest(BaseModel):
+    request_id: str
+    # worker의 ingest 디렉토리(COOP_INGEST_DIR) 기준 상대 경로 (절대 경로/'..'/URL은 422)
+    video_path: str = Field(..., examples=["cam01/2024-05-01.mp4"])
+    camera_id: Optional[str] = None
+    every_n: int = Field(1, ge=1)  # n frame마다 1개만 decode 결과 사용
+    batch_size: int = Field(4, ge=1, le=32)
+    hash_threshold: int = Field(5, ge=0, le=64)
+
+    @field_validator("video_path")
+    @classmethod
+    def _check_video_path(cls, v: str) -> str:
+        return check_ingest_name(v)
+
+
+class ProfileArmRequest(BaseModel):
+    target: Literal["api", "worker"] = "worker"
+    mode: Literal["cprofile", "sampling", "torch"] = "sampling"
+    duration_sec: float = Field(30.0, gt=0, le=300)
+    max_tasks: Optional[int] = Field(None, ge=1, le=1000)  # 프로세스당 pipeline 호출 수
+    interval_ms: float = Field(10.0, ge=1.0)  # sampling 모드 stack 수집 간격
+
+
+class ProfileArmResponse(BaseModel):
+    response_id: str
+    ok: bool
+    target: str
+    session_id: Optional[str] = None
+    replies: int = 0  # target=worker: control command에 응답한 worker 수
+    error_code: Optional[ErrorCode] = None
+    error_message: Optional[str] = None
+
+
+class ProfileListResponse(BaseModel):
+    response_id: str
+    ok: bool
+    armed: Optional[Dict] = None  # target(api | worker) -> 현재 arm 파일 내용
+    files: List[str] = Field(default_factory=list)  # storage/profiles/ 아래 artifact
@@ -38,6 +38,40 @@ def main():
         x, y = mapper.uv_to_xy(u, v)
         print(f"uv=({u:.1f},{v:.1f}) -> xy=({x:.3f},{y:.3f})")
 
+    # 3) batch 변환 + 역변환(map -> image) 확인
+    xy = mapper.uv_to_xy_batch(test_points_uv)
+    uv_back = mapper.xy_to_uv_batch(xy)
+    print("=== batch uv -> xy -> uv ===")
+    for (u, v), (x, y), (bu, bv) in zip(test_points_uv, xy, uv_back):
+        print(f"uv=({u:.1f},{v:.1f}) -> xy=({x:.3f},{y:.3f}) -> uv=({bu:.1f},{bv:.1f})")
+
+    # 4) detection list(bbox foot point) -> world 좌표
+    objects = [
+        {"label": "person", "confidence": 0.9, "bbox_xyxy": [280, 200, 340, 380]},
+        {"label": "unknown", "confidence": 0.4, "bbox_xyxy": None},
+    ]
+    print("=== detections -> world_xy ===")
+    for o, world_xy in zip(objects, mapper.map_detections(objects)):
+        print(f"{o['label']} bbox={o['bbox_xyxy']} -> world_xy={world_xy}")
+
+    # 5) 지평선이 화면 안에 있는 calibration (도로가 위쪽으로 좁아짐, 지평선 v=192)
+    #    foot point가 지평선 위/너머면 world_xy=None (NaN/뒤집힌 좌표가 DB로 가면 안 됨)
+    road = HomographyMapper(
+        src_pts=[(200, 300), (440, 300), (640, 480), (0, 480)],
+        dst_pts=[(0.0, 20.0), (10.0, 20.0), (10.0, 0.0), (0.0, 0.0)],
+    )
+    objects = [
+        {"label": "vehicle", "confidence": 0.8, "bbox_xyxy": [300, 350, 340, 400]},
+        {"label": "vehicle", "confidence": 0.5, "bbox_xyxy": [300, 150, 340, 192]},
+        {"label": "vehicle", "confidence": 0.3, "bbox_xyxy": [300, 60, 340, 100]},
+    ]
+    world = road.map_detections(objects)
+    print("=== horizon in frame -> world_xy ===")
+    for o, world_xy in zip(objects, world):
+        print(f"{o['label']} bbox={o['bbox_xyxy']} -> world_xy={world_xy}")
+    assert world[0] is not None and abs(world[0][0] - 5.0) < 1e-6
+    assert world[1] is None and world[2] is None
+
 
 if __name__ == "__main__":
     main()
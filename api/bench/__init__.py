@@ -0,0 +1 @@
+# AI pipeline / persistence 오프라인 benchmark (python -m bench --help)
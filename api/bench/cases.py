@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from PIL import Image
+
+from app.ai.decode import DecodedImage
+from app.ai.pipeline import AIPipeline
+from app.infra.db import insert_analysis, insert_image
+from app.infra.persist import persist_analysis, to_safe_objects
+from app.infra.storage import save_image_bytes
+from bench.data import BenchImage
+
+
+@dataclass
+class BenchContext:
+    """
+    각 case의 입력을 미리 계산해 둔 상태 (case는 자기 단계만 측정)
+    """
+
+    pipeline: AIPipeline
+    images: list[BenchImage]
+    decoded: list[DecodedImage] = field(default_factory=list)
+    objects: list[list[dict[str, Any]]] = field(default_factory=list)
+    crops: list[Image.Image] = field(default_factory=list)
+    outs: list[dict[str, Any]] = field(default_factory=list)
+    image_ref_id: int = 0
+    # API/worker와 같이 모델 호출(YOLO/BLIP/pipeline)은 lock 안에서만 (threads > 1이어도 직렬화)
+    pipeline_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def prepare(self) -> None:
+        p = self.pipeline
+        self.decoded = [p.decode_image(img.image_bytes) for img in self.images]
+        self.objects = [p._run_yolo(d) for d in self.decoded]
+        self.crops = [p._crop_best(d, o) for d, o in zip(self.decoded, self.objects)]
+        self.outs = [p.run_from_bytes(img.image_bytes) for img in self.images]
+        rel_path, sha256 = save_image_bytes(self.images[0].image_bytes)
+        self.image_ref_id = insert_image(self.images[0].image_id, rel_path, sha256)
+
+
+@dataclass
+class BenchCase:
+    name: str
+    # fn(ctx, idx): images[idx] 1개(batch면 idx 목록) 처리
+    fn: Callable[[BenchContext, list[int]], Any]
+    batched: bool = False  # True면 batch_size > 1을 한 번의 batch 호출로 처리
+
+
+def _decode(ctx: BenchContext, idx: list[int]) -> None:
+    p = ctx.pipeline
+    for i in idx:
+        p.decode_image(p.decode_base64_image(ctx.images[i].image_base64))
+
+
+def _decode_full(ctx: BenchContext, idx: list[int]) -> None:
+    # 비교용: 원본 해상도 decode (축소 decode 이전 방식)
+    p = ctx.pipeline
+    for i in idx:
+        p.pil_from_bytes(p.decode_base64_image(ctx.images[i].image_base64))
+
+
+def _yolo(ctx: BenchContext, idx: list[int]) -> None:
+    with ctx.pipeline_lock:
+        if len(idx) == 1:
+            ctx.pipeline._run_yolo(ctx.decoded[idx[0]])
+        else:
+            ctx.pipeline._run_yolo_batch([ctx.decoded[i] for i in idx])
+
+
+def _crop(ctx: BenchContext, idx: list[int]) -> None:
+    for i in idx:
+        ctx.pipeline._crop_best(ctx.decoded[i], ctx.objects[i])
+
+
+def _blip(ctx: BenchContext, idx: list[int]) -> None:
+    with ctx.pipeline_lock:
+        if len(idx) == 1:
+            ctx.pipeline._run_blip(ctx.crops[idx[0]])
+        else:
+            ctx.pipeline._run_blip_batch([ctx.crops[i] for i in idx])
+
+
+def _save_image_bytes(ctx: BenchContext, idx: list[int]) -> None:
+    for i in idx:
+        save_image_bytes(ctx.images[i].image_bytes)
+
+
+def _insert_image(ctx: BenchContext, idx: list[int]) -> None:
+    for i in idx:
+        insert_image(ctx.images[i].image_id, "bench", "0" * 64)
+
+
+def _insert_analysis(ctx: BenchContext, idx: list[int]) -> None:
+    for i in idx:
+        out = ctx.outs[i]
+        insert_analysis(
+            request_id="bench",
+            image_ref_id=ctx.image_ref_id,
+            risk_level=out["risk_level"],
+            objects=to_safe_objects(out["objects"]),
+            caption=out["caption"],
+        )
+
+
+def _run_from_base64(ctx: BenchContext, idx: list[int]) -> None:
+    with ctx.pipeline_lock:
+        if len(idx) == 1:
+            ctx.pipeline.run_from_base64(ctx.images[idx[0]].image_base64)
+        else:
+            ctx.pipeline.run_batch_from_bytes(
+                [ctx.images[i].image_bytes for i in idx]
+            )
+
+
+def _analyze(ctx: BenchContext, idx: list[int]) -> None:
+    # /v1/analyze 동기 경로와 같은 작업 (pipeline + storage + DB, HTTP 제외)
+    for i in idx:
+        img = ctx.images[i]
+        with ctx.pipeline_lock:
+            out = ctx.pipeline.run_from_base64(img.image_base64)
+        persist_analysis(str(uuid.uuid4()), img.image_id, out)
+
+
+CASES: dict[str, BenchCase] = {
+    c.name: c
+    for c in (
+        BenchCase("decode", _decode),
+        BenchCase("decode_full", _decode_full),
+        BenchCase("yolo", _yolo, batched=True),
+        BenchCase("crop", _crop),
+        BenchCase("blip", _blip, batched=True),
+        BenchCase("save_image_bytes", _save_image_bytes),
+        BenchCase("insert_image", _insert_image),
+        BenchCase("insert_analysis", _insert_analysis),
+        BenchCase("run_from_base64", _run_from_base64, batched=True),
+        BenchCase("analyze", _analyze),
+    )
+}
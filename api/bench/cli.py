@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+API_DIR = Path(__file__).resolve().parents[1]  # api/
+DEFAULT_DATASET_DIR = API_DIR.parent / "datasets"
+PIPELINE_CONFIG_PATH = API_DIR / "config" / "pipeline_config.json"
+
+# 결과 JSON 형식 버전 (필드 변경 시 증가)
+SCHEMA_VERSION = 1
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from bench.cases import CASES
+
+    ap = argparse.ArgumentParser(
+        prog="python -m bench",
+        description="AI pipeline / persistence 단계별 offline benchmark (JSON 출력)",
+    )
+    ap.add_argument(
+        "--mode",
+        choices=["stub", "real"],
+        default="stub",
+        help="stub: YOLO/BLIP 없이 / real: config/pipeline_config.json 모델 사용",
+    )
+    ap.add_argument("--dataset-dir", type=Path, default=DEFAULT_DATASET_DIR)
+    ap.add_argument(
+        "--images", type=int, default=32, help="사용할 이미지 수 (dataset 없으면 합성)"
+    )
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument(
+        "--cases",
+        default=",".join(CASES),
+        help=f"comma separated ({', '.join(CASES)})",
+    )
+    ap.add_argument("--batch-sizes", type=_int_list, default=[1])
+    ap.add_argument("--threads", type=_int_list, default=[1])
+    ap.add_argument("--iterations", type=int, default=50, help="조합별 측정 호출 수")
+    ap.add_argument("--warmup", type=int, default=3, help="조합별 측정 전 호출 수")
+    ap.add_argument("--output", type=Path, help="결과 JSON 파일 (없으면 stdout)")
+    ap.add_argument(
+        "--compare", type=Path, help="이전 결과 JSON과 p95/throughput 비교"
+    )
+    ap.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="--compare 시 허용 악화 비율 (초과하면 exit code 1)",
+    )
+    ap.add_argument(
+        "--keep-storage", action="store_true", help="임시 storage/DB 삭제하지 않음"
+    )
+    return ap
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=API_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _make_pipeline(mode: str):
+    from app.ai.pipeline import AIPipeline, PipelineConfig
+    from app.infra.config import load_cfg_from_file
+
+    if mode == "stub":
+        return AIPipeline(PipelineConfig(use_yolo=False, use_blip=False))
+    pipeline = AIPipeline(load_cfg_from_file(str(PIPELINE_CONFIG_PATH)))
+    if pipeline.yolo is None or pipeline.blip_model is None:
+        print("[bench] warning: real mode but YOLO/BLIP not loaded", file=sys.stderr)
+    return pipeline
+
+
+def run_case(ctx, case, batch_size: int, threads: int, iterations: int, warmup: int):
+    from bench.stats import summarize
+
+    n_images = len(ctx.images)
+    # 호출별 이미지 index (batch면 연속 batch_size개, dataset을 순환)
+    starts = itertools.count(0, batch_size)
+    calls = [
+        [(s + k) % n_images for k in range(batch_size)]
+        for s in itertools.islice(starts, warmup + iterations)
+    ]
+
+    for idx in calls[:warmup]:
+        case.fn(ctx, idx)
+
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def _one(idx: list[int]) -> None:
+        t0 = time.perf_counter()
+        case.fn(ctx, idx)
+        dt = time.perf_counter() - t0
+        with lock:
+            latencies.append(dt)
+
+    t_start = time.perf_counter()
+    if threads == 1:
+        for idx in calls[warmup:]:
+            _one(idx)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as ex:
+            list(ex.map(_one, calls[warmup:]))
+    wall = time.perf_counter() - t_start
+
+    return summarize(latencies, items=iterations * batch_size, wall_sec=wall)
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """
+    같은 (case, batch_size, threads) 조합끼리 비교. Returns: 허용치를 넘은 regression 목록
+    """
+    key = lambda r: (r["case"], r["batch_size"], r["threads"])  # noqa: E731
+    base = {key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in current["results"]:
+        b = base.get(key(r))
+        if b is None:
+            continue
+        p95, b_p95 = r["latency_ms"]["p95"], b["latency_ms"]["p95"]
+        tput, b_tput = r["throughput_per_sec"], b["throughput_per_sec"]
+        r["baseline"] = {"p95_ms": b_p95, "throughput_per_sec": b_tput}
+        if b_p95 > 0 and p95 > b_p95 * (1 + tolerance):
+            regressions.append(f"{key(r)} p95 {b_p95:.3f}ms -> {p95:.3f}ms")
+        if b_tput > 0 and tput < b_tput * (1 - tolerance):
+            regressions.append(f"{key(r)} throughput {b_tput:.3f}/s -> {tput:.3f}/s")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    # 운영 storage/DB를 건드리지 않도록 app import 전에 임시 디렉토리 지정
+    tmp_dir = tempfile.mkdtemp(prefix="coop_bench_")
+    os.environ["COOP_STORAGE_DIR"] = tmp_dir
+    keep = False
+    try:
+        keep, code = _run(argv)
+        return code
+    finally:
+        if keep:
+            print(f"[bench] storage kept at {tmp_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _run(argv: Optional[list[str]]) -> tuple[bool, int]:
+    ap = build_parser()
+    args = ap.parse_args(argv)
+
+    from app.infra.db import init_db
+    from app.infra.storage import ensure_storage_dirs
+    from bench.cases import CASES, BenchContext
+    from bench.data import load_dataset_images, synthetic_images
+
+    case_names = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in case_names if c not in CASES]
+    if unknown:
+        ap.error(f"unknown cases: {unknown}")
+
+    images = []
+    if args.dataset_dir.exists():
+        images = load_dataset_images(args.dataset_dir, args.images, args.seed)
+    source = str(args.dataset_dir) if images else "synthetic"
+    if not images:
+        images = synthetic_images(args.images, args.seed)
+
+    ensure_storage_dirs()
+    init_db()
+    pipeline = _make_pipeline(args.mode)
+    ctx = BenchContext(pipeline=pipeline, images=images)
+    ctx.prepare()
+
+    results = []
+    for name in case_names:
+        case = CASES[name]
+        batch_sizes = args.batch_sizes if case.batched else [1]
+        for batch_size, threads in itertools.product(batch_sizes, args.threads):
+            summary = run_case(
+                ctx, case, batch_size, threads, args.iterations, args.warmup
+            )
+            results.append(
+                {
+                    "case": name,
+                    "batch_size": batch_size,
+                    "threads": threads,
+                    **summary,
+                }
+            )
+            lat = summary["latency_ms"]
+            print(
+                f"[bench] {name:<18} batch={batch_size:<3} threads={threads:<3} "
+                f"p50={lat['p50']:.2f}ms p95={lat['p95']:.2f}ms p99={lat['p99']:.2f}ms "
+                f"{summary['throughput_per_sec']:.1f} img/s",
+                file=sys.stderr,
+            )
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "mode": args.mode,
+            "models": {
+                "yolo": pipeline.yolo is not None,
+                "blip": pipeline.blip_model is not None,
+            },
+            "images": {"source": source, "count": len(images), "seed": args.seed},
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        regressions = compare(
+            report, json.loads(args.compare.read_text()), args.tolerance
+        )
+        report["regressions"] = regressions
+        for line in regressions:
+            print(f"[bench] REGRESSION {line}", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return args.keep_storage, exit_code
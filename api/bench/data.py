@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import base64
+import io
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+@dataclass
+class BenchImage:
+    image_id: str
+    image_bytes: bytes
+    image_base64: str
+
+
+def load_dataset_images(dataset_dir: Path, limit: int, seed: int) -> list[BenchImage]:
+    """
+    dataset_dir 아래 이미지를 정렬 후 seed로 섞어서 limit개 선택 (실행마다 같은 집합)
+    """
+    paths = sorted(
+        p
+        for p in dataset_dir.rglob("*")
+        if p.is_file() and p.suffix.lower() in IMAGE_EXTS
+    )
+    random.Random(seed).shuffle(paths)
+    images = []
+    for p in paths[:limit]:
+        data = p.read_bytes()
+        images.append(
+            BenchImage(
+                image_id=str(p.relative_to(dataset_dir)).replace("\\", "/"),
+                image_bytes=data,
+                image_base64=base64.b64encode(data).decode("ascii"),
+            )
+        )
+    return images
+
+
+def synthetic_images(
+    limit: int, seed: int, size: tuple[int, int] = (1280, 720)
+) -> list[BenchImage]:
+    """
+    dataset이 없을 때 사용하는 seed 고정 합성 JPEG (노이즈 + 사각형, 크기는 VisDrone 리사이즈 기준)
+    """
+    rng = random.Random(seed)
+    images = []
+    for i in range(limit):
+        img = Image.effect_noise(size, 40 + rng.random() * 40).convert("RGB")
+        for _ in range(8):
+            x, y = rng.randrange(size[0] - 100), rng.randrange(size[1] - 100)
+            color = tuple(rng.randrange(256) for _ in range(3))
+            img.paste(color, (x, y, x + rng.randrange(20, 100), y + rng.randrange(20, 100)))
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=90)
+        data = buf.getvalue()
+        images.append(
+            BenchImage(
+                image_id=f"synthetic_{i:04d}.jpg",
+                image_bytes=data,
+                image_base64=base64.b64encode(data).decode("ascii"),
+            )
+        )
+    return images
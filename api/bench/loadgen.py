@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import json
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import httpx
+import redis.asyncio as aioredis
+
+from app.celery.app import celery_config
+from app.celery.signal import TASK_EVENT_CHANNEL
+from bench.cli import DEFAULT_DATASET_DIR
+from bench.data import load_dataset_images, synthetic_images
+from bench.payload_pack import PayloadPack
+from bench.stats import percentile
+
+# open-loop 부하 생성기 (python -m bench.loadgen --help)
+#   - 도착 간격은 응답과 무관하게 미리 정해진 schedule (poisson | fixed)
+#   - POST /v1/analyze_async 제출 ~ analysis:done event 수신까지를 end-to-end latency로 측정
+#   - rate 단계별 throughput / p99 / priority inversion 보고 -> worker 포화 지점 확인
+
+EARLY_EVENTS_MAX = 10_000
+
+
+@dataclass
+class Submission:
+    seq: int
+    emergency: bool
+    step: int
+    scheduled_at: float  # 계획된 도착 시각 (monotonic)
+    sent_at: float = 0.0
+    accepted_at: float = 0.0  # POST 응답 수신 시각
+    done_at: Optional[float] = None  # analysis:done event 수신 시각
+    task_id: Optional[str] = None
+    ok: Optional[bool] = None
+    error: Optional[str] = None
+
+
+def arrival_offsets(rate: float, duration: float, process: str, rng: random.Random):
+    """
+    [0, duration) 구간 도착 시각 목록. poisson: 지수분포 간격 / fixed: 1/rate 간격
+    """
+    offsets = []
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate) if process == "poisson" else 1.0 / rate
+        if t >= duration:
+            return offsets
+        offsets.append(t)
+
+
+def count_priority_inversions(subs: list[Submission]) -> dict[str, int]:
+    """
+    emergency 요청보다 늦게 제출된 normal 요청이 먼저 끝난 경우를 inversion으로 셈.
+      pairs    : (emergency, 늦게 제출되어 먼저 끝난 normal) 쌍 수
+      overtaken: inversion이 1번 이상 있었던 emergency 요청 수
+    """
+    done = [s for s in subs if s.done_at is not None]
+    emergencies = sorted(
+        (s for s in done if s.emergency), key=lambda s: s.sent_at, reverse=True
+    )
+    normals = sorted(
+        (s for s in done if not s.emergency), key=lambda s: s.sent_at, reverse=True
+    )
+
+    # 제출 시각 역순으로 훑으면서, 현재 emergency보다 늦게 제출된 normal의 완료 시각만 유지
+    later_done: list[float] = []
+    pairs = overtaken = 0
+    j = 0
+    for e in emergencies:
+        while j < len(normals) and normals[j].sent_at > e.sent_at:
+            bisect.insort(later_done, normals[j].done_at)
+            j += 1
+        n = bisect.bisect_left(later_done, e.done_at)
+        pairs += n
+        overtaken += 1 if n else 0
+    return {"pairs": pairs, "overtaken": overtaken}
+
+
+def _latency_ms(values: list[float]) -> dict[str, float]:
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50) * 1000, 3),
+        "p95": round(percentile(values, 95) * 1000, 3),
+        "p99": round(percentile(values, 99) * 1000, 3),
+        "max": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+def summarize_step(
+    subs: list[Submission], rate: float, duration: float, slo_ms: float
+) -> dict[str, Any]:
+    done = [s for s in subs if s.done_at is not None and s.ok]
+    e2e = [s.done_at - s.sent_at for s in done]
+    # 단계 시작 ~ 마지막 완료까지 구간 기준 처리량
+    span = (
+        max(s.done_at for s in done) - min(s.scheduled_at for s in subs)
+        if done
+        else duration
+    )
+    report = {
+        "offered_rps": rate,
+        "submitted": len(subs),
+        "completed": len(done),
+        # failed: 실행 실패 event / rejected: POST 단계 실패 / timed_out: drain 안에 event 없음
+        "failed": sum(1 for s in subs if s.task_id and s.ok is False),
+        "rejected": sum(1 for s in subs if s.task_id is None),
+        "timed_out": sum(1 for s in subs if s.task_id and s.done_at is None),
+        "throughput_rps": round(len(done) / span, 3) if span > 0 else 0.0,
+        "submit_latency_ms": _latency_ms(
+            [s.accepted_at - s.sent_at for s in subs if s.task_id]
+        ),
+        # 스케줄보다 늦게 보낸 정도 (부하 생성기 자체가 밀리는지 확인용)
+        "send_lag_ms": _latency_ms(
+            [max(0.0, s.sent_at - s.scheduled_at) for s in subs if s.sent_at]
+        ),
+        "e2e_latency_ms": _latency_ms(e2e),
+        "e2e_latency_ms_by_class": {
+            "emergency": _latency_ms(
+                [s.done_at - s.sent_at for s in done if s.emergency]
+            ),
+            "normal": _latency_ms(
+                [s.done_at - s.sent_at for s in done if not s.emergency]
+            ),
+        },
+        "priority_inversions": count_priority_inversions(subs),
+    }
+    p99 = report["e2e_latency_ms"]["p99"]
+    report["saturated"] = bool(
+        len(done) < len(subs)
+        or p99 > slo_ms
+        or report["throughput_rps"] < rate * 0.95
+    )
+    return report
+
+
+class LoadGenerator:
+    def __init__(
+        self, args: argparse.Namespace, payload: Callable[[int], tuple[str, str]]
+    ):
+        self.args = args
+        # payload(seq) -> (image_id, image_base64)
+        self.payload = payload
+        self.rng = random.Random(args.seed)
+        self.subs: list[Submission] = []
+        self.by_task: dict[str, Submission] = {}
+        # POST 응답보다 event가 먼저 오는 경우 (task_id -> (수신 시각, ok, error))
+        self.early_events: dict[str, tuple[float, bool, Optional[str]]] = {}
+        self.pending = 0
+        self.current_step = -1
+        self.all_done = asyncio.Event()
+
+    def _on_event(self, event: dict[str, Any], received_at: float) -> None:
+        task_id = event.get("task_id")
+        # task는 성공했어도 deadline 초과로 분석 없이 끝났으면(result.ok=False) 실패로 집계
+        result = event.get("result") or {}
+        ok = bool(event.get("ok")) and result.get("ok", True)
+        error = event.get("error") or result.get("error_message")
+        sub = self.by_task.get(task_id)
+        if sub is None:
+            # 다른 클라이언트의 task event도 섞여 오므로 크기 제한
+            if len(self.early_events) >= EARLY_EVENTS_MAX:
+                self.early_events.pop(next(iter(self.early_events)))
+            self.early_events[task_id] = (received_at, ok, error)
+            return
+        self._complete(sub, received_at, ok, error)
+
+    def _complete(
+        self, sub: Submission, at: float, ok: bool, error: Optional[str]
+    ) -> None:
+        if sub.done_at is not None:
+            return
+        sub.done_at, sub.ok, sub.error = at, ok, error
+        self._settle(sub)
+
+    async def _listen(self, pubsub) -> None:
+        async for message in pubsub.listen():
+            if message.get("type") != "message":
+                continue
+            received_at = time.perf_counter()
+            try:
+                self._on_event(json.loads(message["data"]), received_at)
+            except (ValueError, TypeError):
+                continue
+
+    async def _submit(self, client: httpx.AsyncClient, sub: Submission) -> None:
+        image_id, image_base64 = self.payload(sub.seq)
+        prefix = "emergency_" if sub.emergency else ""
+        payload = {
+            "request_id": f"loadgen-{uuid.uuid4().hex}",
+            "image_id": f"{prefix}{image_id}",
+            "image_base64": image_base64,
+            "requested_at": datetime.now(timezone.utc).isoformat(),
+        }
+        sub.sent_at = time.perf_counter()
+        try:
+            r = await client.post("/v1/analyze_async", json=payload)
+            sub.accepted_at = time.perf_counter()
+            body = r.json()
+            if r.status_code != 200 or not body.get("ok"):
+                sub.ok = False
+                sub.error = body.get("error_message") or f"HTTP {r.status_code}"
+                self._settle(sub)
+                return
+        except (httpx.HTTPError, ValueError) as e:
+            sub.ok, sub.error = False, str(e)
+            self._settle(sub)
+            return
+
+        sub.task_id = body["task_id"]
+        self.by_task[sub.task_id] = sub
+        early = self.early_events.pop(sub.task_id, None)
+        if early is not None:
+            self._complete(sub, *early)
+
+    def _settle(self, sub: Submission) -> None:
+        # drain timeout 이후 늦게 도착한 이전 단계 event는 현재 단계 대기 수에서 빼지 않음
+        if sub.step != self.current_step:
+            return
+        self.pending -= 1
+        if self.pending == 0:
+            self.all_done.set()
+
+    async def run(self) -> list[dict[str, Any]]:
+        args = self.args
+        redis = aioredis.Redis(
+            host=celery_config["backend_ip"],
+            port=celery_config["backend_port"],
+            db=celery_config["backend_db"],
+            decode_responses=True,
+        )
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(TASK_EVENT_CHANNEL)
+        listener = asyncio.create_task(self._listen(pubsub))
+
+        # 연결 수 제한으로 closed-loop가 되지 않도록 넉넉하게
+        limits = httpx.Limits(max_connections=args.max_connections)
+        reports = []
+        try:
+            async with httpx.AsyncClient(
+                base_url=args.host, limits=limits, timeout=args.http_timeout
+            ) as client:
+                for step, rate in enumerate(args.rates):
+                    reports.append(await self._run_step(client, step, rate))
+                    _print_step(reports[-1])
+        finally:
+            listener.cancel()
+            await pubsub.unsubscribe(TASK_EVENT_CHANNEL)
+            await pubsub.aclose()
+            await redis.aclose()
+        return reports
+
+    async def _run_step(
+        self, client: httpx.AsyncClient, step: int, rate: float
+    ) -> dict[str, Any]:
+        args = self.args
+        offsets = arrival_offsets(rate, args.duration, args.arrival, self.rng)
+        self.all_done.clear()
+        self.current_step = step
+        self.pending = len(offsets)
+        t0 = time.perf_counter()
+        step_subs = [
+            Submission(
+                seq=len(self.subs) + i,
+                emergency=self.rng.random() < args.emergency_ratio,
+                step=step,
+                scheduled_at=t0 + off,
+            )
+            for i, off in enumerate(offsets)
+        ]
+        self.subs.extend(step_subs)
+
+        senders = []
+        for sub in step_subs:
+            delay = sub.scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            senders.append(asyncio.create_task(self._submit(client, sub)))
+        await asyncio.gather(*senders)
+
+        # 남은 완료 event 대기 (drain)
+        if self.pending > 0:
+            try:
+                await asyncio.wait_for(self.all_done.wait(), args.drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+        return summarize_step(step_subs, rate, args.duration, args.slo_ms)
+
+
+def _print_step(r: dict[str, Any]) -> None:
+    lat = r["e2e_latency_ms"]
+    inv = r["priority_inversions"]
+    print(
+        f"[loadgen] offered={r['offered_rps']:>7.2f}/s "
+        f"done={r['completed']}/{r['submitted']} "
+        f"throughput={r['throughput_rps']:>7.2f}/s "
+        f"p50={lat['p50']:.0f}ms p99={lat['p99']:.0f}ms "
+        f"inversions={inv['pairs']} (overtaken={inv['overtaken']})"
+        f"{' SATURATED' if r['saturated'] else ''}",
+        file=sys.stderr,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="python -m bench.loadgen",
+        description="open-loop analyze_async 부하 생성 + e2e latency / priority inversion 보고",
+    )
+    ap.add_argument("--host", default="http://127.0.0.1:8000")
+    ap.add_argument(
+        "--rates",
+        type=lambda v: [float(x) for x in v.split(",") if x.strip()],
+        default=[1.0, 2.0, 4.0],
+        help="단계별 도착률 (req/s), 순서대로 실행",
+    )
+    ap.add_argument("--duration", type=float, default=30.0, help="단계별 부하 시간 (초)")
+    ap.add_argument("--arrival", choices=["poisson", "fixed"], default="poisson")
+    ap.add_argument(
+        "--emergency-ratio", type=float, default=0.1, help="emergency 큐 요청 비율"
+    )
+    ap.add_argument(
+        "--drain-timeout", type=float, default=60.0, help="단계 종료 후 완료 대기 (초)"
+    )
+    ap.add_argument(
+        "--slo-ms", type=float, default=5000.0, help="포화 판정용 e2e p99 기준"
+    )
+    ap.add_argument("--dataset-dir", type=Path, default=DEFAULT_DATASET_DIR)
+    ap.add_argument("--images", type=int, default=32)
+    ap.add_argument(
+        "--pack",
+        type=Path,
+        help="payload pack 파일 (dataset 대신 mmap으로 읽고 요청마다 base64 인코딩)",
+    )
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--max-connections", type=int, default=1000)
+    ap.add_argument("--http-timeout", type=float, default=30.0)
+    ap.add_argument("--output", type=Path, help="결과 JSON 파일 (없으면 stdout)")
+    return ap
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.pack:
+        pack = PayloadPack(args.pack)
+
+        def payload(seq: int) -> tuple[str, str]:
+            i = seq % len(pack)
+            return pack.image_ids[i], pack.image_base64(i)
+
+    else:
+        images = []
+        if args.dataset_dir.exists():
+            images = load_dataset_images(args.dataset_dir, args.images, args.seed)
+        if not images:
+            images = synthetic_images(args.images, args.seed)
+
+        def payload(seq: int) -> tuple[str, str]:
+            img = images[seq % len(images)]
+            return img.image_id, img.image_base64
+
+    steps = asyncio.run(LoadGenerator(args, payload).run())
+
+    # 포화 직전 단계 = worker node가 SLO 안에서 처리한 최대 도착률
+    sustainable = [s["offered_rps"] for s in steps if not s["saturated"]]
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "host": args.host,
+            "arrival": args.arrival,
+            "duration_sec": args.duration,
+            "emergency_ratio": args.emergency_ratio,
+            "slo_ms": args.slo_ms,
+            "seed": args.seed,
+        },
+        "max_sustainable_rps": max(sustainable) if sustainable else None,
+        "steps": steps,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import mmap
+import random
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+from bench.data import IMAGE_EXTS
+
+# 부하 생성용 이미지 payload pack (python -m bench.payload_pack build ...)
+#   [header 24B: magic 8B | index_offset u64 | index_len u64]
+#   [image bytes ...]  (원본 파일 그대로 연속 기록)
+#   [index JSON: {"version": 1, "entries": [[image_id, offset, length], ...]}]
+# 읽을 때는 mmap으로 열어서 page cache를 여러 locust/loadgen 프로세스가 공유하고,
+# base64는 요청마다 필요한 1개만 인코딩.
+MAGIC = b"COOPPK01"
+_HEADER = struct.Struct("<8sQQ")
+PACK_VERSION = 1
+JPEG_EXTS = {".jpg", ".jpeg"}
+
+
+def build_pack(dataset_dir: Path, output: Path) -> int:
+    """
+    dataset_dir 아래 이미지를 하나씩 읽어서 pack 파일로 기록 (전체를 메모리에 올리지 않음).
+    Returns: 기록한 이미지 수
+    """
+    paths = sorted(
+        p
+        for p in dataset_dir.rglob("*")
+        if p.is_file() and p.suffix.lower() in IMAGE_EXTS
+    )
+    if not paths:
+        raise FileNotFoundError(f"No images found under: {dataset_dir}")
+
+    entries = []
+    tmp = output.with_suffix(output.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, 0, 0))  # index 위치는 마지막에 채움
+        for p in paths:
+            data = p.read_bytes()
+            image_id = str(p.relative_to(dataset_dir)).replace("\\", "/")
+            entries.append([image_id, f.tell(), len(data)])
+            f.write(data)
+
+        index = json.dumps(
+            {"version": PACK_VERSION, "entries": entries}, ensure_ascii=False
+        ).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, index_offset, len(index)))
+    tmp.replace(output)
+    return len(entries)
+
+
+class PayloadPack:
+    """
+    pack 파일 read-only mmap 뷰. image bytes는 memoryview(복사 없음), base64는 호출 시 인코딩.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"not a payload pack: {self.path}")
+        index = json.loads(self._mm[index_offset : index_offset + index_len])
+        if index.get("version") != PACK_VERSION:
+            raise ValueError(f"unsupported pack version: {index.get('version')}")
+
+        entries = index["entries"]
+        self.image_ids: list[str] = [e[0] for e in entries]
+        self._offsets: list[int] = [e[1] for e in entries]
+        self._lengths: list[int] = [e[2] for e in entries]
+        self._view = memoryview(self._mm)
+        # binary upload(/v1/ingest/stream)는 JPEG만 받음
+        self.jpeg_indices: list[int] = [
+            i
+            for i, image_id in enumerate(self.image_ids)
+            if Path(image_id).suffix.lower() in JPEG_EXTS
+        ]
+
+    def __len__(self) -> int:
+        return len(self.image_ids)
+
+    def image_bytes(self, i: int) -> memoryview:
+        off = self._offsets[i]
+        return self._view[off : off + self._lengths[i]]
+
+    def image_base64(self, i: int) -> str:
+        return base64.b64encode(self.image_bytes(i)).decode("ascii")
+
+    def random_index(self, rng: Optional[random.Random] = None) -> int:
+        return (rng or random).randrange(len(self.image_ids))
+
+    def total_bytes(self) -> int:
+        return sum(self._lengths)
+
+    def close(self) -> None:
+        # image_bytes()로 꺼낸 memoryview가 남아 있으면 mmap은 GC 시점에 닫힘
+        try:
+            self._view.release()
+            self._mm.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+
+def _main(argv: Optional[Iterable[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m bench.payload_pack")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="dataset 디렉토리 -> pack 파일")
+    b.add_argument("--dataset-dir", type=Path, required=True)
+    b.add_argument("--output", type=Path, required=True)
+    i = sub.add_parser("info", help="pack 파일 요약")
+    i.add_argument("pack", type=Path)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        n = build_pack(args.dataset_dir, args.output)
+        print(f"[pack] {n} images -> {args.output}", file=sys.stderr)
+        return 0
+
+    pack = PayloadPack(args.pack)
+    print(
+        json.dumps(
+            {
+                "path": str(args.pack),
+                "images": len(pack),
+                "jpeg_images": len(pack.jpeg_indices),
+                "total_bytes": pack.total_bytes(),
+            },
+            indent=2,
+        )
+    )
+    pack.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.infra import jsonutil
+from app.schemas import AnalyzeResponse
+from bench.stats import summarize
+
+# 응답/DB column/result backend JSON 직렬화 비교 (python -m bench.serialize)
+#   detection 수가 많은 결과(VisDrone 밀집 장면 등)에서 stdlib json vs orjson 요청당 비용.
+#   response: pydantic model_dump(mode="json") 이후 JSONResponse / ORJSONResponse body render
+#   db      : analyses.objects_json dumps / loads
+#   result  : worker 결과 dict dumps / loads (result backend json 포맷, task event)
+
+LABELS = ("person", "vehicle", "fire", "smoke", "accident", "unknown")
+
+
+def synthetic_objects(n: int, rng: random.Random) -> list[dict[str, Any]]:
+    objects = []
+    for i in range(n):
+        x1, y1 = rng.randint(0, 3800), rng.randint(0, 2100)
+        objects.append(
+            {
+                "label": rng.choice(LABELS),
+                "confidence": rng.random(),
+                "bbox_xyxy": [x1, y1, x1 + rng.randint(4, 200), y1 + rng.randint(4, 200)],
+                "world_xy": [rng.uniform(-500, 500), rng.uniform(-500, 500)],
+                "track_id": i,
+            }
+        )
+    return objects
+
+
+def analyze_result(objects: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "response_id": str(uuid.uuid4()),
+        "ok": True,
+        "result": {
+            "result_id": str(uuid.uuid4()),
+            "image_id": "base_001.jpg",
+            "risk_level": "normal",
+            "objects": objects,
+            "caption": "a crowded street with many people and cars",
+            "camera_id": "cam-01",
+        },
+    }
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    # 변경 전 코드와 같은 호출 (ensure_ascii=False, 기본 separator)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    fn()  # warm-up
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, items=repeat, wall_sec=time.perf_counter() - start)
+
+
+def run_case(n_objects: int, repeat: int, seed: int) -> dict[str, Any]:
+    objects = synthetic_objects(n_objects, random.Random(seed))
+    result = analyze_result(objects)
+    content = AnalyzeResponse.model_validate(result).model_dump(mode="json")
+    db_text = json.dumps(objects, ensure_ascii=False)
+    result_bytes = _stdlib_dumps(result)
+
+    cases: dict[str, dict[str, Callable[[], Any]]] = {
+        "response_render": {
+            "json": lambda: JSONResponse(content).body,
+            "orjson": lambda: ORJSONResponse(content).body,
+        },
+        "db_dumps": {
+            "json": lambda: json.dumps(objects, ensure_ascii=False),
+            "orjson": lambda: jsonutil.dumps(objects),
+        },
+        "db_loads": {
+            "json": lambda: json.loads(db_text),
+            "orjson": lambda: jsonutil.loads(db_text),
+        },
+        "result_dumps": {
+            "json": lambda: _stdlib_dumps(result),
+            "orjson": lambda: jsonutil.dumps_bytes(result),
+        },
+        "result_loads": {
+            "json": lambda: json.loads(result_bytes.decode("utf-8")),
+            "orjson": lambda: jsonutil.loads(result_bytes),
+        },
+    }
+
+    out: dict[str, Any] = {
+        "objects": n_objects,
+        "response_bytes": {
+            "json": len(JSONResponse(content).body),
+            "orjson": len(ORJSONResponse(content).body),
+        },
+        "cases": {},
+    }
+    for name, impls in cases.items():
+        stats = {impl: _measure(fn, repeat) for impl, fn in impls.items()}
+        base = stats["json"]["latency_ms"]["mean"]
+        fast = stats["orjson"]["latency_ms"]["mean"]
+        out["cases"][name] = {
+            "json_mean_us": round(base * 1000, 1),
+            "orjson_mean_us": round(fast * 1000, 1),
+            "saved_us": round((base - fast) * 1000, 1),
+            "speedup": round(base / fast, 2) if fast > 0 else None,
+            "detail": stats,
+        }
+        print(
+            f"[serialize] objects={n_objects:>4} {name:<16} "
+            f"json={base * 1000:>8.1f}us orjson={fast * 1000:>8.1f}us",
+            file=sys.stderr,
+        )
+    return out
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="python -m bench.serialize",
+        description="detection 수별 stdlib json vs orjson 직렬화 비용 (JSON 출력)",
+    )
+    ap.add_argument(
+        "--objects",
+        type=lambda v: [int(x) for x in v.split(",") if x.strip()],
+        default=[10, 100, 500],
+        help="결과 1건의 detection 수, 쉼표 구분",
+    )
+    ap.add_argument("--repeat", type=int, default=500, help="case별 반복 횟수")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--output", type=Path, help="결과 JSON 파일 (없으면 stdout)")
+    return ap
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not jsonutil.HAS_ORJSON:
+        print("[serialize] orjson is not installed", file=sys.stderr)
+        return 1
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": [run_case(n, args.repeat, args.seed) for n in args.objects],
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
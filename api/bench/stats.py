@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    # nearest-rank 방식 (numpy 없이도 동일 결과 재현)
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies_sec: Sequence[float], items: int, wall_sec: float) -> dict[str, Any]:
+    """
+    latencies_sec: 호출 1회당 소요 시간
+    items: 처리한 이미지 수 (batch면 호출 수 * batch_size)
+    wall_sec: 전체 측정 구간 (thread 병렬이면 호출 합보다 작음)
+    """
+    values = sorted(latencies_sec)
+    n = len(values)
+    return {
+        "calls": n,
+        "items": items,
+        "wall_sec": round(wall_sec, 6),
+        "throughput_per_sec": round(items / wall_sec, 3) if wall_sec > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(values) / n * 1000, 3) if n else 0.0,
+            "min": round(values[0] * 1000, 3) if n else 0.0,
+            "p50": round(percentile(values, 50) * 1000, 3),
+            "p95": round(percentile(values, 95) * 1000, 3),
+            "p99": round(percentile(values, 99) * 1000, 3),
+            "max": round(values[-1] * 1000, 3) if n else 0.0,
+        },
+    }
@@ -4,13 +4,21 @@ import random
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
 from locust import HttpUser, between, events, tag, task
 
+from bench.payload_pack import PayloadPack
+
 # Dataset configuration
 DATASET_DIR = Path(os.getenv("LOCUST_DATASET_DIR", "../datasets")).resolve()
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
 IMAGE_CACHE: list[tuple[str, str]] = []
+# 설정 시 dataset 전체를 메모리에 올리지 않고 mmap pack 사용 (python -m bench.payload_pack build)
+PAYLOAD_PACK_PATH = os.getenv("LOCUST_PAYLOAD_PACK")
+# 설정 시 StreamUser(/v1/ingest/stream binary 업로드)도 실행 (기본 sync/async mix는 그대로)
+STREAM_ENABLED = bool(os.getenv("LOCUST_STREAM"))
+PAYLOAD_PACK: Optional[PayloadPack] = None
 
 
 # dataset_dir 아래의 모든 이미지 탐색
@@ -46,7 +54,15 @@ def build_cache(dataset_dir: Path) -> list[tuple[str, str]]:
 
 @events.init.add_listener
 def on_locust_init(environment, **kwargs):
-    global IMAGE_CACHE
+    global IMAGE_CACHE, PAYLOAD_PACK
+    if PAYLOAD_PACK_PATH:
+        # pack은 프로세스마다 mmap만 하므로 시작이 빠르고 page cache를 공유
+        PAYLOAD_PACK = PayloadPack(Path(PAYLOAD_PACK_PATH))
+        print("[locust] payload pack initialized")
+        print(f"[locust] payload_pack    = {PAYLOAD_PACK_PATH}")
+        print(f"[locust] packed_images   = {len(PAYLOAD_PACK)}")
+        return
+
     IMAGE_CACHE = build_cache(DATASET_DIR)
 
     print("[locust] dataset initialized")
@@ -55,11 +71,26 @@ def on_locust_init(environment, **kwargs):
 
 
 def random_cached_image() -> tuple[str, str]:
+    if PAYLOAD_PACK is not None:
+        # base64는 요청마다 고른 1장만 인코딩
+        i = PAYLOAD_PACK.random_index()
+        return PAYLOAD_PACK.image_ids[i], PAYLOAD_PACK.image_base64(i)
     if not IMAGE_CACHE:
         raise RuntimeError("IMAGE_CACHE is empty. Did init hook run?")
     return random.choice(IMAGE_CACHE)
 
 
+def random_jpeg_bytes() -> tuple[str, bytes]:
+    # binary upload(/v1/ingest/stream)용 원본 JPEG bytes
+    if PAYLOAD_PACK is not None:
+        if not PAYLOAD_PACK.jpeg_indices:
+            raise RuntimeError("payload pack has no JPEG images")
+        i = random.choice(PAYLOAD_PACK.jpeg_indices)
+        return PAYLOAD_PACK.image_ids[i], bytes(PAYLOAD_PACK.image_bytes(i))
+    image_id, image_b64 = random_cached_image()
+    return image_id, base64.b64decode(image_b64)
+
+
 class BasicUser(HttpUser):
     host = "http://127.0.0.1:8000"
     wait_time = between(5, 5)  # 각 유저의 요청 주기
@@ -91,3 +122,23 @@ class BasicUser(HttpUser):
         self.client.post(
             "/v1/analyze_async", json=payload, name="POST /v1/analyze_async"
         )
+
+
+class StreamUser(HttpUser):
+    # LOCUST_STREAM이 없으면 abstract라 spawn되지 않음
+    abstract = not STREAM_ENABLED
+    host = "http://127.0.0.1:8000"
+    wait_time = between(5, 5)
+
+    @tag("stream")
+    @task
+    def ingest_stream_test(self):
+        # base64/JSON 없이 JPEG bytes 그대로 업로드
+        _, image_bytes = random_jpeg_bytes()
+        self.client.post(
+            "/v1/ingest/stream",
+            params={"request_id": f"locust-{uuid.uuid4().hex}"},
+            data=image_bytes,
+            headers={"Content-Type": "image/jpeg"},
+            name="POST /v1/ingest/stream",
+        )
@@ -1,12 +1,16 @@
+import asyncio
+import itertools
 import json
 import logging
 import time
 
-import redis
-import requests
+import httpx
+import redis.asyncio as aioredis
 from app.celery.app import celery_config
 
 logging.basicConfig(level=logging.INFO, format="[%(asctime)s] [monitor] %(message)s")
+# 요청마다 찍히는 httpx access log 숨김
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 CHANNEL = "analysis:done"
 
@@ -17,99 +21,188 @@ API_BASE = "http://127.0.0.1:8000"
 FETCH_MAX_ATTEMPTS = 30
 FETCH_BASE_DELAY = 0.2
 FETCH_MAX_DELAY = 2
+# 서버 측 long-poll 대기 시간 (/v1/result_async?wait=)
+FETCH_WAIT_SEC = 5
+# 동시에 결과를 조회하는 worker 수 (느린 task 하나가 다른 task 모니터링을 막지 않도록)
+FETCH_CONCURRENCY = 8
+# Redis 연결이 끊겼을 때 재연결 대기
+RECONNECT_DELAY_SEC = 1.0
+
+# 처리 우선순위 (작을수록 먼저): high risk 알림을 normal 결과보다 먼저 처리
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
 
 
 # /v1/result_async/{task_id}를 호출해서 결과를 반환
-def fetch_result_async(task_id: str) -> dict | None:
-    url = f"{API_BASE}/v1/result_async/{task_id}"
+async def fetch_result_async(client: httpx.AsyncClient, task_id: str) -> dict | None:
+    url = f"/v1/result_async/{task_id}"
     delay = FETCH_BASE_DELAY
 
     for attempt in range(1, FETCH_MAX_ATTEMPTS + 1):
         try:
-            r = requests.get(url, timeout=3)
+            r = await client.get(url, params={"wait": FETCH_WAIT_SEC})
             r.raise_for_status()
             data = r.json()
 
             # 서버 구현상: PENDING이면 ok=True, result=None, error_code=PENDING
-            error_code = data.get("error_code")
-            result = data.get("result")
+            # ok=False(expired 등)는 더 기다려도 결과가 없으므로 그대로 반환
+            # 영상 ingest task는 result 대신 ingest(요약)가 채워짐
+            result = data.get("result") or data.get("ingest")
 
-            if error_code == "PENDING" or result is None:
+            if data.get("ok") and result is None:
                 logging.info(
                     f"result_async pending (attempt {attempt}/{FETCH_MAX_ATTEMPTS}) task_id={task_id}"
                 )
             else:
                 return data
 
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logging.warning(
                 f"result_async request failed (attempt {attempt}/{FETCH_MAX_ATTEMPTS}) task_id={task_id}: {e}"
             )
 
-        time.sleep(delay)
+        await asyncio.sleep(delay)
         delay = min(delay * 1.5, FETCH_MAX_DELAY)
 
     logging.error(f"result_async fetch timeout: task_id={task_id}")
     return None
 
 
-def main():
-    try:
-        redis_client = redis.Redis(
+def log_result(task_id: str, data: dict, lag: float | None) -> None:
+    result = data.get("result") or {}
+    risk_level = result.get("risk_level")
+    msg = (
+        f"result: task_id={task_id} risk_level={risk_level} "
+        f"caption={result.get('caption')}"
+        + (f" lag={lag:.2f}s" if lag is not None else "")
+    )
+    if risk_level == "high":
+        logging.warning(f"[ALERT] {msg}")
+    else:
+        logging.info(msg)
+
+
+async def handle_event(client: httpx.AsyncClient, payload: dict) -> None:
+    task_id = payload.get("task_id")
+    status = payload.get("status")
+    err = payload.get("error")
+    ts = payload.get("ts")
+    # worker 완료 시각 ~ 지금 (모니터링 지연 확인용)
+    lag = time.time() - ts if isinstance(ts, (int, float)) else None
+
+    # 실패 시 실패 로그
+    if status == "FAILURE":
+        logging.warning(f"task failed: task_id={task_id} err={err}")
+        return
+    # deadline 초과로 실행되지 않은 task
+    if status == "REVOKED":
+        logging.info(f"task dropped: task_id={task_id} reason={err}")
+        return
+    if status != "SUCCESS" or not task_id:
+        logging.info(f"task event: task_id={task_id} status={status} err={err}")
+        return
+
+    # event에 결과가 실려 오면 그대로 사용, 없으면 API long-poll 조회
+    data = payload.get("result")
+    if not data or (data.get("ok") and not data.get("result") and not data.get("ingest")):
+        data = await fetch_result_async(client, task_id)
+    if data is None:
+        logging.error(f"failed to fetch result for task_id={task_id}")
+        return
+    if not data.get("ok"):
+        # worker에서 deadline 초과로 추론 없이 끝난 경우 등
+        logging.info(
+            f"task not analyzed: task_id={task_id} "
+            f"error_code={data.get('error_code')} {data.get('error_message')}"
+        )
+        return
+    if data.get("ingest"):
+        # 영상 ingest task: frame별 결과는 DB에 있고 event에는 요약만
+        ingest = data["ingest"]
+        logging.info(
+            f"video ingested: task_id={task_id} "
+            f"frames={ingest.get('frames_analyzed')}/{ingest.get('frames_received')} "
+            f"skipped={ingest.get('frames_skipped')}"
+        )
+        return
+    log_result(task_id, data, lag)
+
+
+async def fetch_worker(client: httpx.AsyncClient, queue: asyncio.PriorityQueue) -> None:
+    while True:
+        _, _, payload = await queue.get()
+        try:
+            await handle_event(client, payload)
+        except Exception as e:
+            logging.error(f"Error processing message: {e}")
+        finally:
+            queue.task_done()
+
+
+async def listen(queue: asyncio.PriorityQueue) -> None:
+    """
+    analysis:done 구독 (blocking listen, polling 없음). 끊기면 재연결.
+    """
+    seq = itertools.count()  # 같은 우선순위 안에서는 도착 순서 유지
+    while True:
+        redis_client = aioredis.Redis(
             host=celery_config["backend_ip"],
             port=celery_config["backend_port"],
             db=celery_config["backend_db"],
             decode_responses=True,
         )
         pubsub = redis_client.pubsub()
-        pubsub.subscribe("analysis:done")
-
-        logging.info("Subscribed to 'analysis:done' channel. Waiting for messages...")
-        logging.info(f"API_BASE_URL={API_BASE}")
+        try:
+            await pubsub.subscribe(CHANNEL)
+            logging.info(f"Subscribed to '{CHANNEL}' channel. Waiting for messages...")
 
-        while True:
-            message = pubsub.get_message()
-            if message and message["type"] == "message":
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
                 try:
                     payload = json.loads(message["data"])
-                    task_id = payload.get("task_id")
-                    status = payload.get("status")
-                    ok = payload.get("ok")
-                    err = payload.get("error")
-
-                    logging.info(
-                        f"task done: task_id={task_id} status={status} ok={ok} err={err}"
-                    )
-
-                    # 성공 시 API로 결과 조회
-                    if status == "SUCCESS" and task_id:
-                        data = fetch_result_async(task_id)
-                        if data is not None:
-                            result = data.get("result") or {}
-                            logging.info(
-                                f"fetched result: task_id={task_id} "
-                                f"risk_level={result.get('risk_level')} "
-                                f"caption={result.get('caption')}"
-                            )
-                        else:
-                            logging.error(
-                                f"failed to fetch result for task_id={task_id}"
-                            )
-
-                    # 실패 시 실패 로그
-                    elif status == "FAILURE":
-                        logging.warning(f"task failed: task_id={task_id} err={err}")
-
                 except json.JSONDecodeError:
                     logging.warning("Failed to parse message payload. Skipping.")
-                except Exception as e:
-                    logging.error(f"Error processing message: {e}")
-
-            time.sleep(0.1)  # Avoid busy-looping
-
-    except redis.exceptions.ConnectionError as e:
-        logging.error(f"Failed to connect to Redis: {e}")
+                    continue
+
+                high = payload.get("risk_level") == "high"
+                priority = PRIORITY_HIGH if high else PRIORITY_NORMAL
+                queue.put_nowait((priority, next(seq), payload))
+                if queue.qsize() > FETCH_CONCURRENCY * 4:
+                    logging.info(f"monitor backlog: {queue.qsize()} events")
+
+        except (aioredis.ConnectionError, OSError) as e:
+            logging.error(f"Redis connection lost: {e}. Reconnecting...")
+            await asyncio.sleep(RECONNECT_DELAY_SEC)
+        finally:
+            await pubsub.aclose()
+            await redis_client.aclose()
+
+
+async def main():
+    logging.info(f"API_BASE_URL={API_BASE}")
+    queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+
+    # keep-alive 연결을 fetch worker들이 공유
+    limits = httpx.Limits(
+        max_connections=FETCH_CONCURRENCY, max_keepalive_connections=FETCH_CONCURRENCY
+    )
+    async with httpx.AsyncClient(
+        base_url=API_BASE, limits=limits, timeout=FETCH_WAIT_SEC + 3
+    ) as client:
+        workers = [
+            asyncio.create_task(fetch_worker(client, queue))
+            for _ in range(FETCH_CONCURRENCY)
+        ]
+        try:
+            await listen(queue)
+        finally:
+            for w in workers:
+                w.cancel()
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
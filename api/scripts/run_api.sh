@@ -30,6 +30,8 @@ get_cfg() {
 HOST="${HOST:-}"
 PORT="${PORT:-}"
 RELOAD="${RELOAD:-}"
+MODEL_WARMUP="${MODEL_WARMUP:-}"
+API_ROLE="${API_ROLE:-}"
 
 # env가 없으면 config 기반으로 조립, 그래도 없으면 도커 기본값으로
 if [[ -z "$HOST" ]]; then
@@ -41,11 +43,21 @@ fi
 if [[ -z "$RELOAD" ]]; then
   RELOAD="$(get_cfg reload)"
 fi
+if [[ -z "$MODEL_WARMUP" ]]; then
+  MODEL_WARMUP="$(get_cfg model_warmup)"
+fi
+if [[ -z "$API_ROLE" ]]; then
+  API_ROLE="$(get_cfg role)"
+fi
 
 # config도 env도 없으면 안전 기본값
 HOST="${HOST:-0.0.0.0}"
 PORT="${PORT:-8000}"
 RELOAD="${RELOAD:-false}"
+# 모델 load 시점 (background | eager | lazy), app.main에서 읽음
+export MODEL_WARMUP="${MODEL_WARMUP:-background}"
+# 서버 역할 (all | ingress | inference)
+export API_ROLE="${API_ROLE:-all}"
 
 ARGS=(app.main:app --host "$HOST" --port "$PORT")
 
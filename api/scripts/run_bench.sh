@@ -0,0 +1,11 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$SCRIPT_DIR/.."
+
+cd "$PROJECT_ROOT"
+source .venv/bin/activate
+
+# e.g. scripts/run_bench.sh --mode real --batch-sizes 1,4,8 --threads 1,2 --output bench_1.2.0.json
+python -m bench --dataset-dir "$(realpath "$PROJECT_ROOT/../datasets")" "$@"
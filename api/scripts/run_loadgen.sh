@@ -0,0 +1,11 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$SCRIPT_DIR/.."
+
+cd "$PROJECT_ROOT"
+source .venv/bin/activate
+
+# e.g. scripts/run_loadgen.sh --rates 1,2,4,8 --duration 60 --emergency-ratio 0.2 --output load.json
+python -m bench.loadgen --dataset-dir "$(realpath "$PROJECT_ROOT/../datasets")" "$@"
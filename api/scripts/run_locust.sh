@@ -8,5 +8,7 @@ cd "$PROJECT_ROOT"
 source .venv/bin/activate
 
 export LOCUST_DATASET_DIR="$(realpath "$PROJECT_ROOT/../datasets")"
+# 큰 dataset은 미리 pack으로 만들어 두고 지정 (python -m bench.payload_pack build ...)
+export LOCUST_PAYLOAD_PACK="${LOCUST_PAYLOAD_PACK:-}"
 
 locust "$@"
\ No newline at end of file
@@ -21,6 +21,15 @@ fi
 : "${CELERY_LOGLEVEL:=info}"
 : "${CELERY_QUEUES:=analyze.emergency,analyze.default}"
 
+# ---- metrics ----
+# prefork child들의 metrics를 모으기 위한 multiprocess dir (시작 시 비움)
+# WORKER_METRICS_PORT 로 worker main 프로세스가 /metrics 노출 (빈 값이면 비활성)
+: "${PROMETHEUS_MULTIPROC_DIR:=/tmp/coop_metrics_worker}"
+: "${WORKER_METRICS_PORT:=9808}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+export PROMETHEUS_MULTIPROC_DIR WORKER_METRICS_PORT
+
 # ---- config loader (jq 우선, 없으면 python fallback) ----
 get_cfg() {
   local key="$1"
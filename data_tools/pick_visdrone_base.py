@@ -1,133 +1,172 @@
+import argparse
+import csv
+import os
 import random
 import shutil
-import csv
 from pathlib import Path
 
+from visdrone_index import PERSON_VEHICLE, VisDroneIndex, build_index
+
 # ==============================
-# Paths (UPDATED)
+# Paths (defaults, --옵션으로 변경 가능)
 # ==============================
 
 # VisDrone 원본 데이터 (HOME 아래)
 VISDRONE_ROOT = Path.home() / "VisDrone2019-DET-test-dev"
-IMG_DIR = VISDRONE_ROOT / "images"
-ANN_DIR = VISDRONE_ROOT / "annotations"
 
 # 프로젝트 datasets (submodule)
 PROJECT_ROOT = Path.home() / "coop_project"
-OUT_DIR = PROJECT_ROOT / "datasets" / "base"
-MANIFEST = PROJECT_ROOT / "datasets" / "manifest.csv"
+DATASETS_DIR = PROJECT_ROOT / "datasets"
 
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+MANIFEST_FIELDS = ["id", "relative_path", "category", "priority", "source", "note"]
 
-# ==============================
-# VisDrone class IDs of interest
-# ==============================
-# 1 pedestrian, 2 people, 4 car, 5 van, 6 truck, 9 bus
-PERSON_VEHICLE = {1, 2, 4, 5, 6, 9}
 
-def parse_annotation(txt_path: Path):
+def select_candidates(
+    index: VisDroneIndex,
+    img_dir: Path,
+    classes: set[int],
+    min_class_objects: int,
+    max_objects: int,
+    max_occlusion: float,
+    max_truncation: float,
+) -> list[tuple[Path, int, int]]:
     """
-    Parse VisDrone annotation file.
     Returns:
-        total_objs, pv_objs, avg_occlusion, avg_truncation
+        [(image path, total objs, objs in classes), ...] (stem 순 정렬)
     """
-    total = pv = 0
-    occ_sum = trunc_sum = 0
-
-    with txt_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = [p.strip() for p in line.split(",")]
-            if len(parts) < 8:
-                continue
-
-            category = int(parts[5])
-            trunc = int(parts[6])
-            occ = int(parts[7])
-
-            total += 1
-            trunc_sum += trunc
-            occ_sum += occ
-
-            if category in PERSON_VEHICLE:
-                pv += 1
-
-    if total == 0:
-        return 0, 0, 0.0, 0.0
-
-    return total, pv, occ_sum / total, trunc_sum / total
-
-
-# ==============================
-# 1) Candidate filtering
-# ==============================
-candidates = []
-
-for ann_file in ANN_DIR.glob("*.txt"):
-    total, pv, occ_avg, trunc_avg = parse_annotation(ann_file)
-
-    # 최소 조건: 사람/차량 1개 이상
-    if pv == 0:
-        continue
-
-    # 너무 극단적인 장면 제외 (조절 가능)
-    if total > 150:
-        continue
-    if occ_avg > 2.2:
-        continue
-    if trunc_avg > 1.8:
-        continue
-
-    img_file = IMG_DIR / f"{ann_file.stem}.jpg"
-    if img_file.exists():
-        candidates.append((img_file, total, pv))
-
-print(f"[INFO] candidate images: {len(candidates)}")
-
-if not candidates:
-    raise RuntimeError(
-        "No candidates found. Check images/ and annotations/ directories."
+    picked = index.select(
+        classes=classes,
+        min_class_objects=min_class_objects,  # 최소 조건: 사람/차량 1개 이상
+        max_objects=max_objects,  # 너무 극단적인 장면 제외 (조절 가능)
+        max_occlusion=max_occlusion,
+        max_truncation=max_truncation,
     )
+    cls_counts = index.class_counts(classes)
 
-# ==============================
-# 2) Sample 50 images
-# ==============================
-random.seed(42)
-picked = random.sample(candidates, k=50) if len(candidates) >= 50 else candidates
-
-# ==============================
-# 3) Copy images & update manifest
-# ==============================
-rows = []
+    candidates = []
+    for i in picked:
+        img_file = img_dir / f"{index.stems[i]}.jpg"
+        if img_file.exists():
+            candidates.append((img_file, int(index.obj_count[i]), int(cls_counts[i])))
+    return candidates
 
-for idx, (img_path, total, pv) in enumerate(picked, start=1):
-    out_name = f"base_{idx:03d}{img_path.suffix.lower()}"
-    out_path = OUT_DIR / out_name
 
-    shutil.copy2(img_path, out_path)
+def copy_if_changed(src: Path, dst: Path) -> bool:
+    # 같은 크기/수정 시각이면 복사 생략 (copy2가 mtime 보존)
+    if dst.exists():
+        s, d = src.stat(), dst.stat()
+        if s.st_size == d.st_size and int(s.st_mtime) == int(d.st_mtime):
+            return False
+    shutil.copy2(src, dst)
+    return True
 
-    rows.append({
-        "id": f"base_{idx:03d}",
-        "relative_path": f"base/{out_name}",
-        "category": "base",
-        "priority": "normal",
-        "source": "visdrone",
-        "note": f"objs={total}, pv={pv}"
-    })
 
-write_header = not MANIFEST.exists()
-
-with MANIFEST.open("a", newline="", encoding="utf-8") as f:
-    writer = csv.DictWriter(
-        f,
-        fieldnames=["id", "relative_path", "category", "priority", "source", "note"]
-    )
-    if write_header:
+def update_manifest(manifest: Path, rows: list[dict]) -> None:
+    """
+    id 기준으로 기존 row를 교체 (같은 선택을 다시 실행해도 중복 row가 생기지 않음)
+    """
+    existing: dict[str, dict] = {}
+    if manifest.exists():
+        with manifest.open("r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                existing[row["id"]] = row
+    for row in rows:
+        existing[row["id"]] = row
+
+    tmp = manifest.with_suffix(".csv.tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS)
         writer.writeheader()
-    writer.writerows(rows)
-
-print(f"[DONE] Copied {len(rows)} images to: {OUT_DIR}")
-print(f"[DONE] Manifest updated: {MANIFEST}")
+        writer.writerows(existing.values())
+    os.replace(tmp, manifest)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Pick base (normal) images from VisDrone-DET.")
+    ap.add_argument("--visdrone-root", type=Path, default=VISDRONE_ROOT)
+    ap.add_argument("--datasets-dir", type=Path, default=DATASETS_DIR)
+    ap.add_argument("--category", default="base", help="output subdir / id prefix (default: base)")
+    ap.add_argument("--priority", default="normal")
+    ap.add_argument("--sample", type=int, default=50, help="number of images to pick (default: 50)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--classes", default=",".join(str(c) for c in sorted(PERSON_VEHICLE)),
+                    help="VisDrone category ids to count (default: person/vehicle 1,2,4,5,6,9)")
+    ap.add_argument("--min-class-objects", type=int, default=1)
+    ap.add_argument("--max-objects", type=int, default=150)
+    ap.add_argument("--max-occlusion", type=float, default=2.2)
+    ap.add_argument("--max-truncation", type=float, default=1.8)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="annotation parse workers")
+    ap.add_argument("--rebuild-index", action="store_true", help="re-parse all annotations")
+    ap.add_argument("--dry-run", action="store_true", help="only print the selection")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    img_dir = args.visdrone_root / "images"
+    ann_dir = args.visdrone_root / "annotations"
+    out_dir = args.datasets_dir / args.category
+    manifest = args.datasets_dir / "manifest.csv"
+    classes = {int(c) for c in args.classes.split(",") if c.strip()}
+
+    # ==============================
+    # 1) Candidate filtering (cached columnar index)
+    # ==============================
+    index = build_index(ann_dir, workers=args.workers, rebuild=args.rebuild_index)
+    candidates = select_candidates(
+        index,
+        img_dir,
+        classes=classes,
+        min_class_objects=args.min_class_objects,
+        max_objects=args.max_objects,
+        max_occlusion=args.max_occlusion,
+        max_truncation=args.max_truncation,
+    )
+    print(f"[INFO] candidate images: {len(candidates)}")
+
+    if not candidates:
+        raise RuntimeError(
+            "No candidates found. Check images/ and annotations/ directories."
+        )
+
+    # ==============================
+    # 2) Sample images
+    # ==============================
+    rng = random.Random(args.seed)
+    picked = rng.sample(candidates, k=args.sample) if len(candidates) >= args.sample else candidates
+
+    if args.dry_run:
+        for img_path, total, n_cls in picked:
+            print(f"{img_path.name}\tobjs={total}\tpv={n_cls}")
+        return
+
+    # ==============================
+    # 3) Copy images & update manifest
+    # ==============================
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rows = []
+    copied = 0
+
+    for idx, (img_path, total, n_cls) in enumerate(picked, start=1):
+        out_name = f"{args.category}_{idx:03d}{img_path.suffix.lower()}"
+        out_path = out_dir / out_name
+
+        copied += copy_if_changed(img_path, out_path)
+
+        rows.append({
+            "id": f"{args.category}_{idx:03d}",
+            "relative_path": f"{args.category}/{out_name}",
+            "category": args.category,
+            "priority": args.priority,
+            "source": "visdrone",
+            "note": f"objs={total}, pv={n_cls}, src={img_path.name}"
+        })
+
+    update_manifest(manifest, rows)
+
+    print(f"[DONE] Picked {len(rows)} images ({copied} copied) to: {out_dir}")
+    print(f"[DONE] Manifest updated: {manifest}")
+
+
+if __name__ == "__main__":
+    main()
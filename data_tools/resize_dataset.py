@@ -1,6 +1,13 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Optional
 
 from PIL import Image, ImageOps
 
@@ -43,6 +50,76 @@ def stretch(img: Image.Image, size: tuple[int, int]) -> Image.Image:
     return img.resize(size, resample=Image.Resampling.LANCZOS)
 
 
+MANIFEST_NAME = ".resize_manifest.json"
+MANIFEST_VERSION = 1
+# prev_hash marker: dst was produced by a run without manifest; keep it and only record the hash
+ADOPT_EXISTING = "*"
+
+
+def file_sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def resize_one(src: Path, dst: Path, opts: dict, prev_hash: Optional[str]) -> dict:
+    """
+    Resize a single image (runs inside a worker process).
+    If the source content hash equals prev_hash and dst exists, the resize is skipped.
+    Returns a result dict: {"status": ok|unchanged|fail, "sha256", "bytes", "error"}
+    """
+    try:
+        data = src.read_bytes()
+        digest = file_sha256(data)
+        if dst.exists() and prev_hash in (digest, ADOPT_EXISTING):
+            return {"status": "unchanged", "sha256": digest, "bytes": len(data)}
+
+        size = tuple(opts["size"])
+        with Image.open(io.BytesIO(data)) as im:
+            if opts["draft"] and im.format == "JPEG":
+                # Decode at 1/2, 1/4 or 1/8 scale when the result is still >= target size
+                im.draft("RGB", size)
+            im = im.convert("RGB")  # normalize
+            if opts["mode"] == "letterbox":
+                out = letterbox(im, size=size, fill=tuple(opts["fill"]))
+            else:
+                out = stretch(im, size=size)
+
+            # Save
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            if dst.suffix.lower() in {".jpg", ".jpeg"}:
+                out.save(dst, quality=opts["quality"], optimize=opts["optimize"])
+            else:
+                out.save(dst)
+        return {"status": "ok", "sha256": digest, "bytes": len(data)}
+    except Exception as e:
+        return {"status": "fail", "error": str(e)}
+
+
+def _resize_chunk(chunk: list[tuple[str, str, str, Optional[str]]], opts: dict) -> list[tuple[str, dict]]:
+    # One task per chunk keeps inter-process overhead low for many small images
+    return [(rel, resize_one(Path(src), Path(dst), opts, prev)) for rel, src, dst, prev in chunk]
+
+
+def load_manifest(path: Path, params: dict) -> Optional[dict]:
+    """
+    Manifest maps source relative path -> {"size", "mtime_ns", "sha256"}.
+    Returns None when no usable manifest exists, {} when resize parameters changed
+    (or the format is old) so every output must be redone.
+    """
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != MANIFEST_VERSION or data.get("params") != params:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(path: Path, params: dict, files: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "params": params, "files": files}))
+    os.replace(tmp, path)
+
+
 def process_dir(
     input_dir: Path,
     output_dir: Path,
@@ -51,47 +128,107 @@ def process_dir(
     overwrite: bool,
     fill: tuple[int, int, int],
     keep_ext: bool,
+    workers: int = 1,
+    chunk_size: int = 32,
+    draft: bool = True,
+    optimize: bool = True,
+    quality: int = 95,
 ):
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    files = [p for p in input_dir.rglob("*") if p.is_file() and is_image(p)]
+    files = sorted(p for p in input_dir.rglob("*") if p.is_file() and is_image(p))
     if not files:
         print(f"[WARN] No images found in: {input_dir}")
         return
 
-    ok, fail, skipped = 0, 0, 0
-    for src in files:
-        rel = src.relative_to(input_dir)
-        dst_dir = output_dir / rel.parent
-        dst_dir.mkdir(parents=True, exist_ok=True)
+    # Output-affecting parameters; a change invalidates the manifest
+    params = {"size": list(size), "mode": mode, "fill": list(fill), "keep_ext": keep_ext,
+              "draft": draft, "optimize": optimize, "quality": quality}
+    opts = {"size": list(size), "mode": mode, "fill": list(fill), "draft": draft,
+            "optimize": optimize, "quality": quality}
+    manifest_path = output_dir / MANIFEST_NAME
+    loaded = None if overwrite else load_manifest(manifest_path, params)
+    # Without any manifest, existing outputs are adopted (same as the old "dst exists" skip)
+    adopt = not overwrite and loaded is None
+    # Parameters changed: redo everything, like --overwrite
+    redo_all = overwrite or loaded == {} and manifest_path.exists()
+    manifest = loaded or {}
 
+    # Decide what to do per file with stat() only; hashing happens in the workers
+    todo: list[tuple[str, str, str, Optional[str]]] = []
+    stats: dict[str, os.stat_result] = {}
+    skipped = 0
+    for src in files:
+        rel = str(src.relative_to(input_dir))
         # Decide output extension
         out_ext = src.suffix.lower() if keep_ext else ".jpg"
-        dst = (dst_dir / rel.stem).with_suffix(out_ext)
+        dst = (output_dir / Path(rel).parent / Path(rel).stem).with_suffix(out_ext)
+        st = src.stat()
+        stats[rel] = st
+        entry = manifest.get(rel)
 
-        if dst.exists() and not overwrite:
+        if not redo_all and entry is not None and dst.exists() \
+                and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
             skipped += 1
             continue
+        if adopt and dst.exists():
+            # Output from a run without manifest: keep it, record the source hash
+            todo.append((rel, str(src), str(dst), ADOPT_EXISTING))
+            continue
+        # mtime/size changed: reprocess only if the content hash changed too
+        prev_hash = entry["sha256"] if entry is not None and not redo_all else None
+        todo.append((rel, str(src), str(dst), prev_hash))
 
-        try:
-            with Image.open(src) as im:
-                im = im.convert("RGB")  # normalize
-                if mode == "letterbox":
-                    out = letterbox(im, size=size, fill=fill)
-                else:
-                    out = stretch(im, size=size)
+    ok, unchanged, fail, read_bytes = 0, 0, 0, 0
+    total = len(todo)
+    t0 = time.perf_counter()
+    last_report = t0
+    chunks = [todo[i:i + chunk_size] for i in range(0, total, chunk_size)]
 
-                # Save
-                if dst.suffix.lower() in {".jpg", ".jpeg"}:
-                    out.save(dst, quality=95, optimize=True)
-                else:
-                    out.save(dst)
-            ok += 1
-        except Exception as e:
-            fail += 1
-            print(f"[FAIL] {src} -> {e}")
+    def _collect(results: list[tuple[str, dict]]) -> None:
+        nonlocal ok, unchanged, fail, read_bytes
+        for rel, r in results:
+            if r["status"] == "fail":
+                fail += 1
+                print(f"[FAIL] {input_dir / rel} -> {r['error']}")
+                continue
+            ok += r["status"] == "ok"
+            unchanged += r["status"] == "unchanged"
+            read_bytes += r["bytes"]
+            st = stats[rel]
+            manifest[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": r["sha256"]}
 
-    print(f"[DONE] {input_dir} -> {output_dir} | ok={ok}, skipped={skipped}, fail={fail}")
+    def _progress(force: bool = False) -> None:
+        nonlocal last_report
+        now = time.perf_counter()
+        if not force and now - last_report < 2.0:
+            return
+        last_report = now
+        done = ok + unchanged + fail
+        rate = done / (now - t0) if now > t0 else 0.0
+        print(f"[PROGRESS] {done}/{total} ({rate:.1f} img/s)")
+
+    try:
+        if workers <= 1:
+            for chunk in chunks:
+                _collect(_resize_chunk(chunk, opts))
+                _progress()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                futures = [ex.submit(_resize_chunk, chunk, opts) for chunk in chunks]
+                for fut in as_completed(futures):
+                    _collect(fut.result())
+                    _progress()
+    finally:
+        # Save progress even on Ctrl+C so the next run resumes incrementally
+        save_manifest(manifest_path, params, manifest)
+
+    elapsed = time.perf_counter() - t0
+    rate = (ok + unchanged) / elapsed if elapsed > 0 else 0.0
+    print(
+        f"[DONE] {input_dir} -> {output_dir} | ok={ok}, unchanged={unchanged}, skipped={skipped}, "
+        f"fail={fail} | {elapsed:.1f}s, {rate:.1f} img/s, {read_bytes / 1e6:.1f} MB read, workers={workers}"
+    )
 
 
 def parse_rgb(s: str) -> tuple[int, int, int]:
@@ -111,6 +248,13 @@ def main():
     ap.add_argument("--overwrite", action="store_true", help="Overwrite existing outputs")
     ap.add_argument("--fill", default="0,0,0", help="Padding color for letterbox as R,G,B (default: 0,0,0)")
     ap.add_argument("--keep-ext", action="store_true", help="Keep original extension (default: convert to .jpg)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes (default: CPU count, 1 = no process pool)")
+    ap.add_argument("--chunk-size", type=int, default=32, help="Images per worker task (default: 32)")
+    ap.add_argument("--no-draft", action="store_true",
+                    help="Disable JPEG draft mode (reduced-size decode before resize)")
+    ap.add_argument("--no-optimize", action="store_true", help="Skip JPEG optimize pass (faster encode)")
+    ap.add_argument("--quality", type=int, default=95, help="JPEG quality (default: 95)")
     args = ap.parse_args()
 
     w, h = (int(x) for x in args.size.split(","))
@@ -123,6 +267,14 @@ def main():
     if not input_dir.exists():
         raise SystemExit(f"Input dir not found: {input_dir}")
 
+    pool_opts = {
+        "workers": args.workers,
+        "chunk_size": args.chunk_size,
+        "draft": not args.no_draft,
+        "optimize": not args.no_optimize,
+        "quality": args.quality,
+    }
+
     # Process base & emergency if present; otherwise process whole input dir
     base = input_dir / "base"
     emergency = input_dir / "emergency"
@@ -136,6 +288,7 @@ def main():
                 overwrite=args.overwrite,
                 fill=fill,
                 keep_ext=args.keep_ext,
+                **pool_opts,
             )
         if emergency.exists():
             process_dir(
@@ -146,9 +299,10 @@ def main():
                 overwrite=args.overwrite,
                 fill=fill,
                 keep_ext=args.keep_ext,
+                **pool_opts,
             )
     else:
-        process_dir(input_dir, output_dir, size, args.mode, args.overwrite, fill, args.keep_ext)
+        process_dir(input_dir, output_dir, size, args.mode, args.overwrite, fill, args.keep_ext, **pool_opts)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+VisDrone-DET annotation indexer.
+
+Parses every annotations/*.txt once (in parallel) into a columnar NumPy cache (.npz):
+  - per-image arrays : stem, annotation size/mtime, object offset/count
+  - per-object arrays: image index, bbox, score, category, truncation, occlusion
+Re-running only re-parses annotation files whose size/mtime changed.
+Selection queries (thresholds, class filters) are vectorized over these arrays.
+
+Usage:
+  python visdrone_index.py --ann-dir ~/VisDrone2019-DET-test-dev/annotations
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+INDEX_VERSION = 1
+INDEX_NAME = ".visdrone_index.npz"
+
+# VisDrone annotation columns
+# bbox_left, bbox_top, bbox_width, bbox_height, score, object_category, truncation, occlusion
+N_COLS = 8
+
+# 1 pedestrian, 2 people, 4 car, 5 van, 6 truck, 9 bus
+PERSON_VEHICLE = {1, 2, 4, 5, 6, 9}
+
+
+def parse_annotation_file(txt_path: str) -> np.ndarray:
+    """
+    Parse one annotation file into an (n, 8) int32 array (malformed lines are skipped).
+    """
+    rows = []
+    with open(txt_path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.strip().split(",")
+            if len(parts) < N_COLS:
+                continue
+            try:
+                rows.append([int(p) for p in parts[:N_COLS]])
+            except ValueError:
+                continue
+    if not rows:
+        return np.empty((0, N_COLS), dtype=np.int32)
+    return np.asarray(rows, dtype=np.int32)
+
+
+def _parse_chunk(paths: list[str]) -> list[np.ndarray]:
+    return [parse_annotation_file(p) for p in paths]
+
+
+@dataclass
+class VisDroneIndex:
+    stems: np.ndarray  # (N,) str
+    ann_size: np.ndarray  # (N,) int64
+    ann_mtime_ns: np.ndarray  # (N,) int64
+    obj_offset: np.ndarray  # (N,) int64, objects of image i = [offset, offset + count)
+    obj_count: np.ndarray  # (N,) int32
+    obj_image: np.ndarray  # (M,) int32
+    obj_bbox: np.ndarray  # (M, 4) int32 (left, top, width, height)
+    obj_score: np.ndarray  # (M,) int8
+    obj_category: np.ndarray  # (M,) int8
+    obj_truncation: np.ndarray  # (M,) int8
+    obj_occlusion: np.ndarray  # (M,) int8
+
+    def __len__(self) -> int:
+        return len(self.stems)
+
+    def rows(self, i: int) -> np.ndarray:
+        # (count, 8) annotation rows of image i (original column order)
+        s = slice(self.obj_offset[i], self.obj_offset[i] + self.obj_count[i])
+        return np.column_stack(
+            [
+                self.obj_bbox[s],
+                self.obj_score[s],
+                self.obj_category[s],
+                self.obj_truncation[s],
+                self.obj_occlusion[s],
+            ]
+        ).astype(np.int32)
+
+    # ---------- per-image stats (vectorized) ----------
+
+    def _per_image_sum(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.obj_image, weights=values, minlength=len(self))
+
+    def class_counts(self, classes: Optional[Iterable[int]] = None) -> np.ndarray:
+        """
+        (N,) number of objects per image whose category is in classes (None = all)
+        """
+        if classes is None:
+            return self.obj_count.astype(np.int64)
+        mask = np.isin(self.obj_category, list(classes))
+        return np.bincount(self.obj_image[mask], minlength=len(self))
+
+    def mean_occlusion(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.nan_to_num(self._per_image_sum(self.obj_occlusion) / self.obj_count)
+
+    def mean_truncation(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.nan_to_num(self._per_image_sum(self.obj_truncation) / self.obj_count)
+
+    def select(
+        self,
+        classes: Optional[Iterable[int]] = PERSON_VEHICLE,
+        min_class_objects: int = 1,
+        max_class_objects: Optional[int] = None,
+        min_objects: int = 0,
+        max_objects: Optional[int] = None,
+        max_occlusion: Optional[float] = None,
+        max_truncation: Optional[float] = None,
+        min_score: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Returns indices of images matching all conditions.
+          classes / min_class_objects / max_class_objects : objects in the given categories
+          min_objects / max_objects                      : all annotated objects
+          max_occlusion / max_truncation                 : per-image mean
+          min_score                                      : only count objects with score >= min_score
+        """
+        if min_score is not None:
+            keep = self.obj_score >= min_score
+            cls_mask = keep & (
+                np.isin(self.obj_category, list(classes)) if classes is not None else True
+            )
+            cls_counts = np.bincount(self.obj_image[cls_mask], minlength=len(self))
+            totals = np.bincount(self.obj_image[keep], minlength=len(self))
+        else:
+            cls_counts = self.class_counts(classes)
+            totals = self.obj_count
+
+        mask = (cls_counts >= min_class_objects) & (totals >= min_objects)
+        if max_class_objects is not None:
+            mask &= cls_counts <= max_class_objects
+        if max_objects is not None:
+            mask &= totals <= max_objects
+        if max_occlusion is not None:
+            mask &= self.mean_occlusion() <= max_occlusion
+        if max_truncation is not None:
+            mask &= self.mean_truncation() <= max_truncation
+        return np.flatnonzero(mask)
+
+    # ---------- persistence ----------
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(
+            tmp,
+            version=np.array(INDEX_VERSION),
+            stems=self.stems,
+            ann_size=self.ann_size,
+            ann_mtime_ns=self.ann_mtime_ns,
+            obj_offset=self.obj_offset,
+            obj_count=self.obj_count,
+            obj_image=self.obj_image,
+            obj_bbox=self.obj_bbox,
+            obj_score=self.obj_score,
+            obj_category=self.obj_category,
+            obj_truncation=self.obj_truncation,
+            obj_occlusion=self.obj_occlusion,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["VisDroneIndex"]:
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                if int(z["version"]) != INDEX_VERSION:
+                    return None
+                return cls(**{k: z[k] for k in cls.__dataclass_fields__})
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def _from_parsed(
+    stems: list[str], sizes: list[int], mtimes: list[int], parsed: list[np.ndarray]
+) -> VisDroneIndex:
+    counts = np.array([len(a) for a in parsed], dtype=np.int32)
+    offsets = np.zeros(len(parsed), dtype=np.int64)
+    if len(counts) > 1:
+        offsets[1:] = np.cumsum(counts[:-1])
+    rows = np.concatenate(parsed) if parsed else np.empty((0, N_COLS), dtype=np.int32)
+    return VisDroneIndex(
+        stems=np.array(stems, dtype=str),
+        ann_size=np.array(sizes, dtype=np.int64),
+        ann_mtime_ns=np.array(mtimes, dtype=np.int64),
+        obj_offset=offsets,
+        obj_count=counts,
+        obj_image=np.repeat(np.arange(len(parsed), dtype=np.int32), counts),
+        obj_bbox=rows[:, 0:4].astype(np.int32),
+        obj_score=rows[:, 4].astype(np.int8),
+        obj_category=rows[:, 5].astype(np.int8),
+        obj_truncation=rows[:, 6].astype(np.int8),
+        obj_occlusion=rows[:, 7].astype(np.int8),
+    )
+
+
+def build_index(
+    ann_dir: Path,
+    index_path: Optional[Path] = None,
+    workers: int = os.cpu_count() or 1,
+    chunk_size: int = 64,
+    rebuild: bool = False,
+    verbose: bool = True,
+) -> VisDroneIndex:
+    """
+    Load the cached index and re-parse only new/changed annotation files.
+    The cache is rewritten only when something changed.
+    """
+    index_path = index_path or ann_dir / INDEX_NAME
+    t0 = time.perf_counter()
+    cached = None if rebuild else VisDroneIndex.load(index_path)
+    prev = {}
+    if cached is not None:
+        prev = {str(s): i for i, s in enumerate(cached.stems)}
+
+    files = sorted(ann_dir.glob("*.txt"))
+    stems, sizes, mtimes = [], [], []
+    parsed: list[Optional[np.ndarray]] = []
+    to_parse: list[int] = []
+    for p in files:
+        st = p.stat()
+        i = prev.get(p.stem)
+        stems.append(p.stem)
+        sizes.append(st.st_size)
+        mtimes.append(st.st_mtime_ns)
+        if (
+            i is not None
+            and cached.ann_size[i] == st.st_size
+            and cached.ann_mtime_ns[i] == st.st_mtime_ns
+        ):
+            parsed.append(cached.rows(i))
+        else:
+            parsed.append(None)
+            to_parse.append(len(parsed) - 1)
+
+    if to_parse:
+        paths = [str(files[i]) for i in to_parse]
+        chunks = [paths[k : k + chunk_size] for k in range(0, len(paths), chunk_size)]
+        if workers <= 1 or len(chunks) == 1:
+            results = [a for c in chunks for a in _parse_chunk(c)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                results = [a for res in ex.map(_parse_chunk, chunks) for a in res]
+        for i, arr in zip(to_parse, results):
+            parsed[i] = arr
+
+    changed = bool(to_parse) or cached is None or len(prev) != len(files)
+    index = _from_parsed(stems, sizes, mtimes, parsed)  # type: ignore[arg-type]
+    if changed:
+        index.save(index_path)
+
+    if verbose:
+        print(
+            f"[INDEX] {len(index)} images, {len(index.obj_image)} objects | "
+            f"parsed={len(to_parse)}, cached={len(files) - len(to_parse)} | "
+            f"{time.perf_counter() - t0:.2f}s -> {index_path}"
+        )
+    return index
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build/refresh the VisDrone annotation index.")
+    ap.add_argument("--ann-dir", required=True, type=Path, help="VisDrone annotations directory")
+    ap.add_argument("--index", type=Path, help=f"Index path (default: <ann-dir>/{INDEX_NAME})")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--rebuild", action="store_true", help="Ignore the cache and re-parse everything")
+    args = ap.parse_args()
+    build_index(args.ann_dir.expanduser(), args.index, workers=args.workers, rebuild=args.rebuild)
+
+
+if __name__ == "__main__":
+    main()